@@ -1,7 +1,10 @@
+import asyncio
 from typing import Callable
 
 from telegram.ext import Application, ApplicationBuilder, ContextTypes
 
+from band_tracker.bot.helpers.artist_index import ArtistSearchIndex
+from band_tracker.bot.helpers.cache_invalidator import CacheInvalidator
 from band_tracker.bot.helpers.context import BTContext
 from band_tracker.bot.helpers.interfaces import MessageManager
 from band_tracker.config.constants import NO_DELETE
@@ -14,16 +17,30 @@ def build_app(
     handler_registrator: Callable[[Application], None],
     bot_dal: BotDAL,
     msg_dal: MessageDAL,
+    artist_index: ArtistSearchIndex | None = None,
+    cache_invalidator: CacheInvalidator | None = None,
 ) -> Application:
     """
     Builds an application base and registers common handlers via provided handler
     registrator.
     """
     context = ContextTypes(context=BTContext)
-    builder = ApplicationBuilder().token(token).context_types(context)
+    builder = (
+        ApplicationBuilder()
+        .token(token)
+        .context_types(context)
+        .post_init(_start_background_tasks)
+        .post_shutdown(_stop_background_tasks)
+    )
     app = builder.build()
     handler_registrator(app)
-    _inject_app_dependencies(bot_dal=bot_dal, msg_dal=msg_dal, app=app)
+    _inject_app_dependencies(
+        bot_dal=bot_dal,
+        msg_dal=msg_dal,
+        artist_index=artist_index,
+        cache_invalidator=cache_invalidator,
+        app=app,
+    )
     return app
 
 
@@ -35,8 +52,31 @@ def run(app: Application) -> None:
 
 
 def _inject_app_dependencies(
-    bot_dal: BotDAL, msg_dal: MessageDAL, app: Application
+    bot_dal: BotDAL,
+    msg_dal: MessageDAL,
+    app: Application,
+    artist_index: ArtistSearchIndex | None = None,
+    cache_invalidator: CacheInvalidator | None = None,
 ) -> None:
     msg_manager = MessageManager(msg_dal=msg_dal, bot=app.bot, no_delete=NO_DELETE)
     app.bot_data["dal"] = bot_dal
     app.bot_data["msg"] = msg_manager
+    app.bot_data["artist_index"] = artist_index
+    app.bot_data["cache_invalidator"] = cache_invalidator
+    app.bot_data["tasks"] = []
+
+
+async def _start_background_tasks(app: Application) -> None:
+    artist_index: ArtistSearchIndex | None = app.bot_data["artist_index"]
+    if artist_index is not None:
+        app.bot_data["tasks"].append(asyncio.create_task(artist_index.run()))
+    cache_invalidator: CacheInvalidator | None = app.bot_data["cache_invalidator"]
+    if cache_invalidator is not None:
+        app.bot_data["tasks"].append(asyncio.create_task(cache_invalidator.consume()))
+
+
+async def _stop_background_tasks(app: Application) -> None:
+    tasks: list[asyncio.Task] = app.bot_data["tasks"]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
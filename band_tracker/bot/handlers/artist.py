@@ -5,7 +5,11 @@ from uuid import UUID
 from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CallbackQueryHandler, CommandHandler, InvalidCallbackData
 
-from band_tracker.bot.helpers.callback_data import get_callback_data
+from band_tracker.bot.helpers.callback_data import (
+    EventsCursor,
+    encode_uuid,
+    get_callback_data,
+)
 from band_tracker.bot.helpers.context import BTContext
 from band_tracker.bot.helpers.interfaces import MessageManager
 from band_tracker.core.artist import Artist
@@ -15,12 +19,16 @@ from band_tracker.db.errors import ArtistNotFound, UserNotFound
 log = logging.getLogger(__name__)
 
 
+def _artist_events_data(artist_id: UUID) -> str:
+    return f"eventsar {encode_uuid(artist_id)} {EventsCursor().encode()}"
+
+
 def _unfollowed_markup(artist_id: UUID) -> InlineKeyboardMarkup:
     row1 = [
         InlineKeyboardButton("Follow", callback_data=f"follow {artist_id}"),
     ]
     row2 = [
-        InlineKeyboardButton("Events", callback_data=f"eventsar {artist_id} 0"),
+        InlineKeyboardButton("Events", callback_data=_artist_events_data(artist_id)),
         InlineKeyboardButton("Buy Tickets", callback_data=f"tickets {artist_id}"),
     ]
     markup = InlineKeyboardMarkup([row1, row2])
@@ -35,7 +43,7 @@ def _followed_markup(artist_id: UUID) -> InlineKeyboardMarkup:
         ),
     ]
     row2 = [
-        InlineKeyboardButton("Events", callback_data=f"eventsar {artist_id} 0"),
+        InlineKeyboardButton("Events", callback_data=_artist_events_data(artist_id)),
         InlineKeyboardButton("Buy Tickets", callback_data=f"tickets {artist_id}"),
     ]
     markup = InlineKeyboardMarkup([row1, row2])
@@ -95,7 +103,7 @@ async def follow(update: Update, ctx: BTContext) -> None:
         return
 
     assert update.effective_user
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     try:
         await ctx.dal.add_follow(user_tg_id=user.tg_id, artist_id=artist_id)
@@ -123,7 +131,7 @@ async def unfollow(update: Update, ctx: BTContext) -> None:
         return
 
     assert update.effective_user
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     await ctx.dal.unfollow(user_tg_id=user.tg_id, artist_id=artist_id)
     await _change_markup(
         update=update,
@@ -149,7 +157,7 @@ async def artist_button(update: Update, ctx: BTContext) -> None:
 
 
 async def artist_command(_: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     args = ctx.args
     if not args:
         await ctx.msg.send_text(
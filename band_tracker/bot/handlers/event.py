@@ -58,7 +58,7 @@ def _event_text(event: Event) -> str:
 
 
 async def event_main_page(update: Update, ctx: BTContext) -> None:
-    user: User = await ctx.user()
+    user: User = await ctx.user(follows=False)
     query = update.callback_query
     assert query
     await query.answer()
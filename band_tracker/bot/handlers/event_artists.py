@@ -82,7 +82,7 @@ async def _event_artists_markup(
 
 
 async def artist_list(update: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     query = update.callback_query
     try:
@@ -7,6 +7,9 @@ from telegram import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup,
 from telegram.ext import CallbackQueryHandler, CommandHandler, InvalidCallbackData
 
 from band_tracker.bot.helpers.callback_data import (
+    EventsCursor,
+    decode_uuid,
+    encode_uuid,
     get_callback_data,
     get_multiple_fields,
 )
@@ -14,12 +17,14 @@ from band_tracker.bot.helpers.context import BTContext
 from band_tracker.config.constants import EVENTS_PER_PAGE
 from band_tracker.core.artist import Artist
 from band_tracker.core.enums import MessageType
-from band_tracker.core.event import Event
+from band_tracker.core.event import EventPreview
 
 log = logging.getLogger(__name__)
 
 
-def _get_artist_events_callback_data(query: CallbackQuery | None) -> tuple[UUID, int]:
+def _get_artist_events_callback_data(
+    query: CallbackQuery | None,
+) -> tuple[UUID, EventsCursor]:
     result_fields = get_multiple_fields(query=query)
     total_fields = len(result_fields)
 
@@ -27,28 +32,32 @@ def _get_artist_events_callback_data(query: CallbackQuery | None) -> tuple[UUID,
         raise InvalidCallbackData(
             f"Callback should have 3 fields, got {total_fields} instead "
         )
-    try:
-        target_page = int(result_fields[2])
-    except ValueError:
-        raise InvalidCallbackData("Invalid target page")
-    try:
-        uuid = UUID(result_fields[1])
-    except ValueError:
-        raise InvalidCallbackData("Invalid UUID")
-    return uuid, target_page
-
-
-def _get_all_events_callback_data(query: CallbackQuery | None) -> int:
+    uuid = decode_uuid(result_fields[1])
+    cursor = EventsCursor.decode(result_fields[2])
+    return uuid, cursor
+
+
+def _get_all_events_callback_data(query: CallbackQuery | None) -> EventsCursor:
     data = get_callback_data(query=query)
+    return EventsCursor.decode(data)
 
-    try:
-        page_number = int(data)
-    except ValueError:
-        raise InvalidCallbackData("Invalid UUID")
-    return page_number
 
+def _nav_cursors(
+    events: list[EventPreview], next_page: bool, page: int
+) -> tuple[EventsCursor | None, EventsCursor | None]:
+    """Returns cursors of the previous and the next pages of the shown events"""
+    prev_cursor = (
+        EventsCursor(page=page - 1, event_id=events[0].id, backward=True)
+        if page > 0
+        else None
+    )
+    next_cursor = (
+        EventsCursor(page=page + 1, event_id=events[-1].id) if next_page else None
+    )
+    return prev_cursor, next_cursor
 
-def _event_layout(event: Event) -> list[list[InlineKeyboardButton]]:
+
+def _event_layout(event: EventPreview) -> list[list[InlineKeyboardButton]]:
     layout = [
         [
             InlineKeyboardButton(text="Explore", callback_data=f"event {event.id}"),
@@ -60,23 +69,28 @@ def _event_layout(event: Event) -> list[list[InlineKeyboardButton]]:
     return layout
 
 
-def _event_markup(event: Event) -> InlineKeyboardMarkup:
+def _event_markup(event: EventPreview) -> InlineKeyboardMarkup:
     layout = _event_layout(event)
     return InlineKeyboardMarkup(layout)
 
 
 def _all_events_nav_markup(
-    next_page: bool, event: Event, page: int = 0
+    next_page: bool, events: list[EventPreview], page: int = 0
 ) -> InlineKeyboardMarkup:
     nav_row: list[InlineKeyboardButton] = []
-    event_layout = _event_layout(event)
-    if page > 0:
+    event_layout = _event_layout(events[-1])
+    prev_cursor, next_cursor = _nav_cursors(events, next_page, page)
+    if prev_cursor:
         nav_row.append(
-            InlineKeyboardButton(text="Prev", callback_data=f"eventsall {page-1}")
+            InlineKeyboardButton(
+                text="Prev", callback_data=f"eventsall {prev_cursor.encode()}"
+            )
         )
-    if next_page:
+    if next_cursor:
         nav_row.append(
-            InlineKeyboardButton(text="Next", callback_data=f"eventsall {page+1}")
+            InlineKeyboardButton(
+                text="Next", callback_data=f"eventsall {next_cursor.encode()}"
+            )
         )
     back_btn = InlineKeyboardButton(text="Back", callback_data="menu")
     event_layout.extend([nav_row, [back_btn]])
@@ -85,20 +99,22 @@ def _all_events_nav_markup(
 
 
 def _artist_events_nav_markup(
-    next_page: bool, artist_id: UUID, event: Event, page: int = 0
+    next_page: bool, artist_id: UUID, events: list[EventPreview], page: int = 0
 ) -> InlineKeyboardMarkup:
-    event_layout = _event_layout(event)
+    event_layout = _event_layout(events[-1])
     nav_row: list[InlineKeyboardButton] = []
-    if page > 0:
+    prev_cursor, next_cursor = _nav_cursors(events, next_page, page)
+    artist = encode_uuid(artist_id)
+    if prev_cursor:
         nav_row.append(
             InlineKeyboardButton(
-                text="Prev", callback_data=f"eventsar {artist_id} {page-1}"
+                text="Prev", callback_data=f"eventsar {artist} {prev_cursor.encode()}"
             )
         )
-    if next_page:
+    if next_cursor:
         nav_row.append(
             InlineKeyboardButton(
-                text="Next", callback_data=f"eventsar {artist_id} {page+1}"
+                text="Next", callback_data=f"eventsar {artist} {next_cursor.encode()}"
             )
         )
     back_callback_data = f"artist {artist_id}"
@@ -108,14 +124,14 @@ def _artist_events_nav_markup(
     return markup
 
 
-def _event_text(event: Event) -> str:
+def _event_text(event: EventPreview) -> str:
     result = f"{event.title}\n\n{event.date.strftime('%Y %B %d')}"
     return result
 
 
 async def _send_artist_events(
     ctx: BTContext,
-    events: list[Event],
+    events: list[EventPreview],
     artist: Artist,
     next_page: bool,
     page: int,
@@ -140,14 +156,14 @@ async def _send_artist_events(
 
 async def _send_artist_events_short(
     ctx: BTContext,
-    event: Event,
+    event: EventPreview,
     next_page: bool,
     artist: Artist,
     page: int,
 ) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     nav_markup = _artist_events_nav_markup(
-        event=event, next_page=next_page, page=page, artist_id=artist.id
+        events=[event], next_page=next_page, page=page, artist_id=artist.id
     )
     text = f"----------- {artist.name} events -----------\nPage {page+1}\n\n"
     text += _event_text(event)
@@ -161,12 +177,12 @@ async def _send_artist_events_short(
 
 async def _send_artist_events_long(
     ctx: BTContext,
-    events: list[Event],
+    events: list[EventPreview],
     artist: Artist,
     next_page: bool,
     page: int,
 ) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     # head
     head_markup = _event_markup(event=events[0])
     text = f"----------- {artist.name} events -----------\nPage {page+1}\n\n"
@@ -196,7 +212,7 @@ async def _send_artist_events_long(
 
     # nav
     nav_markup = _artist_events_nav_markup(
-        event=events[-1], artist_id=artist.id, next_page=next_page, page=page
+        events=events, artist_id=artist.id, next_page=next_page, page=page
     )
     event_text = _event_text(events[-1])
     await ctx.msg.send_text(
@@ -210,7 +226,7 @@ async def _send_artist_events_long(
 
 async def _send_all_events(
     ctx: BTContext,
-    events: list[Event],
+    events: list[EventPreview],
     next_page: bool,
     page: int,
 ) -> None:
@@ -226,12 +242,12 @@ async def _send_all_events(
 
 async def _send_all_events_short(
     ctx: BTContext,
-    event: Event,
+    event: EventPreview,
     next_page: bool,
     page: int,
 ) -> None:
-    user = await ctx.user()
-    nav_markup = _all_events_nav_markup(event=event, next_page=next_page, page=page)
+    user = await ctx.user(follows=False)
+    nav_markup = _all_events_nav_markup(events=[event], next_page=next_page, page=page)
     text = f"----------- Tracked events -----------\nPage {page+1}\n\n"
     text += _event_text(event)
     await ctx.msg.send_text(
@@ -244,11 +260,11 @@ async def _send_all_events_short(
 
 async def _send_all_events_long(
     ctx: BTContext,
-    events: list[Event],
+    events: list[EventPreview],
     next_page: bool,
     page: int,
 ) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     # head
     head_markup = _event_markup(event=events[0])
@@ -279,9 +295,7 @@ async def _send_all_events_long(
     await asyncio.gather(*tasks)
 
     # nav
-    nav_markup = _all_events_nav_markup(
-        event=events[-1], next_page=next_page, page=page
-    )
+    nav_markup = _all_events_nav_markup(events=events, next_page=next_page, page=page)
     event_text = _event_text(events[-1])
     await ctx.msg.send_text(
         text=event_text,
@@ -293,43 +307,44 @@ async def _send_all_events_long(
 
 
 async def all_events_command(_: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
-    events = await ctx.dal.get_events_for_user(
+    user = await ctx.user(follows=False)
+    events_page = await ctx.dal.get_user_events_page(
         user_tg_id=user.tg_id, events_per_page=EVENTS_PER_PAGE
     )
-    total_events = await ctx.dal.get_user_events_amount(user.tg_id)
-    next_page = False
-    if (total_events - 1) // EVENTS_PER_PAGE > 0:
-        next_page = True
     await _send_all_events(
         ctx=ctx,
-        events=events,
-        next_page=next_page,
+        events=events_page.events,
+        next_page=events_page.has_next,
         page=0,
     )
 
 
 async def all_events_btn(update: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     query = update.callback_query
-    page = _get_all_events_callback_data(query)
+    cursor = _get_all_events_callback_data(query)
 
-    events = await ctx.dal.get_events_for_user(
-        user_tg_id=user.tg_id, events_per_page=EVENTS_PER_PAGE, page=page
+    events_page = await ctx.dal.get_user_events_page(
+        user_tg_id=user.tg_id,
+        events_per_page=EVENTS_PER_PAGE,
+        after=cursor.after,
+        before=cursor.before,
     )
+    if not events_page.events and cursor.event_id:
+        # the event the cursor points to is gone, start from the beginning
+        cursor = EventsCursor()
+        events_page = await ctx.dal.get_user_events_page(
+            user_tg_id=user.tg_id, events_per_page=EVENTS_PER_PAGE
+        )
 
     assert query
     await query.answer()
-    total_events = await ctx.dal.get_user_events_amount(user.tg_id)
-    next_page = False
-    if (total_events - 1) // EVENTS_PER_PAGE > page:
-        next_page = True
 
     await _send_all_events(
         ctx=ctx,
-        events=events,
-        next_page=next_page,
-        page=page,
+        events=events_page.events,
+        next_page=events_page.has_next,
+        page=cursor.page,
     )
 
 
@@ -338,31 +353,37 @@ async def artist_events(update: Update, ctx: BTContext) -> None:
     assert query
     await query.answer()
 
-    artist_id, page = _get_artist_events_callback_data(query)
+    artist_id, cursor = _get_artist_events_callback_data(query)
 
-    total_events = await ctx.dal.get_artist_events_amount(artist_id)
     artist = await ctx.dal.get_artist(artist_id)
     if artist is None:
         log.error(f"Artist events handler can't find an artist {artist_id}")
         return
 
-    events = await ctx.dal.get_events_for_artist(artist_id=artist_id, page=page)
-    if not events:
+    events_page = await ctx.dal.get_artist_events_page(
+        artist_id=artist_id,
+        events_per_page=EVENTS_PER_PAGE,
+        after=cursor.after,
+        before=cursor.before,
+    )
+    if not events_page.events and cursor.event_id:
+        # the event the cursor points to is gone, start from the beginning
+        cursor = EventsCursor()
+        events_page = await ctx.dal.get_artist_events_page(
+            artist_id=artist_id, events_per_page=EVENTS_PER_PAGE
+        )
+    if not events_page.events:
         log.warning(
             "Trying to watch a page of artist events when there's not enough events"
         )
         return
 
-    next_page = False
-    if (total_events - 1) // EVENTS_PER_PAGE > page:
-        next_page = True
-
     await _send_artist_events(
         ctx=ctx,
-        events=events,
+        events=events_page.events,
         artist=artist,
-        next_page=next_page,
-        page=page,
+        next_page=events_page.has_next,
+        page=cursor.page,
     )
 
 
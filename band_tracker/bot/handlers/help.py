@@ -55,7 +55,7 @@ async def show_help(update: Update, ctx: BTContext) -> None:
     if query:
         await query.answer()
 
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     markup = _help_markup()
     await ctx.msg.send_text(
         text="Q&A. Choose a question.",
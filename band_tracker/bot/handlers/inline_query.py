@@ -15,7 +15,7 @@ async def handle_inline_query(update: Update, ctx: BTContext) -> None:
     query_raw = update.inline_query.query
     query = " ".join(query_raw.split())
     log.debug(f"Processed inline query string: {query}")
-    result_artists = await ctx.dal.search_artist(query)
+    result_artists = await ctx.search_artists(query)
 
     log.debug(f"Result artists amount: {len(result_artists)}")
 
@@ -3,6 +3,7 @@ import logging
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CallbackQueryHandler, CommandHandler
 
+from band_tracker.bot.helpers.callback_data import EventsCursor
 from band_tracker.bot.helpers.context import BTContext
 from band_tracker.core.enums import MessageType
 
@@ -18,14 +19,16 @@ async def send_menu(update: Update, ctx: BTContext) -> None:
             InlineKeyboardButton("Settings", callback_data="settings"),
         ],
         [
-            InlineKeyboardButton("Events", callback_data="eventsall 0"),
+            InlineKeyboardButton(
+                "Events", callback_data=f"eventsall {EventsCursor().encode()}"
+            ),
         ],
         [
             InlineKeyboardButton("Help", callback_data="help"),
         ],
     ]
     markup = InlineKeyboardMarkup(markup_layout)
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     query = update.callback_query
     if query:
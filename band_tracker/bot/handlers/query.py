@@ -10,7 +10,7 @@ log = logging.getLogger(__name__)
 
 
 async def query_artists(update: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     args = ctx.args
     assert args
@@ -19,7 +19,7 @@ async def query_artists(update: Update, ctx: BTContext) -> None:
     if len(query) > 255:
         query = query[:255]
 
-    result_artists = await ctx.dal.search_artist(query)
+    result_artists = await ctx.search_artists(query)
     result_artist_names = [artist.name for artist in result_artists]
 
     if result_artist_names:
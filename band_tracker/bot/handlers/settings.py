@@ -31,7 +31,7 @@ async def _generate_markup(dal: BotDAL, user_tg_id: int) -> InlineKeyboardMarkup
 
 
 async def show_settings(update: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     markup = await _generate_markup(dal=ctx.dal, user_tg_id=user.tg_id)
 
     assert update.effective_chat
@@ -10,7 +10,7 @@ log = logging.getLogger(__name__)
 
 
 async def start(_: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
 
     welcoming_text = f"Welcome {user.name}! Use `/help` command to get started!"
     await ctx.msg.send_text(
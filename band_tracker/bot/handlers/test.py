@@ -10,7 +10,7 @@ log = logging.getLogger(__name__)
 
 
 async def test(update: Update, ctx: BTContext) -> None:
-    user = await ctx.user()
+    user = await ctx.user(follows=False)
     if not update.effective_chat:
         log.warning("Test handler can't find an effective chat of an update")
 
@@ -0,0 +1,268 @@
+import asyncio
+import logging
+import math
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, Protocol
+from uuid import UUID
+
+from rapidfuzz.distance.Levenshtein import normalized_similarity
+
+from band_tracker.core.artist import ArtistPreview
+from band_tracker.db.dal_bot import normalize_search_str
+
+log = logging.getLogger(__name__)
+
+# rough per entry overhead of dicts, lists and arrays holding the index
+ENTRY_OVERHEAD = 100
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of a normalized word, padded the same way pg_trgm does"""
+    padded = f"  {text} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+class ArtistIndexDAL(Protocol):
+    def iter_aliases(
+        self, added_after: datetime | None = None, batch_size: int = 10000
+    ) -> AsyncIterator[list[tuple[str, UUID, datetime]]]:
+        ...
+
+    async def get_artist_previews(self, ids: list[UUID]) -> list[ArtistPreview]:
+        ...
+
+
+class ArtistSearchIndex:
+    """
+    In-process fuzzy search over normalized artist aliases.
+    Aliases are indexed by their trigrams, candidates sharing enough trigrams
+    with a query are filtered by trigram similarity like the `%` operator
+    of pg_trgm does and ranked by edit distance.
+    The index is built from `artist_alias` and refreshed with the aliases
+    added since. It stops growing and reports itself as not ready once its
+    estimated size exceeds `max_memory` bytes, so searches fall back to the db.
+    Previews of the artists invalidated by the updater are reloaded on the
+    next refresh, all of them are reloaded every `preview_ttl`.
+    Queries shorter than `min_query_length` or matching more than
+    `max_candidates` aliases are left to the db as well, they would block
+    the event loop for too long.
+    """
+
+    def __init__(
+        self,
+        dal: ArtistIndexDAL,
+        max_memory: int = 512 * 2**20,  # bytes
+        refresh_interval: timedelta = timedelta(minutes=5),
+        min_query_length: int = 3,
+        max_candidates: int = 5000,
+        preview_ttl: timedelta = timedelta(hours=1),
+    ) -> None:
+        self.dal = dal
+        self.max_memory = max_memory
+        self.refresh_interval = refresh_interval
+        self.min_query_length = min_query_length
+        self.max_candidates = max_candidates
+        self.preview_ttl = preview_ttl
+
+        self.built = False
+        self.overflow = False
+        self._last_added: datetime | None = None
+        self._previews_loaded = datetime.now()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._aliases: list[str] = []
+        self._alias_positions: dict[str, int] = {}
+        self._alias_artists = array("I")
+        self._artist_ids: list[UUID] = []
+        self._artist_positions: dict[UUID, int] = {}
+        self._postings: dict[str, array] = {}
+        self._previews: dict[UUID, ArtistPreview] = {}
+        self._stale_previews: set[UUID] = set()
+        self.memory = 0
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    @property
+    def ready(self) -> bool:
+        return self.built and not self.overflow
+
+    def _artist_position(self, artist_id: UUID) -> int:
+        position = self._artist_positions.get(artist_id)
+        if position is None:
+            position = len(self._artist_ids)
+            self._artist_ids.append(artist_id)
+            self._artist_positions[artist_id] = position
+            self.memory += ENTRY_OVERHEAD
+        return position
+
+    def add(self, alias: str, artist_id: UUID) -> None:
+        normalized = normalize_search_str(alias)
+        if not normalized or normalized in self._alias_positions:
+            return
+
+        position = len(self._aliases)
+        self._aliases.append(normalized)
+        self._alias_positions[normalized] = position
+        self._alias_artists.append(self._artist_position(artist_id))
+        self.memory += sys.getsizeof(normalized) + ENTRY_OVERHEAD
+
+        for trigram in trigrams(normalized):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[trigram] = array("I")
+                self.memory += sys.getsizeof(trigram) + sys.getsizeof(postings)
+            postings.append(position)
+            self.memory += postings.itemsize
+
+    def _set_previews(self, previews: list[ArtistPreview]) -> None:
+        for preview in previews:
+            old = self._previews.get(preview.id)
+            if old is not None:
+                self.memory -= self._preview_size(old)
+            self._previews[preview.id] = preview
+            self.memory += self._preview_size(preview)
+
+    @staticmethod
+    def _preview_size(preview: ArtistPreview) -> int:
+        return (
+            sys.getsizeof(preview)
+            + sys.getsizeof(preview.name)
+            + sys.getsizeof(preview.image)
+            + sys.getsizeof(preview.genres)
+            + ENTRY_OVERHEAD
+        )
+
+    def invalidate(self, artist_ids: Iterable[UUID]) -> None:
+        """Marks previews of artists changed by the updater to be reloaded"""
+        self._stale_previews.update(
+            artist_id for artist_id in artist_ids if artist_id in self._previews
+        )
+
+    def invalidate_all(self) -> None:
+        self._stale_previews.update(self._previews)
+
+    async def _reload_previews(self, batch_size: int = 10000) -> None:
+        if datetime.now() - self._previews_loaded > self.preview_ttl:
+            self.invalidate_all()
+            self._previews_loaded = datetime.now()
+        stale = list(self._stale_previews)
+        self._stale_previews = set()
+        for start in range(0, len(stale), batch_size):
+            batch = stale[start : start + batch_size]
+            self._set_previews(await self.dal.get_artist_previews(batch))
+
+    def _check_memory(self) -> bool:
+        """Drops the whole index once it exceeds `max_memory`"""
+        if self.memory <= self.max_memory:
+            return True
+        log.warning(
+            f"Artist index exceeded {self.max_memory} bytes "
+            f"with {len(self)} aliases, searching in the db instead"
+        )
+        self.overflow = True
+        self._clear()
+        return False
+
+    async def refresh(self) -> None:
+        """Indexes aliases added since the last refresh, all of them at first"""
+        if self.overflow:
+            return
+        # aliases committed late might carry an earlier time than the last one
+        added_after = (
+            self._last_added - timedelta(minutes=1) if self._last_added else None
+        )
+        aliases_number = len(self)
+
+        async for batch in self.dal.iter_aliases(added_after=added_after):
+            artist_ids: set[UUID] = set()
+            for alias, artist_id, added_at in batch:
+                self.add(alias, artist_id)
+                artist_ids.add(artist_id)
+                if self._last_added is None or added_at > self._last_added:
+                    self._last_added = added_at
+            # aliases are added with renames, so previews are refreshed too
+            self._set_previews(await self.dal.get_artist_previews(list(artist_ids)))
+            self._stale_previews -= artist_ids
+
+            if not self._check_memory():
+                return
+
+        await self._reload_previews()
+        if not self._check_memory():
+            return
+        self.built = True
+        log.debug(
+            f"Artist index refreshed, {len(self) - aliases_number} aliases added, "
+            f"{len(self)} aliases, ~{self.memory // 2**20} MB"
+        )
+
+    async def run(self) -> None:
+        """Builds the index and keeps refreshing it"""
+        while not self.overflow:
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.error(f"Artist index refresh failed: {e!r}")
+            await asyncio.sleep(self.refresh_interval.total_seconds())
+
+    def _candidates(
+        self, query_trigrams: set[str], similarity_min: float
+    ) -> set[int] | None:
+        """
+        Returns positions of aliases sharing at least `similarity_min` of
+        the query trigrams. Such alias has to be present in at least one of
+        the rarest `len - required + 1` postings, the rest can be skipped.
+        Returns None if there are more than `max_candidates` of them.
+        """
+        required = max(1, math.ceil(similarity_min * len(query_trigrams) - 1e-9))
+        postings = sorted(
+            (self._postings.get(trigram, array("I")) for trigram in query_trigrams),
+            key=len,
+        )[: len(query_trigrams) - required + 1]
+        if sum(len(positions) for positions in postings) > self.max_candidates:
+            return None
+        candidates: set[int] = set()
+        for positions in postings:
+            candidates.update(positions)
+        return candidates
+
+    def search(
+        self, search_str: str, similarity_min: float = 0.3, limit: int = 10
+    ) -> list[ArtistPreview] | None:
+        """
+        Returns artists ranked by similarity of their aliases to the query,
+        None if the index can't answer and the db should be queried instead
+        """
+        if not self.ready or similarity_min <= 0:
+            return None
+        query = normalize_search_str(search_str)
+        if not query:
+            return []
+        if len(query) < self.min_query_length:
+            return None
+
+        query_trigrams = trigrams(query)
+        candidates = self._candidates(query_trigrams, similarity_min)
+        if candidates is None:
+            return None
+        scores: dict[int, tuple[float, float]] = {}
+        for position in candidates:
+            alias = self._aliases[position]
+            alias_trigrams = trigrams(alias)
+            similarity = len(query_trigrams & alias_trigrams) / len(
+                query_trigrams | alias_trigrams
+            )
+            if similarity < similarity_min:
+                continue
+            score = (normalized_similarity(query, alias), similarity)
+            artist = self._alias_artists[position]
+            if score > scores.get(artist, (-1.0, -1.0)):
+                scores[artist] = score
+
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        previews = (self._previews.get(self._artist_ids[artist]) for artist in ranked)
+        return [preview for preview in previews if preview is not None][:limit]
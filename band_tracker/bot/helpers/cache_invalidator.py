@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+from datetime import timedelta
+from uuid import UUID
+
+from aio_pika import ExchangeType, connect
+from aio_pika.abc import AbstractIncomingMessage
+
+from band_tracker.bot.helpers.artist_index import ArtistSearchIndex
+from band_tracker.db.dal_bot import BotDAL
+from band_tracker.mq_publisher import MessageType
+
+log = logging.getLogger(__name__)
+
+
+class CacheInvalidator:
+    """
+    Drops artists and events written by the updater from the caches of BotDAL
+    and marks their previews in the artist index to be reloaded.
+    Every bot process consumes its own exclusive queue, so all of them receive
+    every invalidation message.
+    Messages published while the consumer is disconnected are lost, so the
+    caches are cleared whenever the connection is lost and once reconnected.
+    """
+
+    def __init__(
+        self,
+        dal: BotDAL,
+        mq_url: str,
+        mq_routing_key: str,
+        exchange_name: str,
+        retry_delay: timedelta = timedelta(seconds=1),
+        max_retry_delay: timedelta = timedelta(minutes=1),
+        artist_index: ArtistSearchIndex | None = None,
+    ) -> None:
+        self.dal = dal
+        self.artist_index = artist_index
+        self.mq_url = mq_url
+        self.mq_routing_key = mq_routing_key
+        self.mq_exchange_name = exchange_name
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.connected = False
+
+    async def consume(self) -> None:
+        """Consumes invalidation messages, reconnecting with backoff on failures"""
+        delay = self.retry_delay
+        while True:
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Cache invalidation consumer failed")
+
+            if self.connected:
+                delay = self.retry_delay
+            self.connected = False
+            self._invalidate_all()
+            log.info(f"Reconnecting to the broker in {delay.total_seconds()}s")
+            await asyncio.sleep(delay.total_seconds())
+            delay = min(delay * 2, self.max_retry_delay)
+
+    async def _consume(self) -> None:
+        connection = await connect(self.mq_url)
+        async with connection:
+            closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+            def on_close(sender: object, exc: BaseException | None) -> None:
+                if not closed.done():
+                    closed.set_exception(ConnectionError(f"Connection closed: {exc}"))
+
+            connection.close_callbacks.add(on_close)
+            channel = await connection.channel()
+
+            exchange = await channel.declare_exchange(
+                self.mq_exchange_name, ExchangeType.DIRECT
+            )
+            queue = await channel.declare_queue(exclusive=True)
+            await queue.bind(exchange, self.mq_routing_key)
+            await queue.consume(self.on_message)
+            # updates published before the queue was bound were missed
+            self._invalidate_all()
+            self.connected = True
+            log.info("Cache invalidation consumer connected")
+            await closed
+
+    def _invalidate_all(self) -> None:
+        self.dal.invalidate_all()
+        if self.artist_index is not None:
+            self.artist_index.invalidate_all()
+
+    async def on_message(self, message: AbstractIncomingMessage) -> None:
+        async with message.process():
+            if message.type != MessageType.invalidation.value:
+                log.warning(f"Unexpected message of type {message.type} skipped")
+                return
+            msg = json.loads(message.body.decode())
+            artist_ids = [UUID(artist_id) for artist_id in msg.get("artists", [])]
+            event_ids = [UUID(event_id) for event_id in msg.get("events", [])]
+            self.dal.invalidate(artist_ids=artist_ids, event_ids=event_ids)
+            if self.artist_index is not None:
+                self.artist_index.invalidate(artist_ids)
+            log.debug(
+                f"Cache invalidated: {len(artist_ids)} artists, {len(event_ids)} events"
+            )
@@ -1,3 +1,9 @@
+import binascii
+import struct
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from uuid import UUID
+
 from telegram import CallbackQuery
 from telegram.ext import InvalidCallbackData
 
@@ -23,3 +29,53 @@ def get_multiple_fields(query: CallbackQuery | None) -> list[str]:
     if len(result) < 2:
         raise InvalidCallbackData(f"Not enough fields in callback data, {query.data}")
     return result
+
+
+def encode_uuid(uuid: UUID) -> str:
+    """Packs a uuid into 22 characters to fit more into callback data"""
+    return urlsafe_b64encode(uuid.bytes).decode().rstrip("=")
+
+
+def decode_uuid(data: str) -> UUID:
+    try:
+        return UUID(bytes=urlsafe_b64decode(data + "=" * (-len(data) % 4)))
+    except (ValueError, binascii.Error):
+        raise InvalidCallbackData(f"Invalid encoded UUID, {data}")
+
+
+@dataclass(frozen=True)
+class EventsCursor:
+    """
+    Position in an events feed carried by the navigation buttons.
+    Telegram limits callback data to 64 bytes, so the cursor is packed
+    into at most 26 characters: page number, direction and the id of the event
+    the page follows (`after`) or precedes (`before`).
+    """
+
+    page: int = 0
+    event_id: UUID | None = None
+    backward: bool = False
+
+    @property
+    def after(self) -> UUID | None:
+        return None if self.backward else self.event_id
+
+    @property
+    def before(self) -> UUID | None:
+        return self.event_id if self.backward else None
+
+    def encode(self) -> str:
+        data = struct.pack(">H?", self.page, self.backward)
+        if self.event_id is not None:
+            data += self.event_id.bytes
+        return urlsafe_b64encode(data).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls: type["EventsCursor"], data: str) -> "EventsCursor":
+        try:
+            raw = urlsafe_b64decode(data + "=" * (-len(data) % 4))
+            page, backward = struct.unpack(">H?", raw[:3])
+            event_id = UUID(bytes=raw[3:]) if raw[3:] else None
+        except (ValueError, binascii.Error, struct.error):
+            raise InvalidCallbackData(f"Invalid events cursor, {data}")
+        return cls(page=page, event_id=event_id, backward=backward)
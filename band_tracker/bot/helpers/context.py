@@ -4,8 +4,10 @@ from telegram import Bot, Chat, Message, Update
 from telegram import User as TGUser
 from telegram.ext import Application, CallbackContext
 
+from band_tracker.bot.helpers.artist_index import ArtistSearchIndex
 from band_tracker.bot.helpers.get_user import get_user
 from band_tracker.bot.helpers.interfaces import MessageManager
+from band_tracker.core.artist import Artist, ArtistPreview
 from band_tracker.core.user import User
 from band_tracker.db.dal_bot import BotDAL
 
@@ -15,12 +17,14 @@ log = logging.getLogger(__name__)
 class BTContext(CallbackContext[Bot, dict, dict, dict]):
     _update: Update
     _user: User | None = None
+    _user_follows: bool = False
     _tg_user: TGUser | None = None
     _chat: Chat | None = None
     _message: Message | None = None
 
     dal: BotDAL
     msg: MessageManager
+    artist_index: ArtistSearchIndex | None
 
     @property
     def tg_user(self) -> TGUser:
@@ -55,12 +59,25 @@ class BTContext(CallbackContext[Bot, dict, dict, dict]):
             self._message = message
         return self._message
 
-    async def user(self) -> User:
-        if self._user is None:
-            user = await get_user(tg_user=self.tg_user, dal=self.dal)
+    async def user(self, follows: bool = True) -> User:
+        """
+        Returns the user of an update, cached for the rest of the update.
+        Handlers not looking at user follows should pass `follows=False`.
+        """
+        if self._user is None or (follows and not self._user_follows):
+            user = await get_user(tg_user=self.tg_user, dal=self.dal, follows=follows)
             self._user = user
+            self._user_follows = follows
         return self._user
 
+    async def search_artists(self, query: str) -> list[Artist] | list[ArtistPreview]:
+        """Searches the in-memory artist index, the db if the index is cold"""
+        if self.artist_index is not None:
+            result = self.artist_index.search(query)
+            if result is not None:
+                return result
+        return await self.dal.search_artist(query)
+
     @classmethod
     def from_update(cls: type, update: object, application: Application) -> "BTContext":
         # mypy typechecking bug with factory classmethods
@@ -72,5 +89,6 @@ class BTContext(CallbackContext[Bot, dict, dict, dict]):
         context._update = update
         context.dal = context.bot_data["dal"]
         context.msg = context.bot_data["msg"]
+        context.artist_index = context.bot_data.get("artist_index")
 
         return context
@@ -29,12 +29,13 @@ def default_user(user_tg: TgUser) -> RawUser:
     return user
 
 
-async def get_user(tg_user: TgUser, dal: BotDAL) -> User:
+async def get_user(tg_user: TgUser, dal: BotDAL, follows: bool = True) -> User:
     """
     Returns core User for a passed tg user, or registers a new one
     and returns it if user doesn't exist.
+    User follows are left empty with `follows=False`.
     """
-    user = await dal.get_user(tg_user.id)
+    user = await dal.get_user(tg_user.id, follows=follows)
     if user:
         log.debug("get_user bot helper found a user right away")
         return user
@@ -25,6 +25,26 @@ class MessageManager:
             tasks.append(task)
         await asyncio.gather(*tasks)
 
+    async def _register_message(
+        self, msg_type: MessageType, user: User, msg_id: int, delete_prev: bool
+    ) -> None:
+        """
+        Registers a sent message, previous interfaces are replaced by it
+        and deleted from the chat with `delete_prev`
+        """
+        if not delete_prev:
+            await self.dal.register_message(
+                message_type=msg_type, user_id=user.id, message_tg_id=msg_id
+            )
+            return
+        old_ids = await self.dal.replace_user_messages(
+            user_id=user.id,
+            no_delete=self._no_delete,
+            message_type=msg_type,
+            message_tg_id=msg_id,
+        )
+        await self.delete_messages(msg_ids=old_ids, chat_id=user.tg_id)
+
     async def send_text(
         self,
         text: str,
@@ -33,19 +53,14 @@ class MessageManager:
         msg_type: MessageType,
         delete_prev: bool = True,
     ) -> None:
-        if delete_prev:
-            old_ids = await self.dal.delete_user_messages(
-                user_id=user.id, no_delete=self._no_delete
-            )
-            await self.delete_messages(msg_ids=old_ids, chat_id=user.tg_id)
         msg = await self.bot.send_message(
             text=text,
             reply_markup=markup,
             chat_id=user.tg_id,
             parse_mode="HTML",
         )  # type: ignore
-        await self.dal.register_message(
-            message_type=msg_type, user_id=user.id, message_tg_id=msg.id
+        await self._register_message(
+            msg_type=msg_type, user=user, msg_id=msg.id, delete_prev=delete_prev
         )
 
     async def send_image(
@@ -57,11 +72,6 @@ class MessageManager:
         msg_type: MessageType,
         delete_prev: bool = True,
     ) -> None:
-        if delete_prev:
-            old_ids = await self.dal.delete_user_messages(
-                user_id=user.id, no_delete=self._no_delete
-            )
-            await self.delete_messages(msg_ids=old_ids, chat_id=user.tg_id)
         msg = await self.bot.send_photo(
             caption=text,
             reply_markup=markup,
@@ -69,8 +79,6 @@ class MessageManager:
             photo=image,
             parse_mode="HTML",
         )  # type: ignore
-        await self.dal.register_message(
-            message_type=msg_type,
-            user_id=user.id,
-            message_tg_id=msg.id,
+        await self._register_message(
+            msg_type=msg_type, user=user, msg_id=msg.id, delete_prev=delete_prev
         )
@@ -3,3 +3,6 @@ from band_tracker.core.enums import MessageType
 EVENTS_PER_PAGE = 5
 ARTISTS_PER_PAGE = 10
 NO_DELETE = [MessageType.TEST, MessageType.NOTIFICATION]
+ARTIST_INDEX_ENABLED = True
+ARTIST_INDEX_MAX_MEMORY = 512 * 2**20  # bytes
+INVALIDATION_ROUTING_KEY = "invalidation"
@@ -22,6 +22,14 @@ class DBEnvVars(NamedTuple):
     DB_IP: str
     DB_PORT: str
     DB_NAME: str
+    # optional pool tuning, presets of a process are used when unset
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_RECYCLE: int | None = None  # seconds
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int | None = None
+    DB_STATEMENT_TIMEOUT: int | None = None  # milliseconds
+    DB_REPLICA_URLS: list[str] | None = None
 
 
 class MQEnvVars(NamedTuple):
@@ -40,6 +48,25 @@ def _load_vars(names: list[str]) -> dict[str, Any]:
     return result
 
 
+def _load_optional_vars(names: dict[str, type]) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for var_name, type_ in names.items():
+        env_value = os.getenv(var_name)
+        if env_value is None or env_value == "":
+            continue
+        if type_ is bool:
+            result[var_name] = env_value.lower() in ("1", "true", "yes")
+            continue
+        if type_ is list:
+            result[var_name] = [value.strip() for value in env_value.split(",")]
+            continue
+        try:
+            result[var_name] = type_(env_value)
+        except ValueError:
+            raise EnvironmentError(f"{var_name} env var is not a valid {type_}")
+    return result
+
+
 def _load_tokens(var_name: str) -> dict[str, list[str]]:
     try:
         env_value = os.environ[var_name].split(",")
@@ -88,7 +115,17 @@ def db_env_vars() -> DBEnvVars:
         "DB_PORT",
         "DB_NAME",
     ]
+    optional_var_types = {
+        "DB_POOL_SIZE": int,
+        "DB_MAX_OVERFLOW": int,
+        "DB_POOL_RECYCLE": int,
+        "DB_POOL_PRE_PING": bool,
+        "DB_STATEMENT_CACHE_SIZE": int,
+        "DB_STATEMENT_TIMEOUT": int,
+        "DB_REPLICA_URLS": list,
+    }
     env_var_dict = _load_vars(env_var_names)
+    env_var_dict.update(_load_optional_vars(optional_var_types))
 
     return DBEnvVars(**env_var_dict)
 
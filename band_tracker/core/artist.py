@@ -35,3 +35,13 @@ class Artist:
     @property
     def upcoming_events_cnt(self) -> int:
         return len(self.event_ids)
+
+
+@dataclass(slots=True)
+class ArtistPreview:
+    """Fields of an artist shown in search results"""
+
+    id: UUID
+    name: str
+    image: str | None
+    genres: list[str] = field(default_factory=list)
@@ -48,3 +48,18 @@ class Event:
             result_artists.append(await dal.get_artist(artist_id))
 
         return result_artists
+
+
+@dataclass
+class EventPreview:
+    """Fields of an event shown in the events lists"""
+
+    id: UUID
+    title: str
+    date: datetime
+
+
+@dataclass
+class EventsPage:
+    events: list[EventPreview]
+    has_next: bool
@@ -1,10 +1,12 @@
+import importlib.util
 import logging
 import re
-from typing import Any, TypeAlias
+from datetime import datetime
+from typing import Any, Awaitable, Callable, TypeAlias
 from urllib.parse import urlparse, urlunparse
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import BaseModel, Field, StrictStr, field_validator
 
 from band_tracker.core.enums import EventSource
@@ -14,64 +16,96 @@ SourceSpecificArtistData: TypeAlias = dict[EventSource, dict[str, Any]]
 log = logging.getLogger(__name__)
 
 
-async def get_description(url: str, key_words: set[str]) -> str | None:
+# lxml is considerably faster than the pure-python parser, but is optional
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+CONTENT_STRAINER = SoupStrainer("div", id="mw-content-text")
+
+
+def parse_first_paragraph(html: str) -> str | None:
+    """Returns the cleaned first paragraph of a wikipedia article"""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=CONTENT_STRAINER)
+
+    content_div = soup.find("div", {"id": "mw-content-text"})
+    if not content_div:
+        log.warning("Could not find content div")
+        return None
+
+    content_text = content_div.find(
+        "div", {"class": "mw-parser-output"}  # type: ignore
+    )
+
+    if not content_text or isinstance(content_text, int):
+        log.warning("Could not find the right div class")
+        return None
+
+    find_params = {"class_": False, "id": False}
+    first_paragraph = content_text.find("p", **find_params)
+
+    log.debug(first_paragraph)
+    if not first_paragraph or isinstance(first_paragraph, int):
+        return None
+
+    flatten_text = re.sub(r"\([^)]*\)", "", first_paragraph.get_text())
+    return re.sub(r"\[\d+\]", "", flatten_text).strip()
+
+
+def filter_description(text: str | None, key_words: set[str]) -> str | None:
+    # excluding potentially irrelevant content to avoid data noise
+    if text is None:
+        return None
+    if any(key_word in text.lower() for key_word in key_words):
+        return text
+    log.warning("description text does not contain any artist reference")
+    return None
+
+
+async def fetch_first_paragraph(url: str, client: httpx.AsyncClient) -> str | None:
+    """
+    Returns the first paragraph of a wikipedia article, or None if the page
+    has none. Raises if the page could not be fetched
+    """
     # to skip httpx redirection
     parsed_url = urlparse(url)
     if parsed_url.scheme == "http":
         url = urlunparse(("https",) + parsed_url[1:])
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        for _ in range(5):
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                html = response.text
-                soup = BeautifulSoup(html, "html.parser")
-
-                content_div = soup.find("div", {"id": "mw-content-text"})
-                if not content_div:
-                    log.warning("Could not find content div")
-                    return None
-
-                content_text = content_div.find(
-                    "div", {"class": "mw-parser-output"}  # type: ignore
-                )
-
-                if not content_text or isinstance(content_text, int):
-                    log.warning("Could not find the right div class")
-                    return None
-
-                find_params = {"class_": False, "id": False}
-                first_paragraph = content_text.find("p", **find_params)
-
-                log.debug(first_paragraph)
-                if not first_paragraph or isinstance(first_paragraph, int):
-                    return None
-
-                flatten_text = re.sub(r"\([^)]*\)", "", first_paragraph.get_text())
-                text_without_references = re.sub(r"\[\d+\]", "", flatten_text).strip()
-
-                # excluding potentially irrelevant content to avoid data noise
-                if any(
-                    key_word in text_without_references.lower()
-                    for key_word in key_words
-                ):
-                    return text_without_references
-                else:
-                    log.warning(
-                        "description text does not contain any artist reference"
-                    )
-                    return None
-            except httpx.TimeoutException as e:
-                log.warning(e)
-                continue
-            except Exception as e:
-                log.error(e)
-                return None
-        else:
-            log.error("TIMEOUT")
-            raise httpx.TimeoutException("Wiki Timeout")
+    for _ in range(5):
+        try:
+            response = await client.get(url)
+        except httpx.TimeoutException as e:
+            log.warning(e)
+            continue
+        response.raise_for_status()
+        return parse_first_paragraph(response.text)
+    else:
+        log.error("TIMEOUT")
+        raise httpx.TimeoutException("Wiki Timeout")
+
+
+async def fetch_description(
+    url: str, key_words: set[str], client: httpx.AsyncClient | None = None
+) -> str | None:
+    """Raises if the page could not be fetched"""
+    if client is not None:
+        text = await fetch_first_paragraph(url, client)
+    else:
+        async with httpx.AsyncClient(timeout=30) as own_client:
+            text = await fetch_first_paragraph(url, own_client)
+    return filter_description(text, key_words)
+
+
+async def get_description(
+    url: str, key_words: set[str], client: httpx.AsyncClient | None = None
+) -> str | None:
+    """Returns None if the page could not be fetched"""
+    try:
+        return await fetch_description(url, key_words, client)
+    except Exception as e:
+        log.error(e)
+        return None
+
+
+DescriptionFetcher: TypeAlias = Callable[[str, set[str]], Awaitable[str | None]]
 
 
 class ArtistUpdateSocials(BaseModel):
@@ -95,6 +129,7 @@ class ArtistUpdate(BaseModel):
     genres: list[str] = Field(default_factory=list)
     aliases: list[str] = Field(default_factory=list)
     description: str | None = Field(None)
+    description_updated: datetime | None = Field(default=None)
 
     @field_validator("source_specific_data")
     def id_presence(
@@ -123,12 +158,21 @@ class ArtistUpdate(BaseModel):
         else:
             return {}
 
-    async def set_description(self) -> None:
+    async def set_description(self, fetcher: DescriptionFetcher | None = None) -> None:
+        """
+        Fetches a description from the artist's wiki page,
+        using fetch_description unless another fetcher is given.
+        The description is stamped as updated only if the page was fetched,
+        so failed fetches are retried by the next update
+        """
         wiki = self.socials.wiki
         if wiki:
-            key_words = set([self.name] + self.aliases)
-            self.description = await get_description(
-                wiki, {i.lower() for i in key_words}
-            )
+            key_words = {i.lower() for i in set([self.name] + self.aliases)}
+            try:
+                self.description = await (fetcher or fetch_description)(wiki, key_words)
+            except Exception as e:
+                log.warning(f"Description of {self.name} was not fetched: {e!r}")
+                return
         else:
             self.description = None
+        self.description_updated = datetime.now()
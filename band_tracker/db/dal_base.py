@@ -111,20 +111,25 @@ class BaseDAL:
         )
         return db_user
 
-    def _db_to_core_user(self, user_db: UserDB) -> User:
+    def _db_to_core_user(self, user_db: UserDB, follows: bool = True) -> User:
+        """Follows are left empty if they weren't loaded with `follows=False`"""
         settings = self._db_to_core_user_settings(user_db.settings)
-        follows = {
-            follow_db.artist_id: self._db_to_core_follow(follow_db)
-            for follow_db in user_db.follows
-            if follow_db.active
-        }
+        user_follows = (
+            {
+                follow_db.artist_id: self._db_to_core_follow(follow_db)
+                for follow_db in user_db.follows
+                if follow_db.active
+            }
+            if follows
+            else {}
+        )
         user = User(
             id=user_db.id,
             tg_id=user_db.tg_id,
             name=user_db.name,
             join_date=user_db.join_date,
             settings=settings,
-            follows=follows,
+            follows=user_follows,
         )
         return user
 
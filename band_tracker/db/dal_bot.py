@@ -1,15 +1,27 @@
 import logging
 import re
+from datetime import datetime, timedelta
+from typing import AsyncGenerator, Iterable
 from uuid import UUID
 
-from sqlalchemy import ScalarResult, desc, func, literal, select
+from sqlalchemy import (
+    ColumnElement,
+    ScalarResult,
+    Select,
+    desc,
+    func,
+    literal,
+    select,
+    tuple_,
+)
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import aliased, joinedload, selectinload
 
-from band_tracker.core.artist import Artist
+from band_tracker.core.artist import Artist, ArtistPreview
 from band_tracker.core.enums import AdminNotificationLevel, Range
-from band_tracker.core.event import Event
+from band_tracker.core.event import Event, EventPreview, EventsPage
 from band_tracker.core.user import RawUser, User
+from band_tracker.db.cache import TTLCache
 from band_tracker.db.dal_base import BaseDAL
 from band_tracker.db.errors import ArtistNotFound, UserAlreadyExists, UserNotFound
 from band_tracker.db.models import (
@@ -21,27 +33,112 @@ from band_tracker.db.models import (
     FollowDB,
     UserDB,
 )
+from band_tracker.db.session import AsyncSessionmaker
 
 log = logging.getLogger(__name__)
 
 
+def normalize_search_str(search_str: str) -> str:
+    return re.sub(r"\W+", "", search_str).lower()
+
+
 class BotDAL(BaseDAL):
+    def __init__(
+        self,
+        sessionmaker: AsyncSessionmaker,
+        search_cache_size: int = 1024,
+        search_cache_ttl: timedelta = timedelta(minutes=5),
+        entity_cache_size: int = 4096,
+        artist_cache_ttl: timedelta = timedelta(hours=1),
+        event_cache_ttl: timedelta = timedelta(minutes=30),
+        user_cache_size: int = 4096,
+        user_cache_ttl: timedelta = timedelta(seconds=30),
+        replica_lag: timedelta = timedelta(seconds=10),
+    ) -> None:
+        super().__init__(sessionmaker)
+        # artists, events and aliases are only written by the updater, cached
+        # data may lag behind it for the ttl unless the cache is invalidated
+        self.search_cache: TTLCache[tuple[str, float], list[Artist]] = TTLCache(
+            maxsize=search_cache_size, ttl=search_cache_ttl
+        )
+        self.artist_cache: TTLCache[UUID, Artist] = TTLCache(
+            maxsize=entity_cache_size, ttl=artist_cache_ttl
+        )
+        self.event_cache: TTLCache[UUID, Event] = TTLCache(
+            maxsize=entity_cache_size, ttl=event_cache_ttl
+        )
+        # users are cached with or without their follows, changes made
+        # through this dal drop them, the rest is bounded by the short ttl
+        self.user_cache: TTLCache[tuple[int, bool], User] = TTLCache(
+            maxsize=user_cache_size, ttl=user_cache_ttl
+        )
+        # reads go to replicas, but users read their own writes from the primary
+        # until replicas are expected to catch up
+        self.recent_writers: TTLCache[int, bool] = TTLCache(
+            maxsize=4096, ttl=replica_lag
+        )
+
+    def invalidate_search(self) -> None:
+        """Drops cached search results, should be called when aliases change"""
+        self.search_cache.clear()
+
+    def invalidate(
+        self,
+        artist_ids: Iterable[UUID] = (),
+        event_ids: Iterable[UUID] = (),
+    ) -> None:
+        """Drops cached artists and events changed by the updater"""
+        artist_ids = list(artist_ids)
+        for artist_id in artist_ids:
+            self.artist_cache.pop(artist_id)
+        for event_id in event_ids:
+            self.event_cache.pop(event_id)
+        if artist_ids:
+            self.invalidate_search()
+
+    def invalidate_all(self) -> None:
+        """Drops all cached artists, events and search results"""
+        self.artist_cache.clear()
+        self.event_cache.clear()
+        self.invalidate_search()
+
+    def invalidate_user(self, tg_id: int) -> None:
+        """
+        Drops a cached user, should be called when follows or settings change.
+        User data is read from the primary for the next `replica_lag`.
+        """
+        self.user_cache.pop((tg_id, True))
+        self.user_cache.pop((tg_id, False))
+        self.recent_writers.set(tg_id, True)
+
+    def _on_replica(self, user_tg_id: int) -> bool:
+        return user_tg_id not in self.recent_writers
+
     async def search_artist(
         self, search_str: str, similarity_min: float = 0.3
     ) -> list[Artist]:
         log.debug("In search artist")
 
-        sanitized_search_str = re.sub(r"\W+", "", search_str)
-        max_similarity = func.max(
-            func.similarity(ArtistAliasDB.alias, literal(sanitized_search_str))
-        ).label("max_similarity")
+        sanitized_search_str = normalize_search_str(search_str)
+        cache_key = (sanitized_search_str, similarity_min)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        similarity = func.similarity(ArtistAliasDB.alias, literal(sanitized_search_str))
+        alias_filter: ColumnElement[bool]
+        if similarity_min > 0:
+            # `%` operator is backed by the trigram index of aliases
+            alias_filter = ArtistAliasDB.alias.bool_op("%")(
+                literal(sanitized_search_str)
+            )
+        else:
+            alias_filter = similarity > similarity_min
+        max_similarity = func.max(similarity).label("max_similarity")
         subquery = (
             select(ArtistDB.id, max_similarity)
             .join(ArtistAliasDB, ArtistDB.id == ArtistAliasDB.artist_id)
-            .filter(
-                func.similarity(ArtistAliasDB.alias, literal(sanitized_search_str))
-                > similarity_min
-            )
+            .filter(alias_filter)
             .group_by(ArtistDB.id)
             .order_by(max_similarity.desc())
             .subquery()
@@ -54,82 +151,245 @@ class BotDAL(BaseDAL):
             .options(joinedload(ArtistDB.socials))
             .options(selectinload(ArtistDB.genres))
         )
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
+            if similarity_min > 0:
+                # applies to the current transaction only
+                await session.execute(
+                    select(
+                        func.set_config(
+                            "pg_trgm.similarity_threshold",
+                            str(min(similarity_min, 1.0)),
+                            True,
+                        )
+                    )
+                )
             scalars = await session.scalars(stmt)
             artists = scalars.all()
             if artists:
                 log.debug(f"First artist genres: {artists[0].genres}")
-            return [self._build_core_artist(db_artist=artist) for artist in artists]
+            result = [self._build_core_artist(db_artist=artist) for artist in artists]
 
-    async def get_events_for_user(
-        self, user_tg_id: int, page: int = 0, events_per_page: int = 5
+        self.search_cache.set(cache_key, result)
+        return list(result)
+
+    async def iter_aliases(
+        self, added_after: datetime | None = None, batch_size: int = 10000
+    ) -> AsyncGenerator[list[tuple[str, UUID, datetime]], None]:
+        """
+        Streams aliases with their artist ids and addition time in batches,
+        only the aliases added after the given datetime if it's set
+        """
+        stmt = select(
+            ArtistAliasDB.alias, ArtistAliasDB.artist_id, ArtistAliasDB.added_at
+        )
+        if added_after is not None:
+            stmt = stmt.where(ArtistAliasDB.added_at > added_after)
+        async with self.sessionmaker.session(read_only=True) as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions(batch_size):
+                yield [
+                    (alias, artist_id, added_at)
+                    for alias, artist_id, added_at in partition
+                ]
+
+    async def get_artist_previews(self, ids: list[UUID]) -> list[ArtistPreview]:
+        stmt = (
+            select(ArtistDB)
+            .where(ArtistDB.id.in_(ids))
+            .options(selectinload(ArtistDB.genres))
+        )
+        async with self.sessionmaker.session(read_only=True) as session:
+            scalars = await session.scalars(stmt)
+            return [
+                ArtistPreview(
+                    id=artist.id,
+                    name=artist.name,
+                    image=artist.image,
+                    genres=[genre.name for genre in artist.genres],
+                )
+                for artist in scalars.all()
+            ]
+
+    @staticmethod
+    def _keyset_page(
+        stmt: Select, after: UUID | None = None, before: UUID | None = None
+    ) -> Select:
+        """
+        Orders events query by (start_date, id) and keeps the events following
+        the `after` event or preceding the `before` one, so every page costs
+        a single index range scan no matter how deep it is.
+        Preceding events come in reversed order.
+        """
+        key = tuple_(EventDB.start_date, EventDB.id)
+        anchor = aliased(EventDB)
+        anchor_key = tuple_(anchor.start_date, anchor.id)
+        if after is not None:
+            stmt = stmt.join(anchor, anchor.id == after).where(key > anchor_key)
+            return stmt.order_by(EventDB.start_date, EventDB.id)
+        if before is not None:
+            stmt = stmt.join(anchor, anchor.id == before).where(key < anchor_key)
+            return stmt.order_by(desc(EventDB.start_date), desc(EventDB.id))
+        return stmt.order_by(EventDB.start_date, EventDB.id)
+
+    async def _get_events_page(
+        self,
+        stmt: Select,
+        events_per_page: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
+        read_only: bool = True,
     ) -> list[Event]:
         stmt = (
-            select(EventDB)
-            .join(EventArtistDB, EventDB.id == EventArtistDB.event_id)
-            .join(FollowDB, FollowDB.artist_id == EventArtistDB.artist_id)
-            .join(UserDB, UserDB.id == FollowDB.user_id)
-            .where(UserDB.tg_id == user_tg_id)
-            .where(FollowDB.active)
+            self._keyset_page(stmt, after=after, before=before)
+            .limit(events_per_page)
             .options(selectinload(EventDB.sales))
             .options(selectinload(EventDB.artists))
-            .order_by(EventDB.id)
-            .limit(events_per_page)
-            .offset(page * events_per_page)
         )
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=read_only) as session:
             scalars = await session.scalars(stmt)
             query_results = scalars.all()
 
-        return [self._build_core_event(event) for event in query_results]
+        events = [self._build_core_event(event) for event in query_results]
+        return events[::-1] if after is None and before is not None else events
 
-    async def get_user_events_amount(self, user_tg_id: int) -> int:
-        stmt = (
-            select(func.count())
-            .select_from(EventDB)
-            .join(EventArtistDB, EventDB.id == EventArtistDB.event_id)
+    async def _get_previews_page(
+        self,
+        stmt: Select,
+        events_per_page: int,
+        after: UUID | None = None,
+        before: UUID | None = None,
+        read_only: bool = True,
+    ) -> EventsPage:
+        """
+        Fetches a page of event previews with a single extra row
+        telling whether there is a next page
+        """
+        backward = after is None and before is not None
+        stmt = self._keyset_page(stmt, after=after, before=before).limit(
+            events_per_page + 1
+        )
+        async with self.sessionmaker.session(read_only=read_only) as session:
+            rows = (await session.execute(stmt)).all()
+
+        events = [
+            EventPreview(id=event_id, title=title, date=start_date)
+            for event_id, title, start_date in rows[:events_per_page]
+        ]
+        if backward:
+            # the page precedes the one the user came from
+            return EventsPage(events=events[::-1], has_next=True)
+        return EventsPage(events=events, has_next=len(rows) > events_per_page)
+
+    @staticmethod
+    def _followed_events(stmt: Select, user_tg_id: int) -> Select:
+        followed_event_ids = (
+            select(EventArtistDB.event_id)
             .join(FollowDB, FollowDB.artist_id == EventArtistDB.artist_id)
             .join(UserDB, UserDB.id == FollowDB.user_id)
             .where(UserDB.tg_id == user_tg_id)
             .where(FollowDB.active)
         )
-        async with self.sessionmaker.session() as session:
+        return stmt.where(EventDB.id.in_(followed_event_ids))
+
+    @staticmethod
+    def _artist_events(stmt: Select, artist_id: UUID) -> Select:
+        return stmt.join(EventArtistDB, EventDB.id == EventArtistDB.event_id).where(
+            EventArtistDB.artist_id == artist_id
+        )
+
+    async def get_events_for_user(
+        self,
+        user_tg_id: int,
+        events_per_page: int = 5,
+        after: UUID | None = None,
+        before: UUID | None = None,
+    ) -> list[Event]:
+        """
+        Returns a page of events of the artists followed by the user,
+        ordered by start date. The page follows the `after` event
+        or precedes the `before` one, the first page is returned otherwise.
+        """
+        stmt = self._followed_events(select(EventDB), user_tg_id)
+        return await self._get_events_page(
+            stmt,
+            events_per_page,
+            after=after,
+            before=before,
+            read_only=self._on_replica(user_tg_id),
+        )
+
+    async def get_user_events_page(
+        self,
+        user_tg_id: int,
+        events_per_page: int = 5,
+        after: UUID | None = None,
+        before: UUID | None = None,
+    ) -> EventsPage:
+        """
+        Same page as `get_events_for_user` but of event previews,
+        together with a flag of the next page
+        """
+        stmt = self._followed_events(
+            select(EventDB.id, EventDB.title, EventDB.start_date), user_tg_id
+        )
+        return await self._get_previews_page(
+            stmt,
+            events_per_page,
+            after=after,
+            before=before,
+            read_only=self._on_replica(user_tg_id),
+        )
+
+    async def get_user_events_amount(self, user_tg_id: int) -> int:
+        stmt = self._followed_events(select(func.count(EventDB.id)), user_tg_id)
+        read_only = self._on_replica(user_tg_id)
+        async with self.sessionmaker.session(read_only=read_only) as session:
             result = await session.scalar(stmt)
         return result
 
     async def get_events_for_artist(
-        self, artist_id: UUID, page: int, events_per_page: int = 5
+        self,
+        artist_id: UUID,
+        events_per_page: int = 5,
+        after: UUID | None = None,
+        before: UUID | None = None,
     ) -> list[Event]:
-        stmt = (
-            select(EventDB)
-            .join(EventArtistDB, EventDB.id == EventArtistDB.event_id)
-            .options(selectinload(EventDB.sales))
-            .options(selectinload(EventDB.artists))
-            .where(EventArtistDB.artist_id == artist_id)
-            .order_by(EventDB.id)
-            .limit(events_per_page)
-            .offset(page * events_per_page)
+        """
+        Returns a page of events of the artist ordered by start date,
+        paged the same way as `get_events_for_user`
+        """
+        stmt = self._artist_events(select(EventDB), artist_id)
+        return await self._get_events_page(
+            stmt, events_per_page, after=after, before=before
         )
-        async with self.sessionmaker.session() as session:
-            scalars = await session.scalars(stmt)
-            query_results = scalars.all()
 
-        return [self._build_core_event(event) for event in query_results]
+    async def get_artist_events_page(
+        self,
+        artist_id: UUID,
+        events_per_page: int = 5,
+        after: UUID | None = None,
+        before: UUID | None = None,
+    ) -> EventsPage:
+        """
+        Same page as `get_events_for_artist` but of event previews,
+        together with a flag of the next page
+        """
+        stmt = self._artist_events(
+            select(EventDB.id, EventDB.title, EventDB.start_date), artist_id
+        )
+        return await self._get_previews_page(
+            stmt, events_per_page, after=after, before=before
+        )
 
     async def get_artist_events_amount(self, artist_id: UUID) -> int:
-        stmt = (
-            select(func.count())
-            .select_from(EventDB)
-            .join(EventArtistDB, EventDB.id == EventArtistDB.event_id)
-            .where(EventArtistDB.artist_id == artist_id)
-        )
-        async with self.sessionmaker.session() as session:
+        stmt = self._artist_events(select(func.count()).select_from(EventDB), artist_id)
+        async with self.sessionmaker.session(read_only=True) as session:
             result = await session.scalar(stmt)
         return result
 
     async def get_artist_names(self, ids: list[UUID]) -> dict[UUID, str]:
         stmt = select(ArtistDB).filter(ArtistDB.id.in_(ids))
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
             scalars = await session.scalars(stmt)
             query_results = scalars.all()
         result = {artist.id: artist.name for artist in query_results}
@@ -142,7 +402,7 @@ class BotDAL(BaseDAL):
             .options(joinedload(ArtistDB.socials))
             .options(selectinload(ArtistDB.genres))
         )
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
             scalars = await session.scalars(stmt)
             artist = scalars.first()
         if artist is None:
@@ -165,6 +425,7 @@ class BotDAL(BaseDAL):
             existing_follow.active = False
             session.add(existing_follow)
             await session.commit()
+        self.invalidate_user(user_tg_id)
 
     async def add_follow(self, user_tg_id: int, artist_id: UUID) -> None:
         async with self.sessionmaker.session() as session:
@@ -181,6 +442,7 @@ class BotDAL(BaseDAL):
                     existing_follow.active = True
                     session.add(existing_follow)
                     await session.commit()
+                    self.invalidate_user(user_tg_id)
                     return
                 log.warning(
                     "Not adding a follow since it already exists and active. User "
@@ -199,6 +461,7 @@ class BotDAL(BaseDAL):
             follow = FollowDB(user=user, artist=artist, range_=Range.WORLDWIDE)
             session.add(follow)
             await session.commit()
+        self.invalidate_user(user_tg_id)
 
     async def add_admin(
         self,
@@ -215,42 +478,52 @@ class BotDAL(BaseDAL):
 
     async def get_admin_chats(self) -> list[str]:
         stmt = select(AdminDB)
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
             scalars = await session.scalars(stmt)
             admins_db = scalars.all()
             chats = [admin.chat_id for admin in admins_db]
             return chats
 
     async def get_event(self, id: UUID) -> Event | None:
+        cached = self.event_cache.get(id)
+        if cached is not None:
+            return cached
+
         stmt = (
             select(EventDB)
             .where(EventDB.id == id)
             .options(selectinload(EventDB.sales))
             .options(selectinload(EventDB.artists))
         )
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
             scalars = await session.scalars(stmt)
             event_db = scalars.first()
             if event_db is None:
                 return None
 
             event = self._build_core_event(event_db)
-            return event
+        self.event_cache.set(id, event)
+        return event
 
     async def get_artist(self, id: UUID) -> Artist | None:
+        cached = self.artist_cache.get(id)
+        if cached is not None:
+            return cached
+
         stmt = (
             select(ArtistDB)
             .where(ArtistDB.id == id)
             .options(joinedload(ArtistDB.genres))
             .options(selectinload(ArtistDB.socials))
         )
-        async with self.sessionmaker.session() as session:
+        async with self.sessionmaker.session(read_only=True) as session:
             scalars = await session.scalars(stmt)
             artist_db = scalars.first()
             if artist_db is None:
                 return None
 
         artist = self._build_core_artist(db_artist=artist_db)
+        self.artist_cache.set(id, artist)
         return artist
 
     async def add_user(self, user: RawUser) -> User:
@@ -264,16 +537,31 @@ class BotDAL(BaseDAL):
             await user_db.awaitable_attrs.follows
             await session.commit()
             result = self._db_to_core_user(user_db)
+        self.invalidate_user(result.tg_id)
+        self.user_cache.set((result.tg_id, True), result)
         return result
 
-    async def get_user(self, tg_id: int) -> User | None:
+    async def get_user(self, tg_id: int, follows: bool = True) -> User | None:
+        """
+        Returns a user by tg id, with `follows=False` user follows are
+        neither loaded nor returned
+        """
+        # a user with follows serves both kinds of requests
+        cached = self.user_cache.get((tg_id, True))
+        if cached is None and not follows:
+            cached = self.user_cache.get((tg_id, False))
+        if cached is not None:
+            return cached
+
         stmt = (
             select(UserDB)
             .where(UserDB.tg_id == tg_id)
-            .options(selectinload(UserDB.follows))
             .options(selectinload(UserDB.settings))
         )
-        async with self.sessionmaker.session() as session:
+        if follows:
+            stmt = stmt.options(selectinload(UserDB.follows))
+        read_only = self._on_replica(tg_id)
+        async with self.sessionmaker.session(read_only=read_only) as session:
             scalars: ScalarResult = await session.scalars(stmt)
 
             user_db = scalars.first()
@@ -281,4 +569,6 @@ class BotDAL(BaseDAL):
                 log.debug("Getting users, got zero results")
                 return None
             log.debug("Getting users, got at least one result")
-            return self._db_to_core_user(user_db)
+            user = self._db_to_core_user(user_db, follows=follows)
+        self.user_cache.set((tg_id, follows), user)
+        return user
@@ -0,0 +1,94 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from band_tracker.db.models import ChunkPlanDB, IteratorCheckpointDB
+from band_tracker.db.session import AsyncSessionmaker
+
+
+class IteratorDAL:
+    """Persists the state of the events iterator between updater runs"""
+
+    def __init__(self, sessionmaker: AsyncSessionmaker) -> None:
+        self.sessionmaker = sessionmaker
+
+    async def get_chunk_plan(
+        self, updated_after: datetime
+    ) -> list[tuple[datetime, datetime, str, int, int]]:
+        stmt = (
+            select(
+                ChunkPlanDB.start_date,
+                ChunkPlanDB.end_date,
+                ChunkPlanDB.country_code,
+                ChunkPlanDB.pages_number,
+                ChunkPlanDB.entities_number,
+            )
+            .where(ChunkPlanDB.last_update >= updated_after)
+            .order_by(ChunkPlanDB.start_date, ChunkPlanDB.country_code)
+        )
+        async with self.sessionmaker.session() as session:
+            raw_result = await session.execute(stmt)
+            return [tuple(row) for row in raw_result.all()]  # type: ignore
+
+    async def save_chunk_plan(
+        self, chunks: list[tuple[datetime, datetime, str, int, int]]
+    ) -> None:
+        """Replaces the stored plan with the given chunks"""
+        now = datetime.now()
+        async with self.sessionmaker.session() as session:
+            await session.execute(delete(ChunkPlanDB))
+            if chunks:
+                await session.execute(
+                    insert(ChunkPlanDB),
+                    [
+                        {
+                            "start_date": start,
+                            "end_date": end,
+                            "country_code": country_code,
+                            "pages_number": pages_number,
+                            "entities_number": entities_number,
+                            "last_update": now,
+                        }
+                        for (
+                            start,
+                            end,
+                            country_code,
+                            pages_number,
+                            entities_number,
+                        ) in chunks
+                    ],
+                )
+            await session.commit()
+
+    async def get_checkpoint(self) -> tuple[UUID, dict] | None:
+        """Returns the id and state of the latest checkpoint of an unfinished run"""
+        stmt = (
+            select(IteratorCheckpointDB)
+            .order_by(IteratorCheckpointDB.last_update.desc())
+            .limit(1)
+        )
+        async with self.sessionmaker.session() as session:
+            checkpoint = (await session.scalars(stmt)).first()
+        if checkpoint is None or checkpoint.finished:
+            return None
+        return checkpoint.id, checkpoint.state
+
+    async def save_checkpoint(
+        self, run_id: UUID, state: dict, finished: bool = False
+    ) -> None:
+        stmt = pg_insert(IteratorCheckpointDB).values(
+            id=run_id, state=state, finished=finished, last_update=datetime.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IteratorCheckpointDB.id],
+            set_={
+                "state": stmt.excluded.state,
+                "finished": stmt.excluded.finished,
+                "last_update": stmt.excluded.last_update,
+            },
+        )
+        async with self.sessionmaker.session() as session:
+            await session.execute(stmt)
+            await session.commit()
@@ -1,11 +1,12 @@
 import logging
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Table, Update, insert, select, update
 
 from band_tracker.core.enums import MessageType
 from band_tracker.db.dal_base import BaseDAL
-from band_tracker.db.models import MessageDB, UserDB
+from band_tracker.db.models import MessageDB
 
 log = logging.getLogger(__name__)
 
@@ -24,25 +25,62 @@ class MessageDAL(BaseDAL):
             await session.commit()
         return message_id
 
+    @staticmethod
+    def _deactivate_messages(user_id: UUID, no_delete: list[MessageType]) -> Update:
+        # core table statements, ORM ones lose sibling ctes when compiled
+        messages: Table = MessageDB.__table__  # type: ignore[assignment]
+        return (
+            update(messages)
+            .where(messages.c.user_id == user_id)
+            .where(messages.c.active)
+            .where(messages.c.message_type.not_in(no_delete))
+            .values(active=False)
+            .returning(messages.c.tg_message_id)
+        )
+
     async def delete_user_messages(
         self, user_id: UUID, no_delete: list[MessageType]
     ) -> list[int]:
         """
         Marks all active interfaces for a user as inactive and returns their tg ids.
         """
-        stmt = (
-            select(MessageDB)
-            .join(UserDB, UserDB.id == MessageDB.user_id)
-            .where(UserDB.id == user_id)
-            .where(MessageDB.active)
-            .where(MessageDB.message_type.not_in(no_delete))
+        stmt = self._deactivate_messages(user_id, no_delete)
+        async with self.sessionmaker.session() as session:
+            scalars = await session.scalars(stmt)
+            message_ids = list(scalars.all())
+            await session.commit()
+        return message_ids
+
+    async def replace_user_messages(
+        self,
+        user_id: UUID,
+        no_delete: list[MessageType],
+        message_type: MessageType,
+        message_tg_id: int,
+    ) -> list[int]:
+        """
+        Registers a sent message and marks the rest of active interfaces
+        for a user as inactive in a single statement, returns their tg ids.
+        """
+        deactivated = self._deactivate_messages(user_id, no_delete).cte("deactivated")
+        # both statements see the table as it was, the new message stays active
+        messages: Table = MessageDB.__table__  # type: ignore[assignment]
+        registered = (
+            insert(messages)
+            .values(
+                message_type=message_type,
+                user_id=user_id,
+                tg_message_id=message_tg_id,
+                # python side defaults are not applied to statements in ctes
+                timestamp=datetime.now(),
+                active=True,
+            )
+            .returning(messages.c.id)
+            .cte("registered")
         )
+        stmt = select(deactivated.c.tg_message_id).add_cte(registered)
         async with self.sessionmaker.session() as session:
             scalars = await session.scalars(stmt)
-            messages: list[MessageDB] = scalars.all()
-            message_ids = [message.tg_message_id for message in messages]
-            for message in messages:
-                message.active = False
-            session.add_all(messages)
+            message_ids = list(scalars.all())
             await session.commit()
         return message_ids
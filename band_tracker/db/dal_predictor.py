@@ -1,8 +1,9 @@
 import logging
-from datetime import datetime
+from datetime import datetime, time
 
-from sqlalchemy import text
+from sqlalchemy import select
 
+from band_tracker.db.models import DailyEventCountDB
 from band_tracker.db.session import AsyncSessionmaker
 
 log = logging.getLogger(__name__)
@@ -12,18 +13,20 @@ class PredictorDAL:
     def __init__(self, sessionmaker: AsyncSessionmaker) -> None:
         self.sessionmaker = sessionmaker
 
-    async def get_event_amounts(self) -> list[tuple[datetime, int]]:
-        # Using raw sql for query optimization, query has no params
-        stmt = text(
-            """
-        SELECT DATE_TRUNC('day', start_date) as dates, count(id)
-        FROM event
-        GROUP BY DATE_TRUNC('day', start_date)
-        ORDER BY DATE_TRUNC('day', start_date)
+    async def get_event_amounts(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, int]]:
         """
+        Returns amounts of events per day from `start` up to `end`,
+        ordered by day. Days without events are omitted.
+        """
+        stmt = (
+            select(DailyEventCountDB.day, DailyEventCountDB.amount)
+            .where(DailyEventCountDB.day >= start.date())
+            .where(DailyEventCountDB.day < end.date())
+            .order_by(DailyEventCountDB.day)
         )
         async with self.sessionmaker.session() as session:
             raw_result = await session.execute(stmt)
-            data = raw_result.fetchall()
-        result = data
-        return result
+            data = raw_result.all()
+        return [(datetime.combine(day, time()), amount) for day, amount in data]
@@ -1,10 +1,13 @@
 import logging
-from datetime import datetime
-from uuid import UUID
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from typing import AsyncGenerator, Iterable
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, case, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, selectinload
 
 from band_tracker.core.artist import Artist
 from band_tracker.core.enums import EventSource
@@ -13,6 +16,8 @@ from band_tracker.db.artist_update import ArtistUpdate, ArtistUpdateSocials
 from band_tracker.db.dal_base import BaseDAL
 from band_tracker.db.errors import DALError
 from band_tracker.db.event_update import EventUpdate, EventUpdateSales
+from band_tracker.db.genre_cache import genre_cache
+from band_tracker.db.identity_map import TMIdentityMap
 from band_tracker.db.models import (
     ArtistAliasDB,
     ArtistDB,
@@ -31,9 +36,51 @@ from band_tracker.db.session import AsyncSessionmaker
 log = logging.getLogger(__name__)
 
 
+def normalize_artist_name(name: str) -> str:
+    return " ".join(name.split())
+
+
 class UpdateDAL(BaseDAL):
     def __init__(self, sessionmaker: AsyncSessionmaker) -> None:
         self.sessionmaker = sessionmaker
+        self.identity_map: TMIdentityMap | None = None
+        self.genre_cache = genre_cache
+
+    @asynccontextmanager
+    async def identity_map_scope(self) -> AsyncGenerator[TMIdentityMap, None]:
+        """
+        Keeps tm ids of all stored artists and events mapped to their uuids
+        while the scope is open, so existence checks of an update run are
+        dictionary lookups. Rows added by the DAL are added to the map.
+        """
+        async with self.sessionmaker.session() as session:
+            artists = await session.execute(
+                select(ArtistTMDataDB.id, ArtistTMDataDB.artist_id)
+            )
+            events = await session.execute(
+                select(EventTMDataDB.id, EventTMDataDB.event_id)
+            )
+            identity_map = TMIdentityMap(
+                artists={tm_id: uuid for tm_id, uuid in artists.all()},
+                events={tm_id: uuid for tm_id, uuid in events.all()},
+            )
+        log.info(f"{identity_map} loaded")
+        self.identity_map = identity_map
+        try:
+            yield identity_map
+        finally:
+            self.identity_map = None
+
+    def _remember(
+        self,
+        artists: dict[str, UUID] | None = None,
+        events: dict[str, UUID] | None = None,
+    ) -> None:
+        """Adds committed rows to the identity map of the current run"""
+        if self.identity_map is None:
+            return
+        self.identity_map.artists.update(artists or {})
+        self.identity_map.events.update(events or {})
 
     async def update_artists(self, artists: list[ArtistUpdate]) -> None:
         for artist in artists:
@@ -41,7 +88,7 @@ class UpdateDAL(BaseDAL):
 
     async def update_artist(self, artist: ArtistUpdate) -> UUID:
         tm_id = artist.source_specific_data[EventSource.ticketmaster_api]["id"]
-        if await self.get_artist_by_tm_id(tm_id) is None:
+        if tm_id not in await self.get_artist_ids([tm_id]):
             log.debug(f"Artist with tm id {tm_id} is not present, adding a new one")
             artist_id = await self._add_artist(artist)
             return artist_id
@@ -63,6 +110,8 @@ class UpdateDAL(BaseDAL):
                 str(artist.thumbnail_image) if artist.thumbnail_image else None
             )
             artist_db.description = artist.description
+            if artist.description_updated is not None:
+                artist_db.description_updated = artist.description_updated
 
             socials = await artist_db.awaitable_attrs.socials
             socials.instagram = (
@@ -76,17 +125,13 @@ class UpdateDAL(BaseDAL):
             )
             socials.wiki = str(artist.socials.wiki) if artist.socials.wiki else None
 
-            new_genres = await self._get_new_genres(
-                session=session, artist_id=artist_db.id, genres=artist.genres
-            )
-            artist_db.genres.extend(new_genres)
-
-            await self._add_new_aliases(
-                session=session, artist_id=artist_db.id, aliases=artist.aliases
+            await self._add_artist_genres(session, {artist_db.id: artist.genres})
+            await self._add_aliases(
+                session, {alias: artist_db.id for alias in artist.aliases}
             )
 
             session.add(socials)
-            await session.commit()
+            await self._commit(session)
             return artist_db.id
 
     async def update_event(self, event: EventUpdate) -> tuple[UUID, list[UUID]]:
@@ -145,6 +190,445 @@ class UpdateDAL(BaseDAL):
 
         return uuid, artist_event_uuids
 
+    async def bulk_update_events(
+        self, events: list[EventUpdate]
+    ) -> list[tuple[UUID, list[UUID]]]:
+        """
+        Adds or updates events together with their artists in a single
+        transaction. Returns uuids of the events with uuids of their newly
+        linked EventArtist rows, one entry per distinct event tm id.
+        """
+        events_by_tm_id = {
+            event.get_source_specific_data(EventSource.ticketmaster_api)["id"]: event
+            for event in events
+        }
+        artists = {
+            artist.get_source_specific_data(EventSource.ticketmaster_api)["id"]: artist
+            for event in events_by_tm_id.values()
+            for artist in event.artists
+        }
+
+        async with self.sessionmaker.session() as session:
+            artist_ids = await self._upsert_artists(session, artists)
+            event_ids = await self._upsert_events(session, events_by_tm_id)
+
+            links = {
+                (event_ids[event_tm_id], artist_ids[artist_tm_id])
+                for event_tm_id, event in events_by_tm_id.items()
+                for artist_tm_id in event.get_artist_ids()
+                if artist_tm_id in artist_ids
+            }
+            new_links: dict[UUID, list[UUID]] = {}
+            if links:
+                stmt = (
+                    pg_insert(EventArtistDB)
+                    .on_conflict_do_nothing(
+                        index_elements=[EventArtistDB.artist_id, EventArtistDB.event_id]
+                    )
+                    .returning(EventArtistDB.id, EventArtistDB.event_id)
+                )
+                result = await session.execute(
+                    stmt,
+                    [
+                        {"event_id": event_id, "artist_id": artist_id}
+                        for event_id, artist_id in links
+                    ],
+                )
+                for event_artist_id, event_id in result.all():
+                    new_links.setdefault(event_id, []).append(event_artist_id)
+
+            await self._commit(session)
+        self._remember(artists=artist_ids, events=event_ids)
+
+        log.debug(f"{len(event_ids)} events and {len(artist_ids)} artists upserted")
+        return [
+            (event_ids[tm_id], new_links.get(event_ids[tm_id], []))
+            for tm_id in events_by_tm_id
+        ]
+
+    async def bulk_update_artists(self, artists: list[ArtistUpdate]) -> dict[str, UUID]:
+        """
+        Adds or updates artists in a single transaction,
+        returns uuids of the artists by their tm ids
+        """
+        artists_by_tm_id = {
+            artist.get_source_specific_data(EventSource.ticketmaster_api)["id"]: artist
+            for artist in artists
+        }
+        async with self.sessionmaker.session() as session:
+            artist_ids = await self._upsert_artists(session, artists_by_tm_id)
+            await self._commit(session)
+        self._remember(artists=artist_ids)
+        return artist_ids
+
+    async def get_artist_ids(self, tm_ids: list[str]) -> dict[str, UUID]:
+        """Returns uuids of the present artists by their tm ids"""
+        async with self.sessionmaker.session() as session:
+            return await self._artist_ids(session, tm_ids)
+
+    async def _artist_ids(
+        self, session: AsyncSession, tm_ids: list[str]
+    ) -> dict[str, UUID]:
+        known = self.identity_map.artists if self.identity_map else None
+        return await self._existing_ids(
+            session, ArtistTMDataDB.id, ArtistTMDataDB.artist_id, tm_ids, known
+        )
+
+    async def _event_ids(
+        self, session: AsyncSession, tm_ids: list[str]
+    ) -> dict[str, UUID]:
+        known = self.identity_map.events if self.identity_map else None
+        return await self._existing_ids(
+            session, EventTMDataDB.id, EventTMDataDB.event_id, tm_ids, known
+        )
+
+    async def _existing_ids(
+        self,
+        session: AsyncSession,
+        tm_id_column: InstrumentedAttribute[str],
+        uuid_column: InstrumentedAttribute[UUID],
+        tm_ids: list[str],
+        known: dict[str, UUID] | None = None,
+    ) -> dict[str, UUID]:
+        """
+        Returns uuids of the present rows by their tm ids, only the ids
+        missing from the known ones are queried
+        """
+        known = known if known is not None else {}
+        result = {tm_id: known[tm_id] for tm_id in tm_ids if tm_id in known}
+        missing = [tm_id for tm_id in tm_ids if tm_id not in known]
+        if missing:
+            stmt = select(tm_id_column, uuid_column).where(tm_id_column.in_(missing))
+            rows = await session.execute(stmt)
+            result.update({tm_id: uuid for tm_id, uuid in rows.all()})
+        return result
+
+    async def _upsert_artists(
+        self, session: AsyncSession, artists: dict[str, ArtistUpdate]
+    ) -> dict[str, UUID]:
+        """
+        Adds or updates artists given by their tm ids, returns their uuids.
+        Stored descriptions are kept unless an update has a fetched one.
+        """
+        if not artists:
+            return {}
+        existing_ids = await self._artist_ids(session, list(artists))
+        artist_ids = {tm_id: existing_ids.get(tm_id, uuid4()) for tm_id in artists}
+
+        stmt = pg_insert(ArtistDB)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArtistDB.id],
+            set_={
+                "name": stmt.excluded.name,
+                "tickets_link": stmt.excluded.tickets_link,
+                "image": stmt.excluded.image,
+                "thumbnail": stmt.excluded.thumbnail,
+                # descriptions are replaced only by freshly fetched ones
+                "description": case(
+                    (
+                        stmt.excluded.description_updated.is_not(None),
+                        stmt.excluded.description,
+                    ),
+                    else_=func.coalesce(
+                        stmt.excluded.description, ArtistDB.description
+                    ),
+                ),
+                "description_updated": func.coalesce(
+                    stmt.excluded.description_updated, ArtistDB.description_updated
+                ),
+            },
+        )
+        await session.execute(
+            stmt,
+            [
+                {
+                    "id": artist_ids[tm_id],
+                    "name": artist.name,
+                    "tickets_link": (
+                        str(artist.tickets_link) if artist.tickets_link else None
+                    ),
+                    "image": str(artist.main_image) if artist.main_image else None,
+                    "thumbnail": (
+                        str(artist.thumbnail_image) if artist.thumbnail_image else None
+                    ),
+                    "description": artist.description,
+                    "description_updated": artist.description_updated,
+                }
+                for tm_id, artist in artists.items()
+            ],
+        )
+
+        new_tm_ids = [tm_id for tm_id in artists if tm_id not in existing_ids]
+        if new_tm_ids:
+            await session.execute(
+                pg_insert(ArtistTMDataDB).on_conflict_do_nothing(),
+                [{"id": tm_id, "artist_id": artist_ids[tm_id]} for tm_id in new_tm_ids],
+            )
+
+        socials_stmt = pg_insert(ArtistSocialsDB)
+        socials_stmt = socials_stmt.on_conflict_do_update(
+            index_elements=[ArtistSocialsDB.artist_id],
+            set_={
+                column: socials_stmt.excluded[column]
+                for column in ("instagram", "youtube", "spotify", "wiki")
+            },
+        )
+        await session.execute(
+            socials_stmt,
+            [
+                {
+                    "artist_id": artist_ids[tm_id],
+                    "instagram": self._str_or_none(artist.socials.instagram),
+                    "youtube": self._str_or_none(artist.socials.youtube),
+                    "spotify": self._str_or_none(artist.socials.spotify),
+                    "wiki": self._str_or_none(artist.socials.wiki),
+                }
+                for tm_id, artist in artists.items()
+            ],
+        )
+
+        aliases: dict[str, UUID] = {}
+        for tm_id, artist in artists.items():
+            for alias in [*artist.aliases, artist.name]:
+                aliases.setdefault(alias, artist_ids[tm_id])
+        await self._add_aliases(session, aliases)
+
+        await self._add_artist_genres(
+            session,
+            {artist_ids[tm_id]: artist.genres for tm_id, artist in artists.items()},
+        )
+
+        return artist_ids
+
+    async def _commit(self, session: AsyncSession) -> None:
+        """Commits the session and caches genres it has added"""
+        await session.commit()
+        self.genre_cache.update(session.info.pop("new_genres", {}))
+
+    async def _upsert_genres(
+        self, session: AsyncSession, names: set[str]
+    ) -> dict[str, UUID]:
+        """
+        Returns uuids of the genres by their names, adding the absent ones.
+        Only genres missing from the cache are queried, they are cached
+        once the session is committed with `_commit`.
+        """
+        genre_ids, missing = self.genre_cache.get(names)
+        if not missing:
+            return genre_ids
+
+        # sorted, so concurrent transactions adding the same genres lock
+        # their names in the same order and can't deadlock
+        await session.execute(
+            pg_insert(GenreDB).on_conflict_do_nothing(index_elements=[GenreDB.name]),
+            [{"name": name} for name in sorted(missing)],
+        )
+        result = await session.execute(
+            select(GenreDB.name, GenreDB.id).where(GenreDB.name.in_(missing))
+        )
+        new_genres = {name: uuid for name, uuid in result.all()}
+        session.info.setdefault("new_genres", {}).update(new_genres)
+        return genre_ids | new_genres
+
+    async def _add_artist_genres(
+        self, session: AsyncSession, genres: dict[UUID, list[str]]
+    ) -> None:
+        """Links artists to their genres by names, present links are skipped"""
+        genre_names = {genre for names in genres.values() for genre in names}
+        if not genre_names:
+            return
+
+        genre_ids = await self._upsert_genres(session, genre_names)
+        await session.execute(
+            pg_insert(ArtistGenreDB).on_conflict_do_nothing(),
+            [
+                {"artist_id": artist_id, "genre_id": genre_ids[genre]}
+                for artist_id, names in genres.items()
+                for genre in set(names)
+            ],
+        )
+
+    async def _add_aliases(
+        self, session: AsyncSession, aliases: dict[str, UUID]
+    ) -> None:
+        """Adds aliases of artists, aliases already taken are skipped"""
+        if aliases:
+            # sorted for the same reason as genres in _upsert_genres
+            await session.execute(
+                pg_insert(ArtistAliasDB).on_conflict_do_nothing(),
+                [
+                    {"alias": alias, "artist_id": artist_id}
+                    for alias, artist_id in sorted(aliases.items())
+                ],
+            )
+
+    async def _upsert_events(
+        self, session: AsyncSession, events: dict[str, EventUpdate]
+    ) -> dict[str, UUID]:
+        """Adds or updates events given by their tm ids, returns their uuids"""
+        if not events:
+            return {}
+        existing_ids = await self._event_ids(session, list(events))
+        event_ids = {tm_id: existing_ids.get(tm_id, uuid4()) for tm_id in events}
+        last_update = datetime.strptime(datetime.now().strftime("%Y-%m-%d"), "%Y-%m-%d")
+
+        stmt = pg_insert(EventDB)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventDB.id],
+            set_={
+                column: stmt.excluded[column]
+                for column in (
+                    "venue",
+                    "venue_city",
+                    "venue_country",
+                    "start_date",
+                    "title",
+                    "ticket_url",
+                    "image",
+                    "thumbnail",
+                    "last_update",
+                )
+            },
+        )
+        await session.execute(
+            stmt,
+            [
+                {
+                    "id": event_ids[tm_id],
+                    "venue": event.venue,
+                    "venue_city": event.venue_city,
+                    "venue_country": event.venue_country,
+                    "start_date": event.date,
+                    "title": event.title,
+                    "ticket_url": self._str_or_none(event.ticket_url),
+                    "image": self._str_or_none(event.main_image),
+                    "thumbnail": self._str_or_none(event.thumbnail_image),
+                    "last_update": last_update,
+                }
+                for tm_id, event in events.items()
+            ],
+        )
+
+        new_tm_ids = [tm_id for tm_id in events if tm_id not in existing_ids]
+        if new_tm_ids:
+            await session.execute(
+                pg_insert(EventTMDataDB).on_conflict_do_nothing(),
+                [{"id": tm_id, "event_id": event_ids[tm_id]} for tm_id in new_tm_ids],
+            )
+
+        sales_stmt = pg_insert(SalesDB)
+        sales_stmt = sales_stmt.on_conflict_do_update(
+            index_elements=[SalesDB.event_id],
+            set_={
+                column: sales_stmt.excluded[column]
+                for column in (
+                    "sale_start",
+                    "sale_end",
+                    "price_max",
+                    "price_min",
+                    "currency",
+                )
+            },
+        )
+        await session.execute(
+            sales_stmt,
+            [
+                {
+                    "event_id": event_ids[tm_id],
+                    "sale_start": event.sales.sale_start,
+                    "sale_end": event.sales.sale_end,
+                    "price_max": event.sales.price_max,
+                    "price_min": event.sales.price_min,
+                    "currency": event.sales.currency,
+                }
+                for tm_id, event in events.items()
+            ],
+        )
+
+        return event_ids
+
+    @staticmethod
+    def _str_or_none(value: object | None) -> str | None:
+        return str(value) if value else None
+
+    async def get_descriptions(
+        self, tm_ids: list[str]
+    ) -> dict[str, tuple[str | None, datetime | None]]:
+        """
+        Returns stored descriptions of the present artists by their tm ids
+        together with the time they were fetched
+        """
+        stmt = (
+            select(
+                ArtistTMDataDB.id, ArtistDB.description, ArtistDB.description_updated
+            )
+            .join(ArtistDB)
+            .where(ArtistTMDataDB.id.in_(tm_ids))
+        )
+        async with self.sessionmaker.session() as session:
+            result = await session.execute(stmt)
+        return {
+            tm_id: (description, description_updated)
+            for tm_id, description, description_updated in result.all()
+        }
+
+    async def get_event_hashes(self, tm_ids: list[str]) -> dict[str, str | None]:
+        """Returns stored content hashes of the present events by their tm ids"""
+        stmt = select(EventTMDataDB.id, EventTMDataDB.content_hash).where(
+            EventTMDataDB.id.in_(tm_ids)
+        )
+        async with self.sessionmaker.session() as session:
+            result = await session.execute(stmt)
+        return {tm_id: content_hash for tm_id, content_hash in result.all()}
+
+    async def set_event_hashes(self, hashes: dict[str, str]) -> None:
+        """Stores content hashes of the events given by their tm ids"""
+        if not hashes:
+            return
+        stmt = (
+            update(EventTMDataDB.__table__)  # type: ignore
+            .where(EventTMDataDB.id == bindparam("tm_id"))
+            .values(content_hash=bindparam("hash"))
+        )
+        async with self.sessionmaker.session() as session:
+            await session.execute(
+                stmt,
+                [
+                    {"tm_id": tm_id, "hash": content_hash}
+                    for tm_id, content_hash in hashes.items()
+                ],
+            )
+            await session.commit()
+
+    async def refresh_daily_event_counts(self, since: date | None = None) -> None:
+        """
+        Recounts events per day starting from `since`, today by default.
+        Past days are left as they are, predictions never look back.
+        """
+        # Using raw sql for query optimization, the range is read off the
+        # start_date index and unchanged days are not rewritten
+        stmt = text(
+            """
+        WITH counts AS (
+            SELECT start_date::date AS day, count(*) AS amount
+            FROM event
+            WHERE start_date >= :since
+            GROUP BY start_date::date
+        ), removed AS (
+            DELETE FROM daily_event_count
+            WHERE day >= :since AND day NOT IN (SELECT day FROM counts)
+        )
+        INSERT INTO daily_event_count (day, amount)
+        SELECT day, amount FROM counts
+        ON CONFLICT (day) DO UPDATE SET amount = excluded.amount
+        WHERE daily_event_count.amount <> excluded.amount
+        """
+        )
+        since = since if since is not None else date.today()
+        async with self.sessionmaker.session() as session:
+            await session.execute(stmt, {"since": since})
+            await session.commit()
+
     async def get_artist_by_tm_id(self, tm_id: str) -> Artist | None:
         async with self.sessionmaker.session() as session:
             artist_db = await self._artist_by_tm_id(session=session, tm_id=tm_id)
@@ -203,61 +687,6 @@ class UpdateDAL(BaseDAL):
         )
         return socials_db
 
-    async def _get_new_genres(
-        self, session: AsyncSession, artist_id: UUID, genres: list[str]
-    ) -> list[GenreDB]:
-        artist_genre_names = (
-            select(GenreDB.name)
-            .join(ArtistGenreDB, GenreDB.id == ArtistGenreDB.genre_id)
-            .filter(ArtistGenreDB.artist_id == artist_id)
-        )
-        execution_result = await session.execute(artist_genre_names)
-        current_genre_names = [name[0] for name in execution_result]
-
-        new_genre_names = [
-            genre for genre in genres if genre not in current_genre_names
-        ]
-        new_db_genres = await self._get_db_genres(session, new_genre_names)
-
-        return new_db_genres
-
-    async def _get_db_genres(
-        self, session: AsyncSession, genres: list[str]
-    ) -> list[GenreDB]:
-        genres_query = select(GenreDB).filter(GenreDB.name.in_(genres))
-        existing_genres = (await session.execute(genres_query)).fetchall()
-
-        existing_genres_names = {genre[0].name: genre[0] for genre in existing_genres}
-
-        result = []
-        for genre in genres:
-            genre_db = existing_genres_names.get(genre)
-
-            if not genre_db:
-                genre_db = GenreDB(name=genre)
-                session.add(genre_db)
-            result.append(genre_db)
-        await session.commit()
-
-        return result
-
-    def _build_db_artist_aliases(
-        self, artist_id: UUID, aliases: list[str]
-    ) -> list[ArtistAliasDB]:
-        return [ArtistAliasDB(artist_id=artist_id, alias=alias) for alias in aliases]
-
-    async def _add_new_aliases(
-        self, session: AsyncSession, artist_id: UUID, aliases: list[str]
-    ) -> None:
-        stmt = select(ArtistAliasDB.alias).filter(ArtistAliasDB.alias.in_(aliases))
-        existing_aliases_tuples = await session.execute(stmt)
-        existing_aliases = [alias[0] for alias in existing_aliases_tuples.all()]
-        new_aliases = [alias for alias in aliases if alias not in existing_aliases]
-        db_aliases = self._build_db_artist_aliases(
-            artist_id=artist_id, aliases=new_aliases
-        )
-        session.add_all(db_aliases)
-
     async def _add_artist(self, artist: ArtistUpdate) -> UUID:
         if artist.name not in artist.aliases:
             artist.aliases.append(artist.name)
@@ -275,11 +704,9 @@ class UpdateDAL(BaseDAL):
             image=image,
             thumbnail=thumbnail,
             description=description,
+            description_updated=artist.description_updated,
         )
         async with self.sessionmaker.session() as session:
-            db_genres = await self._get_db_genres(session, artist.genres)
-            log.debug("GENRES: " + str(db_genres))
-            artist_db.genres.extend(db_genres)
             session.add(artist_db)
 
             await session.flush()
@@ -288,13 +715,13 @@ class UpdateDAL(BaseDAL):
             socials_db = self._build_db_socials(artist_id=uuid, socials=artist.socials)
             tm_data_db = ArtistTMDataDB(id=artist_tm_data["id"], artist_id=uuid)
 
-            await self._add_new_aliases(
-                session=session, artist_id=uuid, aliases=artist.aliases
-            )
+            await self._add_artist_genres(session, {uuid: artist.genres})
+            await self._add_aliases(session, {alias: uuid for alias in artist.aliases})
 
             session.add(tm_data_db)
             session.add(socials_db)
-            await session.commit()
+            await self._commit(session)
+        self._remember(artists={artist_tm_data["id"]: uuid})
         return uuid
 
     async def _link_event_to_artists(
@@ -308,49 +735,36 @@ class UpdateDAL(BaseDAL):
         Raises DALError if event tm id is not present in db.
         """
         async with self.sessionmaker.session() as session:
-            event_db = await self._event_by_tm_id(session=session, tm_id=event_tm_id)
-            if event_db is None:
+            event_ids = await self._event_ids(session, [event_tm_id])
+            if event_tm_id not in event_ids:
                 raise DALError(f"event with tm id {event_tm_id} is not present in db")
-            already_linked_artists = await event_db.awaitable_attrs.artists
-            already_linked_ids = [artist.id for artist in already_linked_artists]
-            new_artists: list[UUID] = []
-
-            for artist_tm_id in artist_tm_ids:
-                artist_db = await self._artist_by_tm_id(
-                    session=session, tm_id=artist_tm_id
+            artist_ids = await self._artist_ids(session, artist_tm_ids)
+            if not artist_ids:
+                return []
+
+            stmt = (
+                pg_insert(EventArtistDB)
+                .on_conflict_do_nothing(
+                    index_elements=[EventArtistDB.artist_id, EventArtistDB.event_id]
                 )
-                if artist_db is None:
-                    continue
-                if artist_db.id not in already_linked_ids:
-                    event_db.artists.append(artist_db)
-                    new_artists.append(artist_db.id)
-
-            session.add(event_db)
+                .returning(EventArtistDB.id)
+            )
+            result = await session.execute(
+                stmt,
+                [
+                    {"event_id": event_ids[event_tm_id], "artist_id": artist_id}
+                    for artist_id in dict.fromkeys(artist_ids.values())
+                ],
+            )
+            event_artist_uuids = list(result.scalars().all())
             await session.commit()
 
-        event_artist_uuids = await self._get_event_artists_by_uuids(
-            artist_uuids=new_artists, event_uuid=event_db.id
-        )
-
         return event_artist_uuids
 
-    async def _get_event_artists_by_uuids(
-        self, artist_uuids: list[UUID], event_uuid: UUID
-    ) -> list[UUID]:
-        stmt = (
-            select(EventArtistDB.id)
-            .join(ArtistDB)
-            .join(EventDB)
-            .where(EventDB.id == event_uuid, ArtistDB.id.in_(artist_uuids))
-        )
-        async with self.sessionmaker.session() as session:
-            ids = await session.scalars(stmt)
-        return ids.all()
-
     async def _is_event_exists(self, event_tm_id: str) -> bool:
         async with self.sessionmaker.session() as session:
-            event_db = await self._event_by_tm_id(session=session, tm_id=event_tm_id)
-        return bool(event_db)
+            event_ids = await self._event_ids(session, [event_tm_id])
+        return event_tm_id in event_ids
 
     def _buld_event_sales(self, event_id: UUID, sales: EventUpdateSales) -> SalesDB:
         sales_db = SalesDB(
@@ -397,6 +811,7 @@ class UpdateDAL(BaseDAL):
             session.add(tm_data_db)
             session.add(sales)
             await session.commit()
+        self._remember(events={event_tm_id: uuid})
 
         await self.update_artists(event.artists)
         try:
@@ -422,13 +837,31 @@ class UpdateDAL(BaseDAL):
         return artist_names
 
     async def add_external_artist_name(self, name: str) -> None:
-        artist_name = ArtistNameDB(name=name)
+        if await self.bulk_add_external_artist_names([name]):
+            log.info(f"{name} was added.")
 
+    async def bulk_add_external_artist_names(
+        self, names: Iterable[str], batch_size: int = 5000
+    ) -> int:
+        """
+        Adds artist names with whitespace normalized, names already present
+        are skipped. Returns the amount of added names.
+        """
+        normalized = dict.fromkeys(normalize_artist_name(name) for name in names)
+        normalized.pop("", None)
+        names_list = list(normalized)
+
+        added = 0
+        stmt = (
+            pg_insert(ArtistNameDB).on_conflict_do_nothing().returning(ArtistNameDB.id)
+        )
         async with self.sessionmaker.session() as session:
-            session.add(artist_name)
-            await session.flush()
+            for index in range(0, len(names_list), batch_size):
+                batch = names_list[index : index + batch_size]
+                result = await session.execute(stmt, [{"name": name} for name in batch])
+                added += len(result.all())
             await session.commit()
-        log.info(name.join(" was added."))
+        return added
 
     async def get_tm_ids(self) -> list[str]:
         async with self.sessionmaker.session() as session:
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+
+class GenreCache:
+    """
+    Genre names mapped to their uuids. Genres are few and never removed,
+    so the cache is shared by the whole process and only filled,
+    entries are added after the transaction that created them is committed.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, UUID] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, names: set[str]) -> tuple[dict[str, UUID], set[str]]:
+        """Returns uuids of the cached genres and names missing from the cache"""
+        known = {name: self._ids[name] for name in names if name in self._ids}
+        return known, names - known.keys()
+
+    def update(self, ids: dict[str, UUID]) -> None:
+        self._ids.update(ids)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+
+genre_cache = GenreCache()
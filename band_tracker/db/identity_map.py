@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from uuid import UUID
+
+
+@dataclass
+class TMIdentityMap:
+    """Ticketmaster ids of the stored artists and events mapped to their uuids"""
+
+    artists: dict[str, UUID] = field(default_factory=dict)
+    events: dict[str, UUID] = field(default_factory=dict)
+
+    def __repr__(self) -> str:
+        return (
+            f"TMIdentityMap(artists: {len(self.artists)}, events: {len(self.events)})"
+        )
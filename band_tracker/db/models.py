@@ -1,10 +1,11 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime
+from sqlalchemy import Boolean, Date, DateTime
 from sqlalchemy import Enum as EnumDB
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy import text as alchemy_text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as UUID_PG
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -29,6 +30,9 @@ class ArtistDB(Base):
     image: Mapped[str | None] = mapped_column(String, nullable=True)
     thumbnail: Mapped[str | None] = mapped_column(String, nullable=True)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
+    description_updated: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
 
     follows: Mapped[list["FollowDB"]] = relationship(back_populates="artist")
     aliases: Mapped[list["ArtistAliasDB"]] = relationship(back_populates="artist")
@@ -47,6 +51,8 @@ class ArtistDB(Base):
 
 class EventDB(Base):
     __tablename__ = "event"
+    # keyset pagination of the events feeds
+    __table_args__ = (Index("ix_event_start_date_id", "start_date", "id"),)
 
     id: Mapped[UUID] = mapped_column(
         UUID_PG(as_uuid=True),
@@ -121,11 +127,19 @@ class GenreDB(Base):
         primary_key=True,
         server_default=alchemy_text("gen_random_uuid()"),
     )
-    name: Mapped[str] = mapped_column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
 
 
 class MessageDB(Base):
     __tablename__ = "message"
+    # active interfaces of a user are looked up on every message sent
+    __table_args__ = (
+        Index(
+            "ix_message_user_id_active",
+            "user_id",
+            postgresql_where=alchemy_text("active"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         UUID_PG(as_uuid=True),
@@ -145,9 +159,7 @@ class MessageDB(Base):
     timestamp: Mapped[datetime] = mapped_column(
         DateTime, nullable=False, default=datetime.now()
     )
-    active: Mapped[bool] = mapped_column(
-        Boolean, nullable=False, default=True, index=True
-    )
+    active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
 
 class ArtistGenreDB(Base):
@@ -180,6 +192,12 @@ class ArtistTMDataDB(Base):
 
 class EventArtistDB(Base):
     __tablename__ = "event_artist"
+    __table_args__ = (
+        UniqueConstraint("artist_id", "event_id"),
+        # artists of events, the unique constraint serves events of artists
+        Index("ix_event_artist_event_id_artist_id", "event_id", "artist_id"),
+    )
+
     id: Mapped[UUID] = mapped_column(
         UUID_PG(as_uuid=True),
         primary_key=True,
@@ -229,6 +247,7 @@ class EventTMDataDB(Base):
         primary_key=True,
     )
     id: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    content_hash: Mapped[str | None] = mapped_column(String, nullable=True)
 
     event: Mapped[EventDB] = relationship(back_populates="tm_data")
 
@@ -254,12 +273,24 @@ class ArtistAliasDB(Base):
         ForeignKey("artist.id", ondelete="CASCADE"),
     )
     alias: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    added_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=alchemy_text("now()"), index=True
+    )
 
     artist: Mapped[ArtistDB] = relationship(back_populates="aliases")
 
 
 class FollowDB(Base):
     __tablename__ = "follow"
+    # followed artists of a user, read without touching the table
+    __table_args__ = (
+        Index(
+            "ix_follow_user_id_active",
+            "user_id",
+            postgresql_include=["artist_id"],
+            postgresql_where=alchemy_text("active"),
+        ),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         UUID_PG(as_uuid=True),
@@ -303,4 +334,38 @@ class ArtistNameDB(Base):
         server_default=alchemy_text("gen_random_uuid()"),
     )
 
-    name: Mapped[str] = mapped_column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+
+
+class ChunkPlanDB(Base):
+    __tablename__ = "chunk_plan"
+
+    id: Mapped[UUID] = mapped_column(
+        UUID_PG(as_uuid=True),
+        primary_key=True,
+        server_default=alchemy_text("gen_random_uuid()"),
+    )
+    start_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    end_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    country_code: Mapped[str] = mapped_column(String, nullable=False, default="")
+    pages_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    entities_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_update: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class IteratorCheckpointDB(Base):
+    __tablename__ = "iterator_checkpoint"
+
+    id: Mapped[UUID] = mapped_column(UUID_PG(as_uuid=True), primary_key=True)
+    state: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    finished: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    last_update: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DailyEventCountDB(Base):
+    """Amounts of events per day, refreshed by the updater after every sweep"""
+
+    __tablename__ = "daily_event_count"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,6 +1,12 @@
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from itertools import cycle
+from time import monotonic
+from typing import Any, AsyncGenerator, Generator
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -8,37 +14,188 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from band_tracker.config.env_loader import DBEnvVars
+
+log = logging.getLogger(__name__)
+
+# read only sessions are opened on the primary inside `AsyncSessionmaker.primary()`
+_read_primary: ContextVar[bool] = ContextVar("read_primary", default=False)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_recycle: int = 1800  # seconds, -1 keeps connections forever
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100  # prepared statements per connection
+    statement_timeout: int | None = None  # milliseconds
+
+    def with_env(self, env: DBEnvVars) -> "PoolConfig":
+        """Returns the config with values overridden by the set env vars"""
+        overrides = {
+            "pool_size": env.DB_POOL_SIZE,
+            "max_overflow": env.DB_MAX_OVERFLOW,
+            "pool_recycle": env.DB_POOL_RECYCLE,
+            "pool_pre_ping": env.DB_POOL_PRE_PING,
+            "statement_cache_size": env.DB_STATEMENT_CACHE_SIZE,
+            "statement_timeout": env.DB_STATEMENT_TIMEOUT,
+        }
+        return replace(
+            self,
+            **{name: value for name, value in overrides.items() if value is not None},
+        )
+
+
+POOL_PRESETS = {
+    # many short concurrent queries from handlers, none of them should hang
+    "bot": PoolConfig(pool_size=10, max_overflow=20, statement_timeout=5000),
+    # few sessions running large bulk statements of many shapes
+    "updater": PoolConfig(
+        pool_size=5, max_overflow=5, statement_cache_size=500, statement_timeout=120000
+    ),
+    "notifier": PoolConfig(pool_size=2, max_overflow=3, statement_timeout=30000),
+}
+
+
+@dataclass
+class PoolMetrics:
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_total: float  # seconds
+    wait_max: float  # seconds
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.checkouts if self.checkouts else 0.0
+
 
 class AsyncSessionmaker:
+    """
+    Opens sessions on the primary db, read only sessions are spread over
+    `replicas` if there are any. Replica urls might omit the driver,
+    replica connections refuse to write.
+    """
+
     def __init__(
-        self, login: str, password: str, ip: str, port: str, database: str
+        self,
+        login: str,
+        password: str,
+        ip: str,
+        port: str,
+        database: str,
+        pool: PoolConfig = PoolConfig(),
+        replicas: list[str] | None = None,
     ) -> None:
         self._login = login
         self._password = password
         self._ip = ip
         self._port = port
         self._database = database
+        self.pool = pool
 
         self.engine = self._get_async_engine()
         self.sessionmaker = async_sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
+        self.replica_engines = [
+            self._get_async_engine(replica, read_only=True)
+            for replica in replicas or []
+        ]
+        self._replica_sessionmakers = cycle(
+            [
+                async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+                for engine in self.replica_engines
+            ]
+        )
+
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_async_engine(
+        self, url: str | None = None, read_only: bool = False
+    ) -> AsyncEngine:
+        if url is None:
+            db_url = (
+                f"postgresql+asyncpg://"
+                f"{self._login}:"
+                f"{self._password}@"
+                f"{self._ip}:"
+                f"{self._port}/"
+                f"{self._database}"
+            )
+        else:
+            db_url = (
+                make_url(url)
+                .set(drivername="postgresql+asyncpg")
+                .render_as_string(hide_password=False)
+            )
+        server_settings = {}
+        if self.pool.statement_timeout is not None:
+            server_settings["statement_timeout"] = str(self.pool.statement_timeout)
+        if read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        connect_args: dict[str, Any] = {
+            "prepared_statement_cache_size": self.pool.statement_cache_size
+        }
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        return create_async_engine(
+            db_url,
+            pool_size=self.pool.pool_size,
+            max_overflow=self.pool.max_overflow,
+            pool_recycle=self.pool.pool_recycle,
+            pool_pre_ping=self.pool.pool_pre_ping,
+            connect_args=connect_args,
+        )
 
-    def _get_async_engine(self) -> AsyncEngine:
-        db_url = (
-            f"postgresql+asyncpg://"
-            f"{self._login}:"
-            f"{self._password}@"
-            f"{self._ip}:"
-            f"{self._port}/"
-            f"{self._database}"
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Primary pool state, checkout waits of replica sessions included"""
+        pool: Any = self.engine.pool
+        return PoolMetrics(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            checkouts=self._checkouts,
+            wait_total=self._wait_total,
+            wait_max=self._wait_max,
         )
-        return create_async_engine(db_url)
+
+    @staticmethod
+    @contextmanager
+    def primary() -> Generator[None, None, None]:
+        """Read only sessions opened within the scope read from the primary"""
+        token = _read_primary.set(True)
+        try:
+            yield
+        finally:
+            _read_primary.reset(token)
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator:
-        session = self.sessionmaker()
+    async def session(self, read_only: bool = False) -> AsyncGenerator:
+        if read_only and self.replica_engines and not _read_primary.get():
+            session = next(self._replica_sessionmakers)()
+        else:
+            session = self.sessionmaker()
         try:
+            # a connection is checked out right away to time waiting for the pool,
+            # a new connection or a pre-ping are counted in as well
+            start = monotonic()
+            await session.connection()
+            wait = monotonic() - start
+            self._checkouts += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
             yield session
         finally:
             await session.close()
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
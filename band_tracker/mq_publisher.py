@@ -2,11 +2,12 @@ import json
 from enum import Enum
 
 from aio_pika import DeliveryMode, Message, connect
-from aio_pika.abc import AbstractConnection
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange
 
 
 class MessageType(Enum):
     notification = "notification"
+    invalidation = "invalidation"
 
 
 class MQPublisher:
@@ -14,6 +15,8 @@ class MQPublisher:
     _key: str
     _exchange_name: str
     _connection: AbstractConnection
+    _channel: AbstractChannel | None = None
+    _exchange: AbstractExchange
 
     @classmethod
     async def create(
@@ -30,6 +33,15 @@ class MQPublisher:
         connection = await connect(self._url)
         return connection
 
+    async def _get_exchange(self) -> AbstractExchange:
+        # channel and exchange are reused by all messages of the publisher
+        if self._channel is None or self._channel.is_closed:
+            self._channel = await self._connection.channel()
+            self._exchange = await self._channel.declare_exchange(
+                self._exchange_name, auto_delete=False
+            )
+        return self._exchange
+
     async def send_message(
         self,
         data: dict,
@@ -48,9 +60,9 @@ class MQPublisher:
             type=type_.value,
             delivery_mode=persistence,
         )
-        async with self._connection:
-            channel = await self._connection.channel()
-            exchange = await channel.declare_exchange(
-                self._exchange_name, auto_delete=False
-            )
-            await exchange.publish(message, routing_key=self._key)
+        exchange = await self._get_exchange()
+        await exchange.publish(message, routing_key=self._key)
+
+    async def close(self) -> None:
+        if not self._connection.is_closed:
+            await self._connection.close()
@@ -1,21 +1,34 @@
+import importlib.util
 import logging
 from abc import ABC
 from datetime import datetime
 
 import httpx
+from orjson import loads
 
 from band_tracker.updater.errors import (
-    AllTokensViolation,
     InvalidResponseStructureError,
     InvalidTokenError,
     QuotaViolation,
     RateLimitViolation,
     UnexpectedFaultResponseError,
 )
+from band_tracker.updater.token_pool import TokenPool
 
 log = logging.getLogger(__name__)
 
 
+def fault_code(data: dict) -> str | None:
+    """Returns an error code of a fault response, or None for regular responses"""
+    fault = data.get("fault")
+    if not isinstance(fault, dict):
+        return None
+    detail = fault.get("detail")
+    if not isinstance(detail, dict):
+        return None
+    return detail.get("errorcode")
+
+
 def exception_helper(data: dict[str, dict]) -> dict[str, int]:
     try:
         page_info = data.get("page")
@@ -61,31 +74,70 @@ def exception_helper(data: dict[str, dict]) -> dict[str, int]:
             raise InvalidResponseStructureError(f"Invalid JSON structure: {data}")
 
 
+def http2_available() -> bool:
+    """HTTP/2 support in httpx requires an optional h2 package"""
+    return importlib.util.find_spec("h2") is not None
+
+
 class ApiClient(ABC):
     def __init__(
-        self, url: str, query_params: dict[str, str], tokens: list[str]
+        self,
+        url: str,
+        query_params: dict[str, str],
+        tokens: list[str],
+        http_client: httpx.AsyncClient | None = None,
+        token_pool: TokenPool | None = None,
     ) -> None:
         self.url = url
         self.query_params = query_params
         self.tokens = tokens
         self.retries = 5
         self.timeout = httpx.Timeout(5.0, pool=5)
-        self.change_token_flag = False
-
-    async def _change_token(self) -> None:
-        for token in self.tokens:
-            try:
-                self.query_params.update({"apikey": token})
-                response = httpx.get(self.url, params=self.query_params).json()
-                exception_helper(response)
-                log.debug(
-                    "+++++++++++++++++++++++++++  TOKEN SWAP  "
-                    "+++++++++++++++++++++++++++"
-                )
-                return
-            except QuotaViolation:
-                continue
-        raise AllTokensViolation
+        self.http_client = (
+            http_client
+            if http_client is not None
+            else httpx.AsyncClient(timeout=self.timeout)
+        )
+        self.token_pool = token_pool if token_pool is not None else TokenPool(tokens)
+
+    async def _request(self, params: dict, timeout_message: str) -> dict[str, dict]:
+        """
+        Sends a request with the next available api key of the token pool.
+        Keys that exceeded their quota are excluded from the pool and the request
+        is repeated with another key, raises AllTokensViolation if none are left.
+        Spike arrests slow the key's limiter down and are retried as well.
+        """
+        timeouts = 0
+        throttles = 0
+        while True:
+            async with self.token_pool.token() as token:
+                try:
+                    response = await self.http_client.get(
+                        self.url,
+                        params={**self.query_params, **params, "apikey": token.key},
+                        timeout=self.timeout,
+                    )
+                except httpx.TimeoutException:
+                    log.warning("TIMEOUT CATCH")
+                    timeouts += 1
+                    if timeouts >= self.retries:
+                        log.error("TIMEOUT")
+                        raise httpx.TimeoutException(timeout_message)
+                    continue
+
+                data = loads(response.content)
+                match fault_code(data):
+                    case "policies.ratelimit.QuotaViolation":
+                        self.token_pool.exhaust(token)
+                        continue
+                    case "policies.ratelimit.SpikeArrestViolation":
+                        token.limiter.on_throttle()
+                        throttles += 1
+                        if throttles < self.retries:
+                            continue
+                    case _:
+                        token.limiter.on_success()
+                return data
 
 
 class ApiClientEvents(ApiClient):
@@ -96,10 +148,6 @@ class ApiClientEvents(ApiClient):
         page_number: int = 0,
         country_code: str = "",
     ) -> dict[str, dict]:
-        if self.change_token_flag:
-            await self._change_token()
-            self.change_token_flag = False
-
         log.debug(
             "+++++++++++++++++++++++++++  SEND REQUEST  +++++++++++++++++++++++++++"
         )
@@ -110,50 +158,23 @@ class ApiClientEvents(ApiClient):
         startEndDateTime = f"{reformatted_start_date},{reformatted_end_date}"
         log.debug(startEndDateTime)
 
-        for _ in range(self.retries):
-            try:
-                response = httpx.get(
-                    self.url,
-                    params={
-                        **self.query_params,
-                        "startEndDateTime": startEndDateTime,
-                        "page": page_number,
-                        "countryCode": country_code,
-                    },
-                )
-                return response.json()
-            except httpx.TimeoutException:
-                log.warning("TIMEOUT CATCH")
-                continue
-        else:
-            log.error("TIMEOUT")
-            raise httpx.TimeoutException("ClientEvent Timeout")
+        params = {
+            "startEndDateTime": startEndDateTime,
+            "page": page_number,
+            "countryCode": country_code,
+        }
+        return await self._request(params, timeout_message="ClientEvent Timeout")
 
 
 class ApiClientArtists(ApiClient):
-    async def make_request(self, keyword: str = "", tm_id: str = "") -> dict[str, dict]:
-        if self.change_token_flag:
-            await self._change_token()
-            self.change_token_flag = False
-
+    async def make_request(
+        self, keyword: str = "", tm_id: str = "", tm_ids: list[str] | None = None
+    ) -> dict[str, dict]:
+        """Requests artists by a keyword, a tm id or a batch of tm ids"""
         log.debug(
             "+++++++++++++++++++++++++++  SEND REQUEST  +++++++++++++++++++++++++++"
         )
-        for _ in range(self.retries):
-            try:
-                response = httpx.get(
-                    self.url,
-                    params={
-                        **self.query_params,
-                        "keyword": keyword,
-                        "id": tm_id,
-                    },
-                    timeout=self.timeout,
-                )
-                return response.json()
-            except httpx.TimeoutException:
-                log.warning("TIMEOUT CATCH")
-                continue
-        else:
-            log.error("TIMEOUT")
-            raise httpx.TimeoutException("ClientArtist Timeout")
+        if tm_ids:
+            tm_id = ",".join(tm_ids)
+        params = {"keyword": keyword, "id": tm_id}
+        return await self._request(params, timeout_message="ClientArtist Timeout")
@@ -0,0 +1,60 @@
+import logging
+from typing import Protocol
+from uuid import UUID, uuid4
+
+from band_tracker.updater.page_iterator import EventIterator
+
+log = logging.getLogger(__name__)
+
+
+class CheckpointDAL(Protocol):
+    async def get_checkpoint(self) -> tuple[UUID, dict] | None:
+        """Returns the id and state of the latest checkpoint of an unfinished run"""
+        ...
+
+    async def save_checkpoint(
+        self, run_id: UUID, state: dict, finished: bool = False
+    ) -> None:
+        """Stores the state of the run, overwriting its previous checkpoint"""
+        ...
+
+
+class Checkpointer:
+    """
+    Periodically stores the state of an events iterator, so a crashed
+    or quota limited run can be continued by the next one.
+    A checkpoint is saved after every `interval` processed pages.
+    """
+
+    def __init__(self, dal: CheckpointDAL, interval: int = 50) -> None:  # pages
+        self.dal = dal
+        self.interval = interval
+        self.run_id = uuid4()
+        self._pages = 0
+
+    async def resume(self, iterator: EventIterator) -> bool:
+        """Restores the iterator from the last unfinished run if there is one"""
+        checkpoint = await self.dal.get_checkpoint()
+        if checkpoint is None:
+            log.info("No unfinished run to resume")
+            return False
+
+        self.run_id, state = checkpoint
+        iterator.restore(state)
+        log.info(
+            f"Resuming run {self.run_id} from {state['max_end_time']}, "
+            f"{len(state['chunks'])} chunks known"
+        )
+        return True
+
+    async def pages_done(self, iterator: EventIterator, pages: int) -> None:
+        self._pages += pages
+        if self._pages >= self.interval:
+            await self.save(iterator)
+
+    async def save(self, iterator: EventIterator, finished: bool = False) -> None:
+        self._pages = 0
+        await self.dal.save_checkpoint(
+            self.run_id, iterator.snapshot(), finished=finished
+        )
+        log.debug(f"Checkpoint of run {self.run_id} saved, finished: {finished}")
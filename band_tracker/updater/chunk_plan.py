@@ -0,0 +1,78 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Protocol
+
+log = logging.getLogger(__name__)
+
+# start, end, country code, pages number, entities number
+PlannedChunk = tuple[datetime, datetime, str, int, int]
+
+
+class ChunkPlanDAL(Protocol):
+    async def get_chunk_plan(self, updated_after: datetime) -> list[PlannedChunk]:
+        """Returns chunks of the stored plan saved after the given datetime"""
+        ...
+
+    async def save_chunk_plan(self, chunks: list[PlannedChunk]) -> None:
+        """Replaces the stored plan with the given chunks"""
+        ...
+
+
+@dataclass
+class PlannedWindow:
+    start_datetime: datetime
+    end_datetime: datetime
+    countries: dict[str, int] = field(default_factory=dict)
+
+
+class ChunkPlan:
+    """
+    Date windows found by the previous sweep of the events iterator.
+    The iterator reuses a planned window after a single probe confirms it is
+    still under the api limit and falls back to discovery otherwise.
+    Plans older than `max_age` and windows already in the past are ignored.
+    """
+
+    def __init__(
+        self, dal: ChunkPlanDAL, max_age: timedelta = timedelta(days=7)
+    ) -> None:
+        self.dal = dal
+        self.max_age = max_age
+        self.windows: list[PlannedWindow] = []
+
+    async def load(self) -> None:
+        now = datetime.now()
+        rows = await self.dal.get_chunk_plan(updated_after=now - self.max_age)
+
+        windows: dict[tuple[datetime, datetime], PlannedWindow] = {}
+        for start, end, country_code, _, entities_number in rows:
+            if end < now:
+                continue
+            window = windows.setdefault((start, end), PlannedWindow(start, end))
+            if country_code:
+                window.countries[country_code] = entities_number
+
+        self.windows = sorted(windows.values(), key=lambda w: w.start_datetime)
+        log.info(f"Chunk plan of {len(self.windows)} windows loaded")
+
+    def end_for(self, start: datetime) -> datetime | None:
+        """Returns the end of the planned window containing the given start"""
+        for window in self.windows:
+            if window.start_datetime <= start < window.end_datetime or (
+                window.start_datetime == window.end_datetime == start
+            ):
+                return window.end_datetime
+        return None
+
+    def countries(self) -> dict[str, int]:
+        """Returns amounts of events per country of the planned split windows"""
+        result: dict[str, int] = {}
+        for window in self.windows:
+            for code, entities_number in window.countries.items():
+                result[code] = result.get(code, 0) + entities_number
+        return result
+
+    async def save(self, chunks: list[PlannedChunk]) -> None:
+        await self.dal.save_chunk_plan(chunks)
+        log.info(f"Chunk plan of {len(chunks)} chunks saved")
@@ -0,0 +1,66 @@
+import logging
+
+from iso3166 import countries
+
+log = logging.getLogger(__name__)
+
+
+class CountryHistory:
+    """
+    Learns which countries return events when oversized chunks are split by
+    country. Countries that had events during the last `ttl` splits are always
+    probed, the rest are probed in rotating batches of `cold_batch` countries,
+    so every country is still checked once in a while.
+    `unlocated` keeps the amount of events the last probe of all countries
+    could not attribute to any of them.
+    """
+
+    def __init__(
+        self,
+        country_codes: list[str] | None = None,
+        ttl: int = 30,  # splits
+        cold_batch: int = 25,
+    ) -> None:
+        self.country_codes = (
+            country_codes
+            if country_codes is not None
+            else [country.alpha2 for country in countries]
+        )
+        self.ttl = ttl
+        self.cold_batch = cold_batch
+        self._last_seen: dict[str, int] = {}
+        self._splits = 0
+        self._cold_offset = 0
+        self.unlocated = 0
+
+    @property
+    def hot(self) -> list[str]:
+        return [
+            code
+            for code in self.country_codes
+            if code in self._last_seen
+            and self._splits - self._last_seen[code] < self.ttl
+        ]
+
+    def countries_to_probe(self) -> list[str]:
+        """Returns country codes worth probing for the next oversized chunk"""
+        if not self._last_seen:
+            return list(self.country_codes)
+
+        hot = self.hot
+        cold = [code for code in self.country_codes if code not in hot]
+        if not cold:
+            return hot
+
+        start = self._cold_offset % len(cold)
+        batch = (cold[start:] + cold[:start])[: self.cold_batch]
+        self._cold_offset = start + self.cold_batch
+        return [code for code in self.country_codes if code in hot or code in batch]
+
+    def register(self, results: dict[str, int]) -> None:
+        """Stores amounts of events per country returned by a split"""
+        self._splits += 1
+        for code, elements_number in results.items():
+            if elements_number > 0:
+                self._last_seen[code] = self._splits
+        log.debug(f"Countries with events: {self.hot}")
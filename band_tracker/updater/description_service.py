@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+import httpx
+
+from band_tracker.db.artist_update import fetch_first_paragraph, filter_description
+
+log = logging.getLogger(__name__)
+
+
+class DescriptionService:
+    """
+    Fetches artist descriptions from wikipedia over a single shared client.
+    Amount of concurrent fetches is limited, fetched pages are cached by url
+    for `ttl`, so artists sharing a page or appearing on many events are
+    fetched once per run. Failed fetches are not cached.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 5,
+        ttl: timedelta = timedelta(hours=12),
+        timeout: float = 30.0,  # seconds
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self.http_client = httpx.AsyncClient(timeout=timeout, transport=transport)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache: dict[str, tuple[datetime, str | None]] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.fetches = 0
+
+    async def _fetch(self, url: str) -> str | None:
+        async with self._semaphore:
+            self.fetches += 1
+            text = await fetch_first_paragraph(url, self.http_client)
+        self._cache[url] = (datetime.now(), text)
+        return text
+
+    async def _first_paragraph(self, url: str) -> str | None:
+        cached = self._cache.get(url)
+        if cached is not None and datetime.now() - cached[0] < self.ttl:
+            self.hits += 1
+            return cached[1]
+
+        # concurrent requests of the same page wait for a single fetch
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.create_task(self._fetch(url))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def get_description(self, url: str, key_words: set[str]) -> str | None:
+        """Raises if the page could not be fetched"""
+        text = await self._first_paragraph(url)
+        return filter_description(text, key_words)
+
+    async def close(self) -> None:
+        log.info(f"Descriptions fetched: {self.fetches}, taken from cache: {self.hits}")
+        if not self.http_client.is_closed:
+            await self.http_client.aclose()
@@ -1,8 +1,6 @@
 import logging
 from datetime import datetime
 
-from pydantic import BaseModel, Field
-
 from band_tracker.core.enums import EventSource
 from band_tracker.db.artist_update import ArtistUpdate, ArtistUpdateSocials
 from band_tracker.db.event_update import EventUpdate, EventUpdateSales
@@ -11,28 +9,32 @@ from band_tracker.updater.errors import EmptyResponseException
 log = logging.getLogger(__name__)
 
 
-class JSONData(BaseModel):
-    embedded: dict[str, list] = Field(alias="_embedded")
-    # page: dict[str, int]
+def embedded_entities(raw_dict: dict, key: str) -> list[dict]:
+    """
+    Returns the list of entities embedded into a response under the given key.
+    Raises EmptyResponseException for responses without embedded entities and
+    KeyError if there are no entities of the given kind
+    """
+    embedded = raw_dict.get("_embedded")
+    if not isinstance(embedded, dict):
+        raise EmptyResponseException("invalid json", EventSource.ticketmaster_api)
+    entities = embedded[key]
+    if not isinstance(entities, list):
+        raise EmptyResponseException("invalid json", EventSource.ticketmaster_api)
+    return entities
 
 
 def image_helper(raw_entity: dict, thumbnail: bool = False) -> str | None:
-    if (
-        retina := [
-            image.get("url")
-            for image in raw_entity.get("images", [])
-            if "RETINA_PORTRAIT_3_2" in image.get("url")
-        ]
-    ) and not thumbnail:
-        return retina[0]
-    elif recommend := [
-        image.get("url")
-        for image in raw_entity.get("images", [])
-        if "RECOMENDATION" in image.get("url")
-    ]:
-        return recommend[0]
-    else:
-        return None
+    recommendation = None
+    for image in raw_entity.get("images", []):
+        url = image.get("url")
+        if not thumbnail and "RETINA_PORTRAIT_3_2" in url:
+            return url
+        if recommendation is None and "RECOMENDATION" in url:
+            if thumbnail:
+                return url
+            recommendation = url
+    return recommendation
 
 
 def get_artist(raw_artist: dict) -> ArtistUpdate:
@@ -93,6 +95,9 @@ def get_artist(raw_artist: dict) -> ArtistUpdate:
 
 def get_event(raw_event: dict) -> EventUpdate:
     log.debug("get_event invoke")
+    embedded = raw_event.get("_embedded", {})
+    venues = embedded.get("venues")
+    venue = venues[0] if venues else None
 
     def datetime_helper() -> datetime | None:
         format_string = "%Y-%m-%d"
@@ -101,25 +106,21 @@ def get_event(raw_event: dict) -> EventUpdate:
         return datetime.strptime(date, format_string) if date else None
 
     def attractions_helper() -> list:
-        raw_artists = {"_embedded": raw_event.get("_embedded", {})}
         processed_artists = []
         try:
-            processed_artists = get_all_artists(raw_artists)
+            processed_artists = get_all_artists({"_embedded": embedded})
         except KeyError:
             log.info("no artists were found in the upcoming event")
-        """attractions = raw_event.get("_embedded", {}).get("attractions")
-                if attractions:
-                    return [attraction.get("id") for attraction in attractions]
-                return []"""
         return processed_artists
 
     def sales_helper() -> EventUpdateSales:
         format_string = "%Y-%m-%d"
 
-        tbd = raw_event.get("sales", {}).get("public", {}).get("startTBD")
-        tba = raw_event.get("sales", {}).get("public", {}).get("startTBA")
-        sale_start = raw_event.get("sales", {}).get("public", {}).get("startDateTime")
-        sale_end = raw_event.get("sales", {}).get("public", {}).get("endDateTime")
+        public_sales = raw_event.get("sales", {}).get("public", {})
+        tbd = public_sales.get("startTBD")
+        tba = public_sales.get("startTBA")
+        sale_start = public_sales.get("startDateTime")
+        sale_end = public_sales.get("endDateTime")
         price_ranges = raw_event.get("priceRanges", {})
 
         if price_ranges:
@@ -151,32 +152,16 @@ def get_event(raw_event: dict) -> EventUpdate:
             currency=currency,
         )
 
-    def venues_helper() -> bool:
-        venues = raw_event.get("_embedded", {}).get("venues", {})
-        return bool(venues)
-
     modified_event = {
         "title": raw_event.get("name"),
         "date": datetime_helper(),
-        "venue": raw_event.get("_embedded", {}).get("venues", {})[0].get("name")
-        if venues_helper()
-        else None,
+        "venue": venue.get("name") if venue else None,
         "ticket_url": raw_event.get("url"),
         "source_specific_data": {
             EventSource.ticketmaster_api: {"id": raw_event.get("id")}
         },
-        "venue_city": raw_event.get("_embedded", {})
-        .get("venues", {})[0]
-        .get("city", {})
-        .get("name")
-        if venues_helper()
-        else None,
-        "venue_country": raw_event.get("_embedded", {})
-        .get("venues", {})[0]
-        .get("country", {})
-        .get("name")
-        if venues_helper()
-        else None,
+        "venue_city": venue.get("city", {}).get("name") if venue else None,
+        "venue_country": venue.get("country", {}).get("name") if venue else None,
         "artists": attractions_helper(),
         "sales": sales_helper(),
         "main_image": image_helper(raw_event),
@@ -186,23 +171,19 @@ def get_event(raw_event: dict) -> EventUpdate:
 
 
 def get_all_artists(raw_dict: dict[str, dict]) -> list[ArtistUpdate]:
-    try:
-        json_data = JSONData.model_validate(raw_dict)
-        artists = json_data.embedded["attractions"]
-    except ValueError:
-        raise EmptyResponseException("invalid json", EventSource.ticketmaster_api)
+    artists = embedded_entities(raw_dict, "attractions")
     output = []
     for i in artists:
         output.append(get_artist(i))
     return output
 
 
+def get_raw_events(raw_dict: dict[str, dict]) -> list[dict]:
+    return embedded_entities(raw_dict, "events")
+
+
 def get_all_events(raw_dict: dict[str, dict]) -> list[EventUpdate]:
-    try:
-        json_data = JSONData.model_validate(raw_dict)
-        events = json_data.embedded["events"]
-    except ValueError:
-        raise EmptyResponseException("invalid json", EventSource.ticketmaster_api)
+    events = get_raw_events(raw_dict)
     output = []
     for i in events:
         output.append(get_event(i))
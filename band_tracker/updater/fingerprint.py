@@ -0,0 +1,10 @@
+import hashlib
+import json
+
+
+def fingerprint(raw_entity: dict) -> str:
+    """Returns a hash of a raw api entity, independent of the keys order"""
+    dump = json.dumps(
+        raw_entity, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.blake2b(dump.encode(), digest_size=16).hexdigest()
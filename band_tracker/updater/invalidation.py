@@ -0,0 +1,72 @@
+import logging
+from typing import Iterable, Protocol
+from uuid import UUID
+
+from band_tracker.mq_publisher import MessageType
+
+log = logging.getLogger(__name__)
+
+
+class MessagePublisher(Protocol):
+    async def send_message(
+        self,
+        data: dict,
+        type_: MessageType,
+        headers: dict = {},
+        persistent: bool = True,
+    ) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class CacheInvalidation:
+    """
+    Collects uuids of the artists and events written by the updater and
+    publishes them for the bot processes to drop from their caches,
+    in messages of at most `batch_size` uuids.
+    Publish errors are logged and dropped, cached entries expire on their own.
+    """
+
+    def __init__(self, publisher: MessagePublisher, batch_size: int = 500) -> None:
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self._artists: set[UUID] = set()
+        self._events: set[UUID] = set()
+
+    async def add(
+        self, artists: Iterable[UUID] = (), events: Iterable[UUID] = ()
+    ) -> None:
+        self._artists.update(artists)
+        self._events.update(events)
+        if len(self._artists) + len(self._events) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._artists and not self._events:
+            return
+        data = {
+            "artists": [str(uuid) for uuid in self._artists],
+            "events": [str(uuid) for uuid in self._events],
+        }
+        self._artists, self._events = set(), set()
+        # bot caches expire on their own, losing a message is not critical
+        try:
+            await self.publisher.send_message(
+                data=data, type_=MessageType.invalidation, persistent=False
+            )
+        except Exception:
+            log.exception("Failed to publish cache invalidation")
+            return
+        log.debug(
+            f"Invalidation of {len(data['artists'])} artists "
+            f"and {len(data['events'])} events published"
+        )
+
+    async def close(self) -> None:
+        await self.flush()
+        try:
+            await self.publisher.close()
+        except Exception:
+            log.exception("Failed to close the invalidation publisher")
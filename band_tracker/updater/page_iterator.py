@@ -5,13 +5,13 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
-from iso3166 import countries
-
 from band_tracker.updater.api_client import (
     ApiClientArtists,
     ApiClientEvents,
     exception_helper,
 )
+from band_tracker.updater.chunk_plan import ChunkPlan
+from band_tracker.updater.country_history import CountryHistory
 from band_tracker.updater.errors import PredictorError, WrongChunkException
 from band_tracker.updater.timestamp_predictor import TimestampPredictor
 
@@ -70,39 +70,112 @@ class PageIterator(ABC):
 
 
 class EventIterator(PageIterator):
-    def __init__(self, client: ApiClientEvents, predictor: TimestampPredictor) -> None:
+    def __init__(
+        self,
+        client: ApiClientEvents,
+        predictor: TimestampPredictor,
+        country_history: CountryHistory | None = None,
+        chunk_plan: ChunkPlan | None = None,
+    ) -> None:
         self.client = client
         self.predictor = predictor
+        self.country_history = (
+            country_history if country_history is not None else CountryHistory()
+        )
+        self.chunk_plan = chunk_plan
+        if chunk_plan is not None and (planned_countries := chunk_plan.countries()):
+            self.country_history.register(planned_countries)
         self.chunks: list[EventsChunk] = []
         self.max_end_time = datetime.now()
         self.iterator_start = datetime.now()
+        # fetched pages stay in progress until their events are stored
+        self._fetched: list[tuple[dict, EventsChunk, int]] = []
+
+    async def _probe_country(
+        self, chunk: EventsChunk, country_code: str
+    ) -> EventsChunk | None:
+        response = await self.client.make_request(
+            chunk.start_datetime,
+            chunk.end_datetime,
+            country_code=country_code,
+        )
+        pagination_info = exception_helper(response)
 
-    async def _process_large_chunk(self, chunk: EventsChunk) -> EventsChunk:
-        for country in countries:
-            country_code = country.alpha2
-            response = await self.client.make_request(
-                chunk.start_datetime,
-                chunk.end_datetime,
-                country_code=country_code,
-            )
-            pagination_info = exception_helper(response)
+        result_entities = pagination_info.get("elements_number", 0)
+        pages_number = pagination_info.get("pages_number", 0)
 
-            result_entities = pagination_info.get("elements_number", 0)
-            pages_number = pagination_info.get("pages_number", 0)
+        if result_entities == 0:
+            return None
 
-            if result_entities == 0:
-                continue
+        return EventsChunk(
+            start_datetime=chunk.start_datetime,
+            end_datetime=chunk.end_datetime,
+            pages_number=pages_number,
+            country_code=country_code,
+            entities_number=result_entities,
+        )
 
-            chunk = EventsChunk(
-                start_datetime=chunk.start_datetime,
-                end_datetime=chunk.end_datetime,
-                pages_number=pages_number,
-                country_code=country_code,
-                entities_number=result_entities,
+    async def _probe_countries(
+        self, chunk: EventsChunk, country_codes: list[str]
+    ) -> list[EventsChunk]:
+        results = await asyncio.gather(
+            *[self._probe_country(chunk, code) for code in country_codes],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return [result for result in results if result is not None]
+
+    async def _process_large_chunk(self, chunk: EventsChunk) -> EventsChunk:
+        """
+        Splits a chunk with too many events by country. Countries are probed
+        concurrently, the api client rate limiter keeps the pace.
+        If the probed countries miss some of the chunk's events, the rest of
+        the countries are probed as well, unless the gap is no larger than
+        the one the last probe of all countries left, as such events are
+        likely not bound to any country.
+        """
+        history = self.country_history
+        country_codes = history.countries_to_probe()
+        log.debug(f"Splitting a large chunk by {len(country_codes)} countries")
+        country_chunks = await self._probe_countries(chunk, country_codes)
+
+        probed = set(country_codes)
+        rest = [code for code in history.country_codes if code not in probed]
+        gap = chunk.entities_number - sum(
+            country_chunk.entities_number for country_chunk in country_chunks
+        )
+        if gap > 0 and rest and gap > history.unlocated:
+            log.warning(
+                f"{gap} of {chunk.entities_number} events were not found "
+                f"in {len(country_codes)} countries, probing the other {len(rest)}"
             )
-            self.chunks.append(chunk)
+            more_chunks = await self._probe_countries(chunk, rest)
+            country_chunks.extend(more_chunks)
+            gap -= sum(country_chunk.entities_number for country_chunk in more_chunks)
+            rest = []
 
-        return chunk
+        if rest:
+            log.debug(f"{gap} events of a large chunk are likely not in any country")
+        else:
+            history.unlocated = max(gap, 0)
+            if gap > 0:
+                log.warning(
+                    f"{gap} of {chunk.entities_number} events of a large chunk "
+                    "were not found in any country"
+                )
+
+        history.register(
+            {
+                country_chunk.country_code: country_chunk.entities_number
+                for country_chunk in country_chunks
+            }
+        )
+        self.chunks.extend(country_chunks)
+
+        return country_chunks[-1] if country_chunks else chunk
 
     async def _get_chunk(self) -> EventsChunk | None:
         """
@@ -142,19 +215,46 @@ class EventIterator(PageIterator):
             self.chunks.append(new_chunk)
             return new_chunk
 
-    async def _create_chunk(self) -> EventsChunk | None:
+    async def _probe_window(self, start: datetime, end: datetime) -> EventsChunk:
+        response = await self.client.make_request(start, end)
+        pagination_info = exception_helper(response)
+
+        return EventsChunk(
+            start_datetime=start,
+            end_datetime=end,
+            pages_number=pagination_info.get("pages_number", 0),
+            entities_number=pagination_info.get("elements_number", 0),
+        )
+
+    async def _planned_chunk(self, start_time: datetime) -> EventsChunk | None:
         """
-        Creates and returns a chunk;
-        returns None instead if only a chunk with 0 elements can be
-        created or if the date is more than 2 years away
-        -------
+        Returns a chunk for the planned window starting at start_time if its
+        amount of events has not drifted over the api limit
         """
+        if self.chunk_plan is None:
+            return None
+        planned_end = self.chunk_plan.end_for(start_time)
+        if planned_end is None:
+            return None
+
+        chunk = await self._probe_window(start_time, planned_end)
+        if 0 < chunk.entities_number < 1000 or (
+            chunk.entities_number >= 1000 and planned_end == start_time
+        ):
+            return chunk
+
         log.debug(
-            "++++++++++++++++++++++++++++++++++++   "
-            "create_chunk invoke   ++++++++++++++++++++++++++++++++++++"
+            f"Planned window {start_time} - {planned_end} drifted to "
+            f"{chunk.entities_number} events, rediscovering"
         )
+        return None
+
+    async def _discover_chunk(self, start_time: datetime) -> EventsChunk | None:
+        """
+        Shrinks the window predicted for start_time until it has less events
+        than the api allows to page through
+        """
         eventsChunk = None
-        start_time = self.max_end_time
         max_entities = target_entities = result_entities = 1000
         while result_entities >= max_entities:
             try:
@@ -170,19 +270,8 @@ class EventIterator(PageIterator):
             if start_time > end_time:
                 end_time = start_time
 
-            response = await self.client.make_request(start_time, end_time)
-
-            pagination_info = exception_helper(response)
-
-            result_entities = pagination_info.get("elements_number", 0)
-            pages_number = pagination_info.get("pages_number", 0)
-
-            eventsChunk = EventsChunk(
-                start_datetime=start_time,
-                end_datetime=end_time,
-                pages_number=pages_number,
-                entities_number=result_entities,
-            )
+            eventsChunk = await self._probe_window(start_time, end_time)
+            result_entities = eventsChunk.entities_number
             log.debug(str(result_entities) + " " + str(target_entities))
 
             if result_entities > 1000 and end_time == start_time:
@@ -193,15 +282,112 @@ class EventIterator(PageIterator):
             else:
                 target_entities = int(target_entities * 0.7)
 
+        return eventsChunk
+
+    async def _create_chunk(self) -> EventsChunk | None:
+        """
+        Creates and returns a chunk;
+        returns None instead if only a chunk with 0 elements can be
+        created or if the date is more than 2 years away
+        -------
+        """
+        log.debug(
+            "++++++++++++++++++++++++++++++++++++   "
+            "create_chunk invoke   ++++++++++++++++++++++++++++++++++++"
+        )
+        start_time = self.max_end_time
+        eventsChunk = await self._planned_chunk(start_time)
+        if eventsChunk is None:
+            eventsChunk = await self._discover_chunk(start_time)
+
         if (
-            result_entities > 0
-            and eventsChunk
+            eventsChunk
+            and eventsChunk.entities_number > 0
             and eventsChunk.end_datetime < self.iterator_start + timedelta(days=731)
         ):
             return eventsChunk
         else:
             return None
 
+    async def save_plan(self) -> None:
+        """Stores the chunks of a finished sweep as the plan for the next one"""
+        if self.chunk_plan is None:
+            return
+        await self.chunk_plan.save(
+            [
+                (
+                    chunk.start_datetime,
+                    chunk.end_datetime,
+                    chunk.country_code,
+                    chunk.pages_number,
+                    chunk.entities_number,
+                )
+                for chunk in self.chunks
+            ]
+        )
+
+    def snapshot(self) -> dict:
+        """
+        Returns a json serializable state of the iteration,
+        pages which are in progress are stored as idle
+        """
+        return {
+            "iterator_start": self.iterator_start.isoformat(),
+            "max_end_time": self.max_end_time.isoformat(),
+            "chunks": [
+                {
+                    "start": chunk.start_datetime.isoformat(),
+                    "end": chunk.end_datetime.isoformat(),
+                    "country_code": chunk.country_code,
+                    "pages_number": chunk.pages_number,
+                    "entities_number": chunk.entities_number,
+                    "done_pages": [
+                        page
+                        for page, progression in chunk.pages.items()
+                        if progression == PageProgression.done
+                    ],
+                }
+                for chunk in self.chunks
+            ],
+        }
+
+    def restore(self, state: dict) -> None:
+        """Continues the iteration from a state returned by snapshot"""
+        self.iterator_start = datetime.fromisoformat(state["iterator_start"])
+        self.max_end_time = datetime.fromisoformat(state["max_end_time"])
+        self.chunks = []
+        for chunk_state in state["chunks"]:
+            chunk = EventsChunk(
+                start_datetime=datetime.fromisoformat(chunk_state["start"]),
+                end_datetime=datetime.fromisoformat(chunk_state["end"]),
+                pages_number=chunk_state["pages_number"],
+                entities_number=chunk_state["entities_number"],
+                country_code=chunk_state["country_code"],
+            )
+            for page in chunk_state["done_pages"]:
+                chunk.pages[page] = PageProgression.done
+            if PageProgression.idle not in chunk.pages.values():
+                chunk.progression = ChunkProgression.done
+            self.chunks.append(chunk)
+
+    def page_done(self, data: dict) -> None:
+        """
+        Marks a page returned by the iterator as done, should be called
+        once its events are stored. Pages left in progress are fetched
+        again after the iteration is restored from a snapshot.
+        """
+        for index, (fetched, chunk, page) in enumerate(self._fetched):
+            if fetched is data:
+                del self._fetched[index]
+                chunk.pages[page] = PageProgression.done
+                if all(
+                    progression == PageProgression.done
+                    for progression in chunk.pages.values()
+                ):
+                    chunk.progression = ChunkProgression.done
+                return
+        log.warning("Trying to mark a page which wasn't fetched as done")
+
     def all_chunks_done(self) -> bool:
         """
         Returns True if  all known chunks are done False otherwise
@@ -240,7 +426,7 @@ class EventIterator(PageIterator):
                 )
                 try:
                     exception_helper(data)
-                    pages.update({current_page: PageProgression.done})
+                    self._fetched.append((data, current_chunk, current_page))
                     return data
                 except Exception as e:
                     pages.update({current_page: PageProgression.idle})
@@ -0,0 +1,129 @@
+import logging
+from dataclasses import dataclass
+from time import monotonic
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class LimiterMetrics:
+    rate: float  # requests per second
+    concurrency: int
+    in_flight: int
+    successes: int
+    throttles: int
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second. Reservations are made
+    synchronously and may put the bucket in debt, so the returned delays of
+    concurrent callers are spaced out evenly.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = monotonic()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def delay(self) -> float:
+        """Returns seconds until the next token is available"""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def reserve(self) -> float:
+        """Takes a token and returns seconds to wait before it may be used"""
+        delay = self.delay()
+        self._tokens -= 1
+        return delay
+
+    def drain(self) -> None:
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class AdaptiveLimiter:
+    """
+    Rate and concurrency limiter for a single api key with AIMD adaptation:
+    both limits grow additively while requests succeed and are cut
+    multiplicatively when the api reports a spike arrest.
+    """
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        rate_step: float = 0.05,
+        concurrency: int = 4,
+        max_concurrency: int = 16,
+        backoff: float = 0.5,
+    ) -> None:
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate=rate)
+        self.in_flight = 0
+        self.successes = 0
+        self.throttles = 0
+        self._streak = 0
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.concurrency
+
+    def delay(self) -> float:
+        return self.bucket.delay()
+
+    def reserve(self) -> float:
+        """Occupies a concurrency slot, returns seconds to wait before sending"""
+        self.in_flight += 1
+        return self.bucket.reserve()
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def on_success(self) -> None:
+        self.successes += 1
+        self._streak += 1
+        self.bucket.rate = min(self.max_rate, self.bucket.rate + self.rate_step)
+        if self._streak >= self.concurrency:
+            self._streak = 0
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def on_throttle(self) -> None:
+        self.throttles += 1
+        self._streak = 0
+        self.bucket.rate = max(self.min_rate, self.bucket.rate * self.backoff)
+        self.concurrency = max(1, int(self.concurrency * self.backoff))
+        self.bucket.drain()
+        log.debug(
+            f"Spike arrest, backing off to {self.rate:.2f} rps "
+            f"and concurrency {self.concurrency}"
+        )
+
+    @property
+    def metrics(self) -> LimiterMetrics:
+        return LimiterMetrics(
+            rate=self.rate,
+            concurrency=self.concurrency,
+            in_flight=self.in_flight,
+            successes=self.successes,
+            throttles=self.throttles,
+        )
@@ -6,10 +6,13 @@ import sympy
 
 
 class PredictorDAL(Protocol):
-    async def get_event_amounts(self) -> list[tuple[datetime, int]]:
+    async def get_event_amounts(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, int]]:
         """
         Returns a list of tuples with 1st element being certain datetime, and
-        second element - an amount of events on that day
+        second element - an amount of events on that day, for days from start
+        up to end
         """
         ...
 
@@ -73,13 +76,22 @@ class LinearPredictor(TimestampPredictor):
 
 
 class CurrentDataPredictor(TimestampPredictor):
-    def __init__(self, dal: PredictorDAL, start: datetime = datetime.now()) -> None:
+    def __init__(
+        self,
+        dal: PredictorDAL,
+        start: datetime = datetime.now(),
+        horizon: timedelta = timedelta(days=730),
+    ) -> None:
         self._start = start
         self._dal = dal
+        self._horizon = horizon
         self._data: list[tuple[datetime, int]] = []
 
     async def update_params(self) -> None:
-        data = await self._dal.get_event_amounts()
+        # the last day is included, predictions end right after it
+        data = await self._dal.get_event_amounts(
+            start=self._start, end=self._start + self._horizon + timedelta(days=1)
+        )
         self._data = list(filter(lambda x: x[0] >= self._start, data))
 
     def start(self) -> datetime:
@@ -91,7 +103,7 @@ class CurrentDataPredictor(TimestampPredictor):
     async def get_next_timestamp(
         self, start: datetime, target_entities: int
     ) -> datetime:
-        max_date = self._start + timedelta(days=730)
+        max_date = self._start + self._horizon
         if start == max_date:
             return max_date + timedelta(days=1)
 
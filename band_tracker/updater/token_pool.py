@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Callable
+
+from band_tracker.updater.errors import AllTokensViolation
+from band_tracker.updater.rate_limiter import AdaptiveLimiter, LimiterMetrics
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ApiToken:
+    name: str
+    key: str = field(repr=False)
+    limiter: AdaptiveLimiter = field(repr=False)
+    requests: int = 0
+    quota_violations: int = 0
+    exhausted: bool = False
+
+
+class TokenPool:
+    """
+    Spreads api requests across all configured api keys.
+    Every key has its own adaptive rate limiter and counters, keys which ran out
+    of their quota are skipped until the pool is recreated.
+    """
+
+    def __init__(
+        self,
+        keys: list[str],
+        limiter_factory: Callable[[], AdaptiveLimiter] = AdaptiveLimiter,
+    ) -> None:
+        self.tokens = [
+            ApiToken(name=f"key#{index}", key=key.strip(), limiter=limiter_factory())
+            for index, key in enumerate(keys)
+            if key.strip()
+        ]
+        self._released = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def available(self) -> list[ApiToken]:
+        return [token for token in self.tokens if not token.exhausted]
+
+    @property
+    def concurrency(self) -> int:
+        """Total amount of requests the available keys currently allow in flight"""
+        return sum(token.limiter.concurrency for token in self.available)
+
+    def metrics(self) -> dict[str, LimiterMetrics]:
+        return {token.name: token.limiter.metrics for token in self.tokens}
+
+    async def _acquire(self) -> ApiToken:
+        while True:
+            available = self.available
+            if not available:
+                raise AllTokensViolation
+
+            ready = [token for token in available if not token.limiter.saturated]
+            if not ready:
+                async with self._released:
+                    await self._released.wait()
+                continue
+
+            token = min(
+                ready,
+                key=lambda token: (token.limiter.delay(), token.limiter.in_flight),
+            )
+            delay = token.limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # key might have been exhausted by another request while waiting
+            if token.exhausted:
+                await self._release(token)
+                continue
+            return token
+
+    async def _release(self, token: ApiToken) -> None:
+        token.limiter.release()
+        async with self._released:
+            self._released.notify_all()
+
+    @asynccontextmanager
+    async def token(self) -> AsyncGenerator[ApiToken, None]:
+        token = await self._acquire()
+        token.requests += 1
+        try:
+            yield token
+        finally:
+            await self._release(token)
+
+    def exhaust(self, token: ApiToken) -> None:
+        token.quota_violations += 1
+        if not token.exhausted:
+            token.exhausted = True
+            log.warning(
+                f"Api {token.name} exceeded its quota, "
+                f"{len(self.available)} of {len(self)} keys left"
+            )
@@ -2,54 +2,122 @@ import asyncio
 import logging
 from asyncio import Semaphore
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Callable, Coroutine
+from uuid import UUID
 
+import httpx
+
+from band_tracker.core.enums import EventSource
+from band_tracker.db.artist_update import ArtistUpdate
 from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.db.event_update import EventUpdate
 from band_tracker.updater.api_client import (
     ApiClientArtists,
     ApiClientEvents,
     exception_helper,
+    http2_available,
+)
+from band_tracker.updater.checkpoint import Checkpointer
+from band_tracker.updater.chunk_plan import ChunkPlan
+from band_tracker.updater.country_history import CountryHistory
+from band_tracker.updater.description_service import DescriptionService
+from band_tracker.updater.deserializator import (
+    get_all_artists,
+    get_all_events,
+    get_raw_events,
 )
-from band_tracker.updater.deserializator import get_all_artists, get_all_events
 from band_tracker.updater.errors import (
     AllTokensViolation,
     EmptyResponseException,
     InvalidResponseStructureError,
     InvalidTokenError,
     PredictorError,
-    QuotaViolation,
     RateLimitViolation,
     UpdateError,
     WrongChunkException,
 )
+from band_tracker.updater.fingerprint import fingerprint
+from band_tracker.updater.invalidation import CacheInvalidation
 from band_tracker.updater.page_iterator import (
     ArtistIterator,
     EventIterator,
     PageIterator,
 )
+from band_tracker.updater.rate_limiter import AdaptiveLimiter
 from band_tracker.updater.timestamp_predictor import TimestampPredictor
+from band_tracker.updater.token_pool import TokenPool
 
 log = logging.getLogger(__name__)
 lock = asyncio.Lock()
 
 
 class ClientFactory:
-    def __init__(self, base_url: str, tokens: list[str]) -> None:
+    """
+    Creates api clients sharing a single pooled http transport.
+    The transport is owned by the factory and has to be closed with `close`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        tokens: list[str],
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,  # seconds
+        requests_per_second: float = 4.0,  # initial rate per api key
+        max_requests_per_second: float = 20.0,  # per api key
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         self.base_url = base_url
         self.tokens = tokens
         self.params: dict = {
-            "apikey": self.tokens[0],
             "segmentId": "KZFzniwnSyZfZ7v7nJ",
             "size": 200,
         }
+        limiter_factory = partial(
+            AdaptiveLimiter, rate=requests_per_second, max_rate=max_requests_per_second
+        )
+        self.token_pool = TokenPool(tokens, limiter_factory=limiter_factory)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2_available() if http2 is None else http2
+        self.http_client = httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=httpx.Timeout(5.0, pool=5),
+            transport=transport,
+        )
+        log.debug(f"Api http transport created, {self.limits}, http2: {self.http2}")
 
     def get_events_client(self) -> ApiClientEvents:
         url = "".join((self.base_url, "events"))
-        return ApiClientEvents(url=url, query_params=self.params, tokens=self.tokens)
+        return ApiClientEvents(
+            url=url,
+            query_params=self.params,
+            tokens=self.tokens,
+            http_client=self.http_client,
+            token_pool=self.token_pool,
+        )
 
     def get_artists_client(self) -> ApiClientArtists:
         url = "".join((self.base_url, "attractions"))
-        return ApiClientArtists(url=url, query_params=self.params, tokens=self.tokens)
+        return ApiClientArtists(
+            url=url,
+            query_params=self.params,
+            tokens=self.tokens,
+            http_client=self.http_client,
+            token_pool=self.token_pool,
+        )
+
+    async def close(self) -> None:
+        if not self.http_client.is_closed:
+            await self.http_client.aclose()
+            log.debug("Api http transport closed")
 
 
 class Updater:
@@ -59,15 +127,38 @@ class Updater:
         dal: UpdateDAL,
         predictor: TimestampPredictor | None = None,
         max_fails: int = 5,
-        chunk_size: int = 4,
-        ratelimit_violation_sleep_time: int = 5,  # seconds
+        chunk_size: int | None = None,
+        chunk_plan: ChunkPlan | None = None,
+        checkpointer: Checkpointer | None = None,
+        description_service: DescriptionService | None = None,
+        description_ttl: timedelta = timedelta(days=30),
+        invalidation: CacheInvalidation | None = None,
     ) -> None:
         self.client_factory = client_factory
-        self.chunk_size = chunk_size
+        self._chunk_size = chunk_size
         self.max_fails = max_fails
         self.predictor = predictor
         self.dal = dal
-        self.ratelimit_violation_sleep_time = ratelimit_violation_sleep_time
+        self.country_history = CountryHistory()
+        self.chunk_plan = chunk_plan
+        self.checkpointer = checkpointer
+        self.description_service = (
+            description_service
+            if description_service is not None
+            else DescriptionService()
+        )
+        self.description_ttl = description_ttl
+        self.invalidation = invalidation
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        Amount of concurrent requests, follows the current concurrency of the
+        api keys rate limiters unless set explicitly
+        """
+        if self._chunk_size is not None:
+            return self._chunk_size
+        return max(1, self.client_factory.token_pool.concurrency)
 
     def _get_pages_chunk(self, iterator: PageIterator) -> list[Coroutine] | None:
         coroutines = [
@@ -77,6 +168,10 @@ class Updater:
         ]
         return coroutines if coroutines else None
 
+    def _log_limiter_metrics(self, level: int = logging.DEBUG) -> None:
+        for name, metrics in self.client_factory.token_pool.metrics().items():
+            log.log(level, f"Api {name} limiter: {metrics}")
+
     async def _process_exceptions(
         self, exception: Exception, target_list: list[Exception]
     ) -> None:
@@ -92,9 +187,8 @@ class Updater:
             log.warning(exception)
             target_list.append(exception)
         elif isinstance(exception, RateLimitViolation):
+            # api keys limiters have already backed off, the page will be retried
             log.warning(RateLimitViolation)
-            log.debug("SLEEP TIME")
-            await asyncio.sleep(self.ratelimit_violation_sleep_time)
         elif isinstance(exception, EmptyResponseException):
             pass
         elif isinstance(exception, Exception):
@@ -107,28 +201,55 @@ class Updater:
                 "Reached the limit of allowed exceptions", exceptions=target_list
             )
 
-    async def _update_events_worker(
+    async def _filter_unchanged_events(
+        self, page: dict[str, dict]
+    ) -> tuple[dict[str, dict], dict[str, str]]:
+        """
+        Drops events whose content has not changed since the last update.
+        Returns the page with the changed events only and their content hashes
+        """
+        raw_events = get_raw_events(page)
+        hashes = {
+            raw_event["id"]: fingerprint(raw_event)
+            for raw_event in raw_events
+            if raw_event.get("id")
+        }
+        stored_hashes = await self.dal.get_event_hashes(list(hashes))
+
+        changed_events = [
+            raw_event
+            for raw_event in raw_events
+            if raw_event.get("id") not in hashes
+            or stored_hashes.get(raw_event["id"]) != hashes[raw_event["id"]]
+        ]
+        log.debug(
+            f"{len(raw_events) - len(changed_events)} of {len(raw_events)} "
+            "events on the page are unchanged"
+        )
+        changed_hashes = {
+            raw_event["id"]: hashes[raw_event["id"]]
+            for raw_event in changed_events
+            if raw_event.get("id") in hashes
+        }
+        return {"_embedded": {"events": changed_events}}, changed_hashes
+
+    async def _iterate_events(
         self,
+        page_iterator: EventIterator,
         get_elements: Callable[[dict[str, dict]], list],
-        client: ApiClientEvents,
-        update_event: Callable,
+        update_events: Callable,
     ) -> None:
-        if not self.predictor:
-            raise PredictorError("Predictor was not given to Updater constructor")
-
-        await self.predictor.update_params()
-        page_iterator = EventIterator(client=client, predictor=self.predictor)
         exceptions: list[Exception] = []
 
         while (chunk := self._get_pages_chunk(page_iterator)) is not None:
             log.debug("coroutines spawn")
 
-            start_time = datetime.now()
             pages = await asyncio.gather(*chunk, return_exceptions=True)
 
             # log.debug(pages)
             if not any(pages):
-                return
+                break
+            processed_pages = 0
             for page in pages:
                 if page is None or isinstance(page, WrongChunkException):
                     pass
@@ -140,16 +261,70 @@ class Updater:
                 else:
                     log.info("Successful response. Start parsing")
 
-                    updates = get_elements(page)  # type: ignore
-                    for update in updates:
-                        # log.debug("UPDATE " + str(update))
-                        await update_event(update)
+                    changed_page, hashes = await self._filter_unchanged_events(
+                        page  # type: ignore
+                    )
+                    updates = get_elements(changed_page)
+                    if updates:
+                        written = await update_events(updates)
+                        await self._invalidate_events(updates, written)
+                    await self.dal.set_event_hashes(hashes)
+                    page_iterator.page_done(page)  # type: ignore
+                    processed_pages += 1
+
+            self._log_limiter_metrics()
+            if self.checkpointer is not None:
+                await self.checkpointer.pages_done(page_iterator, processed_pages)
+
+    async def _invalidate_events(
+        self, updates: list[EventUpdate], written: list[tuple[UUID, list[UUID]]]
+    ) -> None:
+        """Publishes uuids of the written events and their artists"""
+        if self.invalidation is None:
+            return
+        artist_tm_ids = [
+            artist.get_source_specific_data(EventSource.ticketmaster_api)["id"]
+            for update in updates
+            for artist in update.artists
+        ]
+        # answered from the identity map of the run
+        artist_ids = await self.dal.get_artist_ids(artist_tm_ids)
+        await self.invalidation.add(
+            artists=artist_ids.values(), events=[uuid for uuid, _ in written]
+        )
+
+    async def _update_events_worker(
+        self,
+        get_elements: Callable[[dict[str, dict]], list],
+        client: ApiClientEvents,
+        update_events: Callable,
+        resume: bool = False,
+    ) -> None:
+        if not self.predictor:
+            raise PredictorError("Predictor was not given to Updater constructor")
 
-            exec_time: timedelta = datetime.now() - start_time
-            time_to_wait = timedelta(seconds=1) - exec_time
-            seconds_to_wait = time_to_wait.microseconds / 1_000_000
-            if seconds_to_wait > 0:
-                await asyncio.sleep(seconds_to_wait)
+        await self.predictor.update_params()
+        if self.chunk_plan is not None:
+            await self.chunk_plan.load()
+        page_iterator = EventIterator(
+            client=client,
+            predictor=self.predictor,
+            country_history=self.country_history,
+            chunk_plan=self.chunk_plan,
+        )
+        if resume and self.checkpointer is not None:
+            await self.checkpointer.resume(page_iterator)
+
+        try:
+            await self._iterate_events(page_iterator, get_elements, update_events)
+        except Exception:
+            if self.checkpointer is not None:
+                await self.checkpointer.save(page_iterator)
+            raise
+
+        await page_iterator.save_plan()
+        if self.checkpointer is not None:
+            await self.checkpointer.save(page_iterator, finished=True)
 
     async def _update_artists_worker(
         self,
@@ -169,9 +344,7 @@ class Updater:
             if not any(pages):
                 return
             for page in pages:
-                if isinstance(page, QuotaViolation):
-                    client.change_token_flag = True
-                elif isinstance(page, Exception):
+                if isinstance(page, Exception):
                     await self._process_exceptions(
                         exception=page, target_list=exceptions
                     )
@@ -180,47 +353,72 @@ class Updater:
                     log.info("Successful response. Start parsing")
                     try:
                         updates = get_elements(page)  # type: ignore
+                        await self._set_descriptions(updates)
                         for update in updates:
                             # log.debug("UPDATE " + str(update))
-                            await update.set_description()
                             await update_dal(update)
                     except EmptyResponseException:
                         pass
 
+    async def _set_descriptions(self, updates: list[ArtistUpdate]) -> None:
+        """
+        Fetches descriptions of the artists concurrently, reusing the stored
+        ones which were fetched less than description_ttl ago
+        """
+        stored = await self.dal.get_descriptions(
+            [
+                update.get_source_specific_data(EventSource.ticketmaster_api)["id"]
+                for update in updates
+            ]
+        )
+        fresh_after = datetime.now() - self.description_ttl
+
+        async def set_description(update: ArtistUpdate) -> None:
+            tm_id = update.get_source_specific_data(EventSource.ticketmaster_api)["id"]
+            description, description_updated = stored.get(tm_id, (None, None))
+            if description_updated is not None and description_updated > fresh_after:
+                update.description = description
+            else:
+                await update.set_description(self.description_service.get_description)
+
+        await asyncio.gather(*[set_description(update) for update in updates])
+
     async def add_absent_artists(self, artist_ids: list[str]) -> None:
-        new_artists = [
-            artist
-            for artist in artist_ids
-            if not await self.dal.get_artist_by_tm_id(artist)
-        ]
+        present_artists = await self.dal.get_artist_ids(artist_ids)
+        new_artists = [artist for artist in artist_ids if artist not in present_artists]
 
         if new_artists:
             await self.update_artists_by_ids(new_artists)
 
     async def update_current_artists(self) -> None:
-        tm_ids = await self.dal.get_tm_ids()
-        await self.update_artists_by_ids(tm_ids)
+        async with self.dal.identity_map_scope():
+            tm_ids = await self.dal.get_tm_ids()
+            await self.update_artists_by_ids(tm_ids)
 
-    async def update_artists_by_ids(self, tm_ids: list[str]) -> None:
+    async def update_artists_by_ids(
+        self, tm_ids: list[str], batch_size: int = 50
+    ) -> None:
+        """
+        Requests artists in batches of tm ids and writes every batch with
+        a single bulk update
+        """
         exceptions: list[Exception] = []
 
-        update_dal = self.dal.update_artist
         client = self.client_factory.get_artists_client()
 
-        async def process_tm_id(tm_id: str) -> None:
+        async def process_batch(batch: list[str]) -> None:
             async with semaphore:
                 successful = False
                 while not successful:
                     try:
-                        page = await client.make_request(tm_id=tm_id)
+                        page = await client.make_request(tm_ids=batch)
                         exception_helper(page)
                         updates = get_all_artists(page)
-                        for update in updates:
-                            await update.set_description()
-                            await update_dal(update)
+                        await self._set_descriptions(updates)
+                        artist_ids = await self.dal.bulk_update_artists(updates)
+                        if self.invalidation is not None:
+                            await self.invalidation.add(artists=artist_ids.values())
                         successful = True
-                    except QuotaViolation:
-                        client.change_token_flag = True
                     except EmptyResponseException:
                         # scip invalid ids
                         successful = True
@@ -233,17 +431,41 @@ class Updater:
                             # scip problematic entities
                             successful = True
 
-        semaphore = Semaphore(4)
-        tasks = [process_tm_id(tm_id) for tm_id in tm_ids]
-        await asyncio.gather(*tasks)
-
-    async def update_events(self) -> None:
+        semaphore = Semaphore(self.chunk_size)
+        batches = [
+            tm_ids[index : index + batch_size]
+            for index in range(0, len(tm_ids), batch_size)
+        ]
+        await asyncio.gather(*[process_batch(batch) for batch in batches])
+        if self.invalidation is not None:
+            await self.invalidation.flush()
+
+    async def update_events(self, resume: bool = False) -> None:
+        """
+        Updates all upcoming events,
+        continues the last unfinished run from its checkpoint if resume is set
+        """
         log.info("Update Events")
 
-        update_event = self.dal.update_event
+        update_events = self.dal.bulk_update_events
         client = self.client_factory.get_events_client()
 
-        await self._update_events_worker(get_all_events, client, update_event)
+        async with self.dal.identity_map_scope():
+            await self._update_events_worker(
+                get_all_events, client, update_events, resume=resume
+            )
+        await self.dal.refresh_daily_event_counts()
+        if self.invalidation is not None:
+            await self.invalidation.flush()
+
+    async def close(self) -> None:
+        """Releases resources owned by the updater's client factory"""
+        log.info(f"Api keys usage: {self.client_factory.token_pool.tokens}")
+        self._log_limiter_metrics(level=logging.INFO)
+        await self.client_factory.close()
+        await self.description_service.close()
+        if self.invalidation is not None:
+            await self.invalidation.close()
 
     async def update_artists_by_keywords(self, artists: list[str]) -> None:
         log.info("Update Artists")
@@ -4,12 +4,19 @@ from dotenv import load_dotenv
 from telegram.error import InvalidToken
 
 from band_tracker.bot.app import build_app, run
+from band_tracker.bot.helpers.artist_index import ArtistSearchIndex
+from band_tracker.bot.helpers.cache_invalidator import CacheInvalidator
 from band_tracker.bot.helpers.handlers_registrator import register_handlers
-from band_tracker.config.env_loader import db_env_vars, tg_bot_env_vars
+from band_tracker.config.constants import (
+    ARTIST_INDEX_ENABLED,
+    ARTIST_INDEX_MAX_MEMORY,
+    INVALIDATION_ROUTING_KEY,
+)
+from band_tracker.config.env_loader import db_env_vars, mq_env_vars, tg_bot_env_vars
 from band_tracker.config.log import load_log_config
 from band_tracker.db.dal_bot import BotDAL
 from band_tracker.db.dal_message import MessageDAL
-from band_tracker.db.session import AsyncSessionmaker
+from band_tracker.db.session import POOL_PRESETS, AsyncSessionmaker
 
 
 def main() -> None:
@@ -29,14 +36,35 @@ def main() -> None:
         ip=db_env.DB_IP,
         port=db_env.DB_PORT,
         database=db_env.DB_NAME,
+        pool=POOL_PRESETS["bot"].with_env(db_env),
+        replicas=db_env.DB_REPLICA_URLS,
     )
     bot_dal = BotDAL(db_sessionmaker)
     msg_dal = MessageDAL(db_sessionmaker)
+    artist_index = (
+        ArtistSearchIndex(bot_dal, max_memory=ARTIST_INDEX_MAX_MEMORY)
+        if ARTIST_INDEX_ENABLED
+        else None
+    )
+    try:
+        mq_env = mq_env_vars()
+        cache_invalidator: CacheInvalidator | None = CacheInvalidator(
+            dal=bot_dal,
+            mq_url=mq_env.MQ_URI,
+            mq_routing_key=INVALIDATION_ROUTING_KEY,
+            exchange_name=mq_env.MQ_EXCHANGE,
+            artist_index=artist_index,
+        )
+    except EnvironmentError as e:
+        log.warning(f"Caches will only expire by ttl: {e}")
+        cache_invalidator = None
     app = build_app(
         token=env_vars.TG_BOT_TOKEN,
         handler_registrator=register_handlers,
         bot_dal=bot_dal,
         msg_dal=msg_dal,
+        artist_index=artist_index,
+        cache_invalidator=cache_invalidator,
     )
 
     try:
@@ -44,6 +72,8 @@ def main() -> None:
     except InvalidToken:
         log.critical("Telegram token was rejected by the server")
         return
+    finally:
+        log.info(f"Db pool: {db_sessionmaker.metrics}")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ from telegram import Bot
 
 from band_tracker.config.env_loader import db_env_vars, mq_env_vars, tg_bot_env_vars
 from band_tracker.db.dal_bot import BotDAL
-from band_tracker.db.session import AsyncSessionmaker
+from band_tracker.db.session import POOL_PRESETS, AsyncSessionmaker
 from band_tracker.notifier import Notifier
 
 
@@ -20,6 +20,8 @@ async def main() -> None:
         ip=db_env.DB_IP,
         port=db_env.DB_PORT,
         database=db_env.DB_NAME,
+        pool=POOL_PRESETS["notifier"].with_env(db_env),
+        replicas=db_env.DB_REPLICA_URLS,
     )
     dal = BotDAL(db_sessionmaker)
     notifier = await Notifier.create(
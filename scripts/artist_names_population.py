@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import math
 import os
 import sys
 
@@ -8,14 +9,58 @@ from dotenv import load_dotenv
 
 from band_tracker.config.env_loader import db_env_vars, events_api_env_vars
 from band_tracker.config.log import load_log_config
-from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.db.dal_update import UpdateDAL, normalize_artist_name
 from band_tracker.db.session import AsyncSessionmaker
 from band_tracker.updater.errors import InvalidResponseStructureError
 
+PER_PAGE = 5000
+MAX_CONCURRENCY = 8
+MAX_RETRIES = 5
+RETRY_DELAY = 1.0  # seconds, doubled after every failed attempt
+
+# rate limits, server errors and truncated pages are worth retrying
+FETCH_ERRORS = (httpx.HTTPError, ValueError, InvalidResponseStructureError)
+
+log = logging.getLogger(__name__)
+
+
+async def get_page(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    base_url: str,
+    params: dict,
+    page: int,
+) -> dict:
+    async with semaphore:
+        response = await client.get(base_url, params={**params, "page": str(page)})
+    response.raise_for_status()
+    raw_dict = response.json()
+    if "performers" not in raw_dict:
+        raise InvalidResponseStructureError(f"No performers on page {page}")
+    return raw_dict
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    base_url: str,
+    params: dict,
+    page: int,
+) -> dict:
+    """Fetches a page of performers, retrying failed requests with backoff"""
+    delay = RETRY_DELAY
+    for _ in range(MAX_RETRIES - 1):
+        try:
+            return await get_page(client, semaphore, base_url, params, page)
+        except FETCH_ERRORS as e:
+            log.warning(f"Page {page} failed: {e!r}, retrying in {delay}s")
+            await asyncio.sleep(delay)
+            delay *= 2
+    return await get_page(client, semaphore, base_url, params, page)
+
 
 async def main() -> None:
     load_log_config()
-    log = logging.getLogger(__name__)
 
     load_dotenv()
     events_env = events_api_env_vars()
@@ -32,30 +77,50 @@ async def main() -> None:
 
     base_url = events_env.SEATGEEK_URL
     api_token = events_env.SEATGEEK_TOKEN
-    params = {"client_id": api_token, "taxonomies.id": "2000000", "per_page": 5000}
+    params = {"client_id": api_token, "taxonomies.id": "2000000", "per_page": PER_PAGE}
     log.debug(
         "---------------------------------------------Population script "
         "start---------------------------------------------"
     )
-    page = 0
-
-    while True:
-        page += 1
-        params.update({"page": str(page)})
-        raw_dict = httpx.get(base_url, params=params).json()
-
-        if "performers" not in raw_dict:
-            raise InvalidResponseStructureError
-        performers = raw_dict.get("performers", {})
-        if performers:
-            for artist in performers:
-                name = artist.get("name")
-                await dal.add_external_artist_name(name)
-        else:
-            log.info(
-                "script stopped working due to empty performers list in the responded page"
-            )
-            break
+
+    # names met in earlier pages are not sent to the db again
+    seen: set[str] = set()
+    added = 0
+
+    async def add_names(raw_dict: dict) -> None:
+        nonlocal added
+        names = {
+            normalize_artist_name(artist.get("name") or "")
+            for artist in raw_dict["performers"]
+        }
+        new_names = names - seen
+        seen.update(new_names)
+        added += await dal.bulk_add_external_artist_names(new_names)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=60) as client:
+        first_page = await fetch_page(client, semaphore, base_url, params, page=1)
+        await add_names(first_page)
+
+        total = first_page.get("meta", {}).get("total", 0)
+        pages_number = math.ceil(total / PER_PAGE)
+        log.info(f"{total} performers on {pages_number} pages")
+
+        async def fetch_or_skip(page: int) -> dict | None:
+            try:
+                return await fetch_page(client, semaphore, base_url, params, page)
+            except FETCH_ERRORS as e:
+                log.error(f"Page {page} skipped after {MAX_RETRIES} attempts: {e!r}")
+                return None
+
+        pages = [fetch_or_skip(page) for page in range(2, pages_number + 1)]
+        for page in asyncio.as_completed(pages):
+            raw_dict = await page
+            if raw_dict is not None:
+                await add_names(raw_dict)
+
+    log.info(f"{added} artist names were added, {len(seen)} names fetched")
+    await db_sessionmaker.dispose()
 
 
 if __name__ == "__main__":
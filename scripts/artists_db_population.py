@@ -37,7 +37,10 @@ async def main() -> None:
         dal=dal,
     )
     artist_names: list[str] = await dal.get_external_artist_names()
-    await updater.update_artists_by_keywords(artist_names)
+    try:
+        await updater.update_artists_by_keywords(artist_names)
+    finally:
+        await updater.close()
     log.info("!!!!!!!!!!!!!!!! Artists population close !!!!!!!!!!!!!!!!")
 
 
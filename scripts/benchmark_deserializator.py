@@ -0,0 +1,31 @@
+import json
+import os
+import sys
+import timeit
+
+PAGE_PATH = "tests/test_data/client_mock/events.json"
+
+
+def main(repeat: int = 5, number: int = 20) -> None:
+    from band_tracker.updater.api_client import loads
+    from band_tracker.updater.deserializator import get_all_events
+
+    with open(PAGE_PATH, "rb") as f:
+        content = f.read()
+    events_number = len(json.loads(content)["_embedded"]["events"])
+
+    benchmarks = {
+        "json.loads": lambda: json.loads(content),
+        "api_client.loads": lambda: loads(content),
+        "get_all_events": lambda: get_all_events(json.loads(content)),
+        "loads + get_all_events": lambda: get_all_events(loads(content)),
+    }
+    print(f"{PAGE_PATH}: {len(content)} bytes, {events_number} events")
+    for name, benchmark in benchmarks.items():
+        best = min(timeit.repeat(benchmark, repeat=repeat, number=number)) / number
+        print(f"{name:>24}: {best * 1000:.3f} ms per page")
+
+
+if __name__ == "__main__":
+    sys.path.append(os.getcwd())
+    main()
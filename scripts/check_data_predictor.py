@@ -8,11 +8,12 @@ from dotenv import load_dotenv
 
 
 class TestPredictorDAL:
-    async def get_event_amounts(self) -> list[tuple[datetime, int]]:
+    async def get_event_amounts(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, int]]:
         data = []
-        start_date = datetime.now()
-        date = start_date
-        for _ in range(1000):
+        date = start
+        while date < end:
             item = (date, randint(100, 1200))
             data.append(item)
             date += timedelta(days=1)
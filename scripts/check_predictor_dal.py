@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+from datetime import datetime, timedelta
 
 from dotenv import load_dotenv
 
@@ -20,7 +21,8 @@ async def main() -> None:
     )
     dal = PredictorDAL(db_sessionmaker)
 
-    result = await dal.get_event_amounts()
+    start = datetime.now()
+    result = await dal.get_event_amounts(start=start, end=start + timedelta(days=730))
     print(result[:15])
 
 
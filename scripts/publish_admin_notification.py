@@ -26,6 +26,7 @@ async def main() -> None:
     if not msg:
         msg = "Here's my message"
     await publisher.send_message(data={"message": msg}, type_=MessageType.notification)
+    await publisher.close()
 
 
 if __name__ == "__main__":
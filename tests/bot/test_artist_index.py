@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable
+from uuid import UUID, uuid4
+
+from band_tracker.bot.helpers.artist_index import ArtistSearchIndex
+from band_tracker.core.artist import ArtistPreview
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_bot import BotDAL
+from band_tracker.db.dal_update import UpdateDAL
+
+
+class ArtistIndexDALMock:
+    def __init__(self) -> None:
+        self.aliases: list[tuple[str, UUID, datetime]] = []
+        self.previews: dict[UUID, ArtistPreview] = {}
+
+    def add(self, alias: str, preview: ArtistPreview, added_at: datetime) -> None:
+        self.aliases.append((alias, preview.id, added_at))
+        self.previews[preview.id] = preview
+
+    async def iter_aliases(
+        self, added_after: datetime | None = None, batch_size: int = 10000
+    ) -> AsyncIterator[list[tuple[str, UUID, datetime]]]:
+        yield [
+            alias
+            for alias in self.aliases
+            if added_after is None or alias[2] > added_after
+        ]
+
+    async def get_artist_previews(self, ids: list[UUID]) -> list[ArtistPreview]:
+        return [self.previews[id] for id in ids if id in self.previews]
+
+
+class TestArtistSearchIndex:
+    async def test_search(
+        self,
+        update_dal: UpdateDAL,
+        bot_dal: BotDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        gosha, clara, anton = [
+            get_artist_update(name) for name in ["gosha", "clara", "anton"]
+        ]
+        gosha.aliases.append("goshturbator")
+        anton.aliases.append("anturbator")
+        for artist in gosha, clara, anton:
+            await update_dal._add_artist(artist)
+
+        index = ArtistSearchIndex(bot_dal)
+        assert index.search("gos") is None
+
+        await index.refresh()
+
+        assert index.ready
+        assert [artist.name for artist in index.search("gos") or []] == ["gosha"]
+        assert [artist.name for artist in index.search("Clarnet!") or []] == ["clara"]
+        result = index.search("turbator") or []
+        assert {artist.name for artist in result} == {"gosha", "anton"}
+        anton_preview = next(artist for artist in result if artist.name == "anton")
+        assert sorted(anton_preview.genres) == ["hip-hop", "rock"]
+        assert index.search("qwerty") == []
+        # degenerate thresholds are left to the db
+        assert index.search("a", similarity_min=0) is None
+        # as are short and unselective queries
+        assert index.search("go") is None
+        index.max_candidates = 1
+        assert index.search("turbator") is None
+
+    async def test_incremental_refresh(
+        self,
+        update_dal: UpdateDAL,
+        bot_dal: BotDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        await update_dal._add_artist(get_artist_update("gosha"))
+        index = ArtistSearchIndex(bot_dal)
+        await index.refresh()
+        aliases_number = len(index)
+
+        await update_dal._add_artist(get_artist_update("clara"))
+        await index.refresh()
+
+        assert len(index) == aliases_number + 3
+        assert [artist.name for artist in index.search("clara") or []] == ["clara"]
+
+    async def test_memory_limit(
+        self,
+        update_dal: UpdateDAL,
+        bot_dal: BotDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        await update_dal._add_artist(get_artist_update("gosha"))
+        index = ArtistSearchIndex(bot_dal, max_memory=1024)
+
+        await index.refresh()
+
+        # the index is dropped instead of being kept around unused
+        assert index.overflow and not index.ready
+        assert len(index) == 0 and index.memory == 0
+        assert index.search("gos") is None
+
+    async def test_previews_reloaded(self) -> None:
+        dal = ArtistIndexDALMock()
+        artist_id = uuid4()
+        dal.add(
+            "gosha",
+            ArtistPreview(id=artist_id, name="gosha", image=None),
+            added_at=datetime.now() - timedelta(days=1),
+        )
+        dal.add(
+            "clara",
+            ArtistPreview(id=uuid4(), name="clara", image=None),
+            added_at=datetime.now(),
+        )
+        index = ArtistSearchIndex(dal)
+        await index.refresh()
+
+        dal.previews[artist_id] = ArtistPreview(id=artist_id, name="gosha", image="a")
+        await index.refresh()
+        assert [preview.image for preview in index.search("gosha") or []] == [None]
+
+        index.invalidate([artist_id])
+        await index.refresh()
+        assert [preview.image for preview in index.search("gosha") or []] == ["a"]
+
+        dal.previews[artist_id] = ArtistPreview(id=artist_id, name="gosha", image="b")
+        index.preview_ttl = timedelta(0)
+        await index.refresh()
+        assert [preview.image for preview in index.search("gosha") or []] == ["b"]
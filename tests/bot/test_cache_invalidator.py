@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from band_tracker.bot.helpers.cache_invalidator import CacheInvalidator
+from band_tracker.db.dal_bot import BotDAL
+
+
+class TestCacheInvalidator:
+    @patch("band_tracker.bot.helpers.cache_invalidator.connect")
+    async def test_reconnect(
+        self,
+        mock_connect: AsyncMock,
+        bot_dal: BotDAL,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        queue = AsyncMock()
+        channel = AsyncMock()
+        channel.declare_queue.return_value = queue
+        connection = MagicMock()
+        connection.channel = AsyncMock(return_value=channel)
+        mock_connect.side_effect = [ConnectionError("refused"), connection]
+
+        bot_dal.artist_cache.set(uuid4(), MagicMock())
+        bot_dal.event_cache.set(uuid4(), MagicMock())
+        invalidator = CacheInvalidator(
+            bot_dal,
+            mq_url="amqp://test/",
+            mq_routing_key="invalidation",
+            exchange_name="updates",
+            retry_delay=timedelta(0),
+        )
+
+        with caplog.at_level(logging.ERROR):
+            task = asyncio.create_task(invalidator.consume())
+            for _ in range(100):
+                if invalidator.connected:
+                    break
+                await asyncio.sleep(0)
+
+            assert invalidator.connected
+            assert mock_connect.await_count == 2
+            queue.consume.assert_awaited_once_with(invalidator.on_message)
+            # messages could have been missed while disconnected
+            assert len(bot_dal.artist_cache) == 0
+            assert len(bot_dal.event_cache) == 0
+            assert "Cache invalidation consumer failed" in caplog.text
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+import pytest
+from telegram.ext import InvalidCallbackData
+
+from band_tracker.bot.helpers.callback_data import (
+    EventsCursor,
+    decode_uuid,
+    encode_uuid,
+)
+
+
+class TestCallbackData:
+    def test_uuid_round_trip(self) -> None:
+        uuid = uuid4()
+        encoded = encode_uuid(uuid)
+
+        assert len(encoded) == 22
+        assert decode_uuid(encoded) == uuid
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            EventsCursor(),
+            EventsCursor(page=1, event_id=uuid4()),
+            EventsCursor(page=3, event_id=uuid4(), backward=True),
+        ],
+    )
+    def test_cursor_round_trip(self, cursor: EventsCursor) -> None:
+        decoded = EventsCursor.decode(cursor.encode())
+
+        assert decoded == cursor
+        assert decoded.after == (None if cursor.backward else cursor.event_id)
+        assert decoded.before == (cursor.event_id if cursor.backward else None)
+
+    def test_callback_data_fits_telegram_limit(self) -> None:
+        cursor = EventsCursor(page=2**16 - 1, event_id=uuid4(), backward=True)
+        encoded = cursor.encode()
+        data = f"eventsar {encode_uuid(uuid4())} {encoded}"
+
+        assert len(encoded) == 26
+        assert len(data.encode()) <= 64
+
+    @pytest.mark.parametrize("data", ["", "AAE", "AAEB" + "A" * 10, "!!!!"])
+    def test_malformed_cursor(self, data: str) -> None:
+        with pytest.raises(InvalidCallbackData):
+            EventsCursor.decode(data)
+
+    @pytest.mark.parametrize("data", ["", "short", "A" * 23, "A"])
+    def test_malformed_uuid(self, data: str) -> None:
+        with pytest.raises(InvalidCallbackData):
+            decode_uuid(data)
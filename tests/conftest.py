@@ -16,9 +16,11 @@ from band_tracker.core.user import RawUser
 from band_tracker.core.user_settings import UserSettings
 from band_tracker.db.artist_update import ArtistUpdate
 from band_tracker.db.dal_bot import BotDAL
+from band_tracker.db.dal_iterator import IteratorDAL
 from band_tracker.db.dal_message import MessageDAL
 from band_tracker.db.dal_update import UpdateDAL
 from band_tracker.db.event_update import EventUpdate
+from band_tracker.db.genre_cache import genre_cache
 from band_tracker.db.models import (
     ArtistDB,
     ArtistTMDataDB,
@@ -49,12 +51,17 @@ async def clean_tables(sync_engine: Engine) -> AsyncGenerator:
         "artist_socials",
         "artist_alias",
         "message",
+        "chunk_plan",
+        "iterator_checkpoint",
+        "daily_event_count",
+        "artist_names",
     ]
     tables_str = ", ".join(table_names)
     command = f"TRUNCATE TABLE {tables_str};"
     with sync_engine.connect() as connection:
         connection.execute(text(command))
         connection.commit()
+    genre_cache.clear()
 
 
 @pytest.fixture(scope="session")
@@ -279,9 +286,18 @@ def message_dal(sessionmaker: AsyncSessionmaker) -> MessageDAL:
     return dal
 
 
+@pytest.fixture(scope="class")
+def iterator_dal(sessionmaker: AsyncSessionmaker) -> IteratorDAL:
+    dal = IteratorDAL(sessionmaker)
+    return dal
+
+
 @pytest.fixture(scope="class")
 def bot_dal(sessionmaker: AsyncSessionmaker) -> BotDAL:
-    dal = BotDAL(sessionmaker)
+    # tables are cleaned after every test, cached results would outlive them
+    dal = BotDAL(
+        sessionmaker, search_cache_size=0, entity_cache_size=0, user_cache_size=0
+    )
     return dal
 
 
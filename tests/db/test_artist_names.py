@@ -0,0 +1,21 @@
+from band_tracker.db.dal_update import UpdateDAL as DAL
+
+
+class TestExternalArtistNames:
+    async def test_names_deduplicated(self, update_dal: DAL) -> None:
+        added = await update_dal.bulk_add_external_artist_names(
+            ["Anton", " Anton ", "Clara  Schumann", "Clara Schumann", "  "],
+            batch_size=2,
+        )
+        assert added == 2
+        names = await update_dal.get_external_artist_names()
+        assert sorted(names) == ["Anton", "Clara Schumann"]
+
+    async def test_rerun_skips_present_names(self, update_dal: DAL) -> None:
+        await update_dal.bulk_add_external_artist_names(["Anton", "Clara"])
+        added = await update_dal.bulk_add_external_artist_names(["Clara", "Gosha"])
+        assert added == 1
+        await update_dal.add_external_artist_name("Gosha")
+
+        names = await update_dal.get_external_artist_names()
+        assert sorted(names) == ["Anton", "Clara", "Gosha"]
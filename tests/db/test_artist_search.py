@@ -5,6 +5,7 @@ import pytest
 from band_tracker.db.artist_update import ArtistUpdate
 from band_tracker.db.dal_bot import BotDAL
 from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.db.session import AsyncSessionmaker
 
 
 class TestArtistTextSearch:
@@ -54,6 +55,28 @@ class TestArtistTextSearch:
         result = [artist.name for artist in result_artists]
         assert set(result) == set(["gosha", "anton"])
 
+    async def test_search_results_cached(
+        self,
+        update_dal: UpdateDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+        sessionmaker: AsyncSessionmaker,
+    ) -> None:
+        bot_dal = BotDAL(sessionmaker)
+        await update_dal._add_artist(get_artist_update("gosha"))
+
+        assert [artist.name for artist in await bot_dal.search_artist("gos")] == [
+            "gosha"
+        ]
+        await update_dal._add_artist(get_artist_update("anton"))
+        # normalized query is served from the cache
+        result = await bot_dal.search_artist(" Gos! ")
+        assert [artist.name for artist in result] == ["gosha"]
+        assert bot_dal.search_cache.hits == 1
+
+        bot_dal.invalidate_search()
+        result = await bot_dal.search_artist("a", similarity_min=-1)
+        assert {artist.name for artist in result} == {"gosha", "anton"}
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,93 @@
+from typing import Callable
+
+from band_tracker.core.user import RawUser
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_bot import BotDAL
+from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.db.event_update import EventUpdate
+from band_tracker.db.session import AsyncSessionmaker
+
+
+class TestBotDALCache:
+    async def test_artist_read_through(
+        self,
+        update_dal: UpdateDAL,
+        sessionmaker: AsyncSessionmaker,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        bot_dal = BotDAL(sessionmaker)
+        artist = get_artist_update("anton")
+        artist_id = await update_dal.update_artist(artist)
+
+        cached = await bot_dal.get_artist(artist_id)
+        assert cached and cached.name == "anton"
+
+        artist.name = "antonio"
+        await update_dal.update_artist(artist)
+        assert await bot_dal.get_artist(artist_id) is cached
+        assert bot_dal.artist_cache.hits == 1
+
+        bot_dal.invalidate(artist_ids=[artist_id])
+        updated = await bot_dal.get_artist(artist_id)
+        assert updated and updated.name == "antonio"
+
+    async def test_event_read_through(
+        self,
+        update_dal: UpdateDAL,
+        sessionmaker: AsyncSessionmaker,
+        get_event_update: Callable[[str], EventUpdate],
+    ) -> None:
+        bot_dal = BotDAL(sessionmaker)
+        event = get_event_update("concert")
+        event_id, _ = await update_dal.update_event(event)
+
+        cached = await bot_dal.get_event(event_id)
+        assert cached and cached.title == "concert"
+
+        event.title = "gig"
+        await update_dal.update_event(event)
+        assert await bot_dal.get_event(event_id) is cached
+
+        bot_dal.invalidate(event_ids=[event_id])
+        updated = await bot_dal.get_event(event_id)
+        assert updated and updated.title == "gig"
+
+    async def test_user_invalidated_on_follow(
+        self,
+        user: Callable[[int, str], RawUser],
+        update_dal: UpdateDAL,
+        sessionmaker: AsyncSessionmaker,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        bot_dal = BotDAL(sessionmaker)
+        artist_id = await update_dal.update_artist(get_artist_update("anton"))
+        await bot_dal.add_user(user(1, "user1"))
+
+        cached = await bot_dal.get_user(1)
+        assert cached and cached.follows == {}
+        assert await bot_dal.get_user(1) is cached
+
+        await bot_dal.add_follow(user_tg_id=1, artist_id=artist_id)
+        followed = await bot_dal.get_user(1)
+        assert followed and list(followed.follows) == [artist_id]
+
+        await bot_dal.unfollow(user_tg_id=1, artist_id=artist_id)
+        unfollowed = await bot_dal.get_user(1)
+        assert unfollowed and unfollowed.follows == {}
+
+    async def test_user_without_follows(
+        self,
+        user: Callable[[int, str], RawUser],
+        update_dal: UpdateDAL,
+        bot_dal: BotDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        artist_id = await update_dal.update_artist(get_artist_update("anton"))
+        await bot_dal.add_user(user(1, "user1"))
+        await bot_dal.add_follow(user_tg_id=1, artist_id=artist_id)
+
+        short = await bot_dal.get_user(1, follows=False)
+        assert short and short.tg_id == 1 and short.follows == {}
+
+        full = await bot_dal.get_user(1)
+        assert full and list(full.follows) == [artist_id]
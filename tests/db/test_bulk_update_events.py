@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Callable
+
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_update import UpdateDAL as DAL
+from band_tracker.db.event_update import EventUpdate
+
+
+class TestBulkUpdateEventsDAL:
+    async def test_events_added(
+        self,
+        update_dal: DAL,
+        get_event_update: Callable[[str], EventUpdate],
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        concert = get_event_update("concert")
+        fest = get_event_update("fest")
+        fest.artists = [get_artist_update("anton"), get_artist_update("clara")]
+
+        result = await update_dal.bulk_update_events([concert, fest])
+
+        concert_db = await update_dal._get_event_by_tm_id("concert_tm_id")
+        fest_db = await update_dal._get_event_by_tm_id("fest_tm_id")
+        assert concert_db and fest_db
+        assert [uuid for uuid, _ in result] == [concert_db.id, fest_db.id]
+        # artists are added together with the events of the page
+        assert len(result[0][1]) == 1
+        assert len(result[1][1]) == 2
+        assert len(fest_db.artist_ids) == 2
+
+        anton = await update_dal.get_artist_by_tm_id("anton_tm_id")
+        assert anton
+        assert anton.socials.instagram == "https://anton_inst.com"
+        assert sorted(anton.genres) == ["hip-hop", "rock"]
+
+    async def test_events_updated(
+        self,
+        update_dal: DAL,
+        get_event_update: Callable[[str], EventUpdate],
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        anton = get_artist_update("anton")
+        anton.description = "anton description"
+        await update_dal._add_artist(anton)
+        await update_dal._add_artist(get_artist_update("clara"))
+
+        fest = get_event_update("fest")
+        first_result = await update_dal.bulk_update_events([fest])
+
+        fest.title = "new fest"
+        fest.sales.sale_start = datetime(8045, 4, 5)
+        second_result = await update_dal.bulk_update_events([fest, fest])
+
+        assert len(first_result[0][1]) == 2
+        assert second_result == [(first_result[0][0], [])]
+
+        fest_db = await update_dal._get_event_by_tm_id("fest_tm_id")
+        assert fest_db
+        assert fest_db.title == "new fest"
+        assert fest_db.sales.sale_start == datetime(8045, 4, 5)
+        assert len(fest_db.artist_ids) == 2
+
+        # artists embedded into events have no descriptions
+        anton_db = await update_dal.get_artist_by_tm_id("anton_tm_id")
+        assert anton_db
+        assert anton_db.description == "anton description"
+
+    async def test_genres_shared(
+        self,
+        update_dal: DAL,
+        get_event_update: Callable[[str], EventUpdate],
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        await update_dal._add_artist(get_artist_update("anton"))
+        concert = get_event_update("concert")
+        clara = get_artist_update("clara")
+        clara.genres = ["rock"]
+        concert.artists = [clara]
+
+        await update_dal.bulk_update_events([concert])
+
+        clara_db = await update_dal.get_artist_by_tm_id("clara_tm_id")
+        assert clara_db
+        assert clara_db.genres == ["rock"]
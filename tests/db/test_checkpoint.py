@@ -0,0 +1,23 @@
+from uuid import uuid4
+
+from band_tracker.db.dal_iterator import IteratorDAL
+
+
+class TestCheckpoint:
+    async def test_no_checkpoint(self, iterator_dal: IteratorDAL) -> None:
+        assert await iterator_dal.get_checkpoint() is None
+
+    async def test_checkpoint_overwritten(self, iterator_dal: IteratorDAL) -> None:
+        run_id = uuid4()
+        await iterator_dal.save_checkpoint(run_id, {"chunks": [1]})
+        await iterator_dal.save_checkpoint(run_id, {"chunks": [1, 2]})
+
+        assert await iterator_dal.get_checkpoint() == (run_id, {"chunks": [1, 2]})
+
+    async def test_finished_run_not_resumed(self, iterator_dal: IteratorDAL) -> None:
+        old_run_id = uuid4()
+        await iterator_dal.save_checkpoint(old_run_id, {"chunks": [1]})
+        run_id = uuid4()
+        await iterator_dal.save_checkpoint(run_id, {"chunks": [2]}, finished=True)
+
+        assert await iterator_dal.get_checkpoint() is None
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from band_tracker.db.dal_iterator import IteratorDAL
+from band_tracker.updater.chunk_plan import ChunkPlan
+
+
+class TestChunkPlan:
+    async def test_plan_saved_and_loaded(self, iterator_dal: IteratorDAL) -> None:
+        now = datetime.now().replace(microsecond=0)
+        chunks = [
+            (now, now + timedelta(days=3), "", 4, 700),
+            (now + timedelta(days=3), now + timedelta(days=3), "US", 5, 900),
+            (now + timedelta(days=3), now + timedelta(days=3), "GB", 2, 300),
+        ]
+        await iterator_dal.save_chunk_plan(chunks)
+
+        plan = ChunkPlan(iterator_dal)
+        await plan.load()
+
+        assert len(plan.windows) == 2
+        assert plan.end_for(now + timedelta(hours=1)) == now + timedelta(days=3)
+        assert plan.end_for(now + timedelta(days=3)) == now + timedelta(days=3)
+        assert plan.end_for(now + timedelta(days=4)) is None
+        assert plan.countries() == {"US": 900, "GB": 300}
+
+    async def test_plan_replaced(self, iterator_dal: IteratorDAL) -> None:
+        now = datetime.now().replace(microsecond=0)
+        await iterator_dal.save_chunk_plan([(now, now + timedelta(days=1), "", 1, 5)])
+        await iterator_dal.save_chunk_plan([(now, now + timedelta(days=2), "", 1, 9)])
+
+        chunks = await iterator_dal.get_chunk_plan(now - timedelta(days=1))
+
+        assert chunks == [(now, now + timedelta(days=2), "", 1, 9)]
+
+    async def test_expired_plan_ignored(self, iterator_dal: IteratorDAL) -> None:
+        now = datetime.now()
+        past = now - timedelta(days=1)
+        await iterator_dal.save_chunk_plan(
+            [
+                (past - timedelta(days=1), past, "", 1, 5),
+                (now, now + timedelta(days=1), "", 1, 5),
+            ]
+        )
+
+        plan = ChunkPlan(iterator_dal)
+        await plan.load()
+        assert len(plan.windows) == 1
+
+        plan = ChunkPlan(iterator_dal, max_age=timedelta(0))
+        await plan.load()
+        assert plan.windows == []
@@ -0,0 +1,52 @@
+from datetime import date, datetime
+from typing import Callable
+
+from band_tracker.db.dal_predictor import PredictorDAL
+from band_tracker.db.dal_update import UpdateDAL as DAL
+from band_tracker.db.event_update import EventUpdate
+from band_tracker.db.session import AsyncSessionmaker
+
+
+class TestDailyEventCount:
+    async def test_counts_refreshed(
+        self,
+        update_dal: DAL,
+        sessionmaker: AsyncSessionmaker,
+        get_event_update: Callable[[str], EventUpdate],
+    ) -> None:
+        predictor_dal = PredictorDAL(sessionmaker)
+        await update_dal.bulk_update_events(
+            [get_event_update(name) for name in ("concert", "fest", "eurovision")]
+        )
+        await update_dal.refresh_daily_event_counts(since=date(2024, 5, 1))
+
+        amounts = await predictor_dal.get_event_amounts(
+            start=datetime(2024, 1, 1), end=datetime(2026, 1, 1)
+        )
+        # days before `since` are not counted
+        assert amounts == [(datetime(2024, 5, 23), 1), (datetime(2025, 4, 23), 1)]
+
+        amounts = await predictor_dal.get_event_amounts(
+            start=datetime(2024, 1, 1), end=datetime(2025, 4, 23)
+        )
+        assert amounts == [(datetime(2024, 5, 23), 1)]
+
+    async def test_moved_events_recounted(
+        self,
+        update_dal: DAL,
+        sessionmaker: AsyncSessionmaker,
+        get_event_update: Callable[[str], EventUpdate],
+    ) -> None:
+        predictor_dal = PredictorDAL(sessionmaker)
+        concert, fest = get_event_update("concert"), get_event_update("fest")
+        await update_dal.bulk_update_events([concert, fest])
+        await update_dal.refresh_daily_event_counts(since=date(2024, 1, 1))
+
+        concert.date = fest.date
+        await update_dal.bulk_update_events([concert])
+        await update_dal.refresh_daily_event_counts(since=date(2024, 1, 1))
+
+        amounts = await predictor_dal.get_event_amounts(
+            start=datetime(2024, 1, 1), end=datetime(2026, 1, 1)
+        )
+        assert amounts == [(fest.date, 2)]
@@ -0,0 +1,67 @@
+from typing import Callable
+
+from sqlalchemy import func, select
+
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_update import UpdateDAL as DAL
+from band_tracker.db.models import ArtistAliasDB, GenreDB
+
+
+class TestGenreCacheDAL:
+    async def test_genres_cached_after_commit(
+        self,
+        update_dal: DAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        await update_dal.update_artist(get_artist_update("anton"))
+
+        known, missing = update_dal.genre_cache.get({"rock", "hip-hop", "jazz"})
+        assert set(known) == {"rock", "hip-hop"}
+        assert missing == {"jazz"}
+
+        async with update_dal.sessionmaker.session() as session:
+            genres = await session.execute(select(GenreDB.name, GenreDB.id))
+            assert dict(genres.all()) == known
+
+    async def test_genres_shared_between_artists(
+        self,
+        update_dal: DAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        anton = get_artist_update("anton")
+        clara = get_artist_update("clara")
+        clara.genres = ["rock", "pop"]
+        await update_dal.update_artist(anton)
+        await update_dal.update_artist(clara)
+        # repeated update does not duplicate genres
+        await update_dal.update_artist(clara)
+
+        anton_db = await update_dal.get_artist_by_tm_id("anton_tm_id")
+        clara_db = await update_dal.get_artist_by_tm_id("clara_tm_id")
+        assert anton_db and clara_db
+        assert sorted(anton_db.genres) == ["hip-hop", "rock"]
+        assert sorted(clara_db.genres) == ["pop", "rock"]
+
+        async with update_dal.sessionmaker.session() as session:
+            genres_number = await session.scalar(select(func.count(GenreDB.id)))
+            assert genres_number == 3
+
+    async def test_taken_aliases_skipped(
+        self,
+        update_dal: DAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        anton = get_artist_update("anton")
+        clara = get_artist_update("clara")
+        clara.aliases = ["toha", "clarissa"]
+        anton_id = await update_dal.update_artist(anton)
+        clara_id = await update_dal.update_artist(clara)
+
+        async with update_dal.sessionmaker.session() as session:
+            aliases = await session.execute(
+                select(ArtistAliasDB.alias, ArtistAliasDB.artist_id)
+            )
+            owners = dict(aliases.all())
+        assert owners["toha"] == anton_id
+        assert owners["clarissa"] == clara_id
+        assert owners["clara"] == clara_id
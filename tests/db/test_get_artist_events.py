@@ -29,7 +29,7 @@ async def test_returns_required_events(
     for event in events:
         update_event = get_event_update(event)
         await update_dal._add_event(update_event)
-    result = await bot_dal.get_events_for_artist(artist_id=clara_artist_id, page=0)
+    result = await bot_dal.get_events_for_artist(artist_id=clara_artist_id)
 
     assert len(result) == 2
     assert result[0].title == "fest" or result[1].title == "fest"
@@ -54,16 +54,18 @@ async def test_pagination(
         update_event = get_event_update(event)
         await update_dal._add_event(update_event)
     result1 = await bot_dal.get_events_for_artist(
-        artist_id=clara_artist_id, events_per_page=1, page=0
+        artist_id=clara_artist_id, events_per_page=1
     )
     result2 = await bot_dal.get_events_for_artist(
-        artist_id=clara_artist_id, events_per_page=1, page=1
+        artist_id=clara_artist_id, events_per_page=1, after=result1[-1].id
+    )
+    previous = await bot_dal.get_events_for_artist(
+        artist_id=clara_artist_id, events_per_page=1, before=result2[0].id
     )
 
-    assert len(result1) == 1
-    assert len(result2) == 1
-    assert result1[0].title == "fest" or result2[0].title == "fest"
-    assert result1[0].title == "eurovision" or result2[0].title == "eurovision"
+    assert [event.title for event in result1] == ["eurovision"]
+    assert [event.title for event in result2] == ["fest"]
+    assert previous == result1
 
 
 if __name__ == "__main__":
@@ -61,13 +61,74 @@ async def test_pagination(
     for event in events:
         update_event = get_event_update(event)
         await update_dal._add_event(update_event)
-    result1 = await bot_dal.get_events_for_user(user_tg_id=1, events_per_page=1, page=0)
-    result2 = await bot_dal.get_events_for_user(user_tg_id=1, events_per_page=1, page=1)
+    result1 = await bot_dal.get_events_for_user(user_tg_id=1, events_per_page=1)
+    result2 = await bot_dal.get_events_for_user(
+        user_tg_id=1, events_per_page=1, after=result1[-1].id
+    )
+    result3 = await bot_dal.get_events_for_user(
+        user_tg_id=1, events_per_page=1, after=result2[-1].id
+    )
+    previous = await bot_dal.get_events_for_user(
+        user_tg_id=1, events_per_page=1, before=result2[0].id
+    )
 
-    assert len(result1) == 1
-    assert len(result2) == 1
-    assert result1[0].title == "fest" or result2[0].title == "fest"
-    assert result1[0].title == "eurovision" or result2[0].title == "eurovision"
+    # events are ordered by their start date
+    assert [event.title for event in result1] == ["eurovision"]
+    assert [event.title for event in result2] == ["fest"]
+    assert result3 == []
+    assert previous == result1
+
+
+async def test_events_not_duplicated(
+    update_dal: UpdateDAL,
+    get_artist_update: Callable[[str], ArtistUpdate],
+    bot_dal: BotDAL,
+    user: UserFixture,
+    get_event_update: Callable[[str], EventUpdate],
+) -> None:
+    added_user = user(1, "user1")
+    await bot_dal.add_user(added_user)
+    for artist in ["anton", "clara"]:
+        artist_id = await update_dal._add_artist(get_artist_update(artist))
+        await bot_dal.add_follow(user_tg_id=added_user.tg_id, artist_id=artist_id)
+    # fest is performed by both followed artists
+    await update_dal._add_event(get_event_update("fest"))
+
+    result = await bot_dal.get_events_for_user(user_tg_id=1)
+
+    assert [event.title for event in result] == ["fest"]
+    assert await bot_dal.get_user_events_amount(user_tg_id=1) == 1
+
+
+async def test_events_page(
+    update_dal: UpdateDAL,
+    get_artist_update: Callable[[str], ArtistUpdate],
+    bot_dal: BotDAL,
+    user: UserFixture,
+    get_event_update: Callable[[str], EventUpdate],
+) -> None:
+    clara_artist_id = await update_dal._add_artist(get_artist_update("clara"))
+    added_user = user(1, "user1")
+    await bot_dal.add_user(added_user)
+    await bot_dal.add_follow(user_tg_id=added_user.tg_id, artist_id=clara_artist_id)
+    for event in ["concert", "fest", "eurovision"]:
+        await update_dal._add_event(get_event_update(event))
+
+    page1 = await bot_dal.get_user_events_page(user_tg_id=1, events_per_page=1)
+    page2 = await bot_dal.get_user_events_page(
+        user_tg_id=1, events_per_page=1, after=page1.events[-1].id
+    )
+    previous = await bot_dal.get_user_events_page(
+        user_tg_id=1, events_per_page=1, before=page2.events[0].id
+    )
+    whole = await bot_dal.get_user_events_page(user_tg_id=1, events_per_page=2)
+
+    assert [event.title for event in page1.events] == ["eurovision"]
+    assert page1.has_next
+    assert [event.title for event in page2.events] == ["fest"]
+    assert not page2.has_next
+    assert previous == page1
+    assert not whole.has_next
 
 
 if __name__ == "__main__":
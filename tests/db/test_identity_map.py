@@ -0,0 +1,69 @@
+from typing import Callable
+
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_update import UpdateDAL as DAL
+from band_tracker.db.event_update import EventUpdate
+
+
+class TestIdentityMapDAL:
+    async def test_map_loaded_and_extended(
+        self,
+        update_dal: DAL,
+        get_event_update: Callable[[str], EventUpdate],
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        anton_id = await update_dal.update_artist(get_artist_update("anton"))
+
+        async with update_dal.identity_map_scope() as identity_map:
+            assert identity_map.artists == {"anton_tm_id": anton_id}
+            assert identity_map.events == {}
+
+            fest = get_event_update("fest")
+            fest.artists = [get_artist_update("clara")]
+            [(fest_id, _)] = await update_dal.bulk_update_events([fest])
+
+            assert identity_map.events == {"fest_tm_id": fest_id}
+            assert set(identity_map.artists) == {"anton_tm_id", "clara_tm_id"}
+
+        assert update_dal.identity_map is None
+
+    async def test_lookups_served_from_map(
+        self,
+        update_dal: DAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        anton_id = await update_dal.update_artist(get_artist_update("anton"))
+
+        async with update_dal.identity_map_scope() as identity_map:
+            # a stale entry is trusted without a query to the db
+            identity_map.artists["ghost_tm_id"] = anton_id
+            ids = await update_dal.get_artist_ids(["anton_tm_id", "ghost_tm_id"])
+            assert ids == {"anton_tm_id": anton_id, "ghost_tm_id": anton_id}
+
+        assert await update_dal.get_artist_ids(["ghost_tm_id"]) == {}
+
+    async def test_event_linked_through_map(
+        self,
+        update_dal: DAL,
+        get_event_update: Callable[[str], EventUpdate],
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        async with update_dal.identity_map_scope():
+            event_id, _ = await update_dal.update_event(get_event_update("concert"))
+            await update_dal.update_artist(get_artist_update("clara"))
+
+            linked = await update_dal._link_event_to_artists(
+                "concert_tm_id", ["clara_tm_id", "unknown_tm_id"]
+            )
+            assert len(linked) == 1
+            # repeated links are ignored
+            assert (
+                await update_dal._link_event_to_artists(
+                    "concert_tm_id", ["clara_tm_id"]
+                )
+                == []
+            )
+
+        event = await update_dal._get_event_by_tm_id("concert_tm_id")
+        assert event and event.id == event_id
+        assert len(event.artist_ids) == 2
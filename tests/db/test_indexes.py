@@ -0,0 +1,59 @@
+from uuid import uuid4
+
+from sqlalchemy import Select, select, text
+from sqlalchemy.dialects import postgresql
+
+from band_tracker.core.enums import MessageType
+from band_tracker.db.dal_bot import BotDAL
+from band_tracker.db.models import EventArtistDB, EventDB, MessageDB
+from band_tracker.db.session import AsyncSessionmaker
+
+
+async def explain(sessionmaker: AsyncSessionmaker, stmt: Select) -> str:
+    """
+    Plan of a statement with sequential and bitmap scans discouraged,
+    so that the tiny test tables are read with the best matching index
+    """
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with sessionmaker.session() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        rows = await session.execute(text(f"EXPLAIN {sql}"))
+        return "\n".join(row[0] for row in rows)
+
+
+class TestIndexes:
+    async def test_events_feed_keyset(self, sessionmaker: AsyncSessionmaker) -> None:
+        stmt = BotDAL._keyset_page(select(EventDB.id), after=uuid4()).limit(6)
+        plan = await explain(sessionmaker, stmt)
+        assert "ix_event_start_date_id" in plan
+
+    async def test_followed_events(self, sessionmaker: AsyncSessionmaker) -> None:
+        stmt = BotDAL._followed_events(select(EventDB.id), user_tg_id=1)
+        plan = await explain(sessionmaker, stmt)
+        assert "Index Only Scan using ix_follow_user_id_active" in plan
+
+    async def test_artist_events(self, sessionmaker: AsyncSessionmaker) -> None:
+        stmt = BotDAL._artist_events(select(EventDB.id), artist_id=uuid4())
+        plan = await explain(sessionmaker, stmt)
+        assert "event_artist_artist_id_event_id_key" in plan
+
+    async def test_event_artists(self, sessionmaker: AsyncSessionmaker) -> None:
+        # shape of loading `EventDB.artists` for a page of events
+        stmt = select(EventArtistDB.event_id, EventArtistDB.artist_id).where(
+            EventArtistDB.event_id.in_([uuid4(), uuid4()])
+        )
+        plan = await explain(sessionmaker, stmt)
+        assert "Index Only Scan using ix_event_artist_event_id_artist_id" in plan
+
+    async def test_active_user_messages(self, sessionmaker: AsyncSessionmaker) -> None:
+        stmt = (
+            select(MessageDB.tg_message_id)
+            .where(MessageDB.user_id == uuid4())
+            .where(MessageDB.active)
+            .where(MessageDB.message_type.not_in([MessageType.NOTIFICATION]))
+        )
+        plan = await explain(sessionmaker, stmt)
+        assert "ix_message_user_id_active" in plan
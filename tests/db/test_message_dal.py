@@ -89,3 +89,28 @@ async def test_works_with_multiple_users(
     assert len(result) == 1
     assert 3 in result
     assert 4 not in result
+
+
+async def test_replace_keeps_new_message(
+    message_dal: MessageDAL, user: UserFixture, bot_dal: BotDAL
+) -> None:
+    added_user = await bot_dal.add_user(user(1, "user"))
+
+    await message_dal.register_message(
+        message_type=MessageType.AMP, user_id=added_user.id, message_tg_id=3
+    )
+    await message_dal.register_message(
+        message_type=MessageType.NOTIFICATION, user_id=added_user.id, message_tg_id=4
+    )
+    replaced = await message_dal.replace_user_messages(
+        user_id=added_user.id,
+        no_delete=NO_DELETE,
+        message_type=MessageType.MENU,
+        message_tg_id=5,
+    )
+    assert replaced == [3]
+
+    result = await message_dal.delete_user_messages(
+        user_id=added_user.id, no_delete=NO_DELETE
+    )
+    assert result == [5]
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import timedelta
+from typing import AsyncGenerator, Callable
+
+import pytest_asyncio
+from sqlalchemy import text
+
+from band_tracker.config.env_loader import DBEnvVars
+from band_tracker.core.user import RawUser
+from band_tracker.db.dal_bot import BotDAL
+from band_tracker.db.session import POOL_PRESETS, AsyncSessionmaker, PoolConfig
+
+
+def test_env_overrides_preset() -> None:
+    env = DBEnvVars(
+        DB_LOGIN="login",
+        DB_PASSWORD="password",
+        DB_IP="localhost",
+        DB_PORT="5432",
+        DB_NAME="db",
+        DB_POOL_SIZE=3,
+        DB_POOL_PRE_PING=False,
+    )
+    config = POOL_PRESETS["bot"].with_env(env)
+
+    assert config.pool_size == 3
+    assert config.pool_pre_ping is False
+    assert config.max_overflow == POOL_PRESETS["bot"].max_overflow
+    assert config.statement_timeout == POOL_PRESETS["bot"].statement_timeout
+
+
+class TestSessionmakerPool:
+    async def test_pool_configured(self, db_creds: dict) -> None:
+        sessionmaker = AsyncSessionmaker(
+            **db_creds,
+            pool=PoolConfig(pool_size=2, max_overflow=0, statement_timeout=1500),
+        )
+        async with sessionmaker.session() as session:
+            timeout = await session.scalar(text("SHOW statement_timeout"))
+            assert timeout == "1500ms"
+
+            metrics = sessionmaker.metrics
+            assert metrics.size == 2
+            assert metrics.checked_out == 1
+        await sessionmaker.engine.dispose()
+
+    async def test_checkouts_counted(self, sessionmaker: AsyncSessionmaker) -> None:
+        checkouts = sessionmaker.metrics.checkouts
+        async with sessionmaker.session():
+            pass
+        async with sessionmaker.session():
+            pass
+
+        metrics = sessionmaker.metrics
+        assert metrics.checkouts == checkouts + 2
+        assert metrics.wait_max >= metrics.wait_avg >= 0
+        assert metrics.checked_out == 0
+
+
+class TestReplicaRouting:
+    @pytest_asyncio.fixture(scope="class")
+    async def replicated(self, db_creds: dict) -> AsyncGenerator:
+        # the test db stands in for its own replica
+        replica = (
+            f"postgresql://{db_creds['login']}:{db_creds['password']}"
+            f"@{db_creds['ip']}:{db_creds['port']}/{db_creds['database']}"
+        )
+        sessionmaker = AsyncSessionmaker(**db_creds, replicas=[replica])
+        yield sessionmaker
+        await sessionmaker.dispose()
+
+    async def test_reads_routed_to_replica(self, replicated: AsyncSessionmaker) -> None:
+        [replica_engine] = replicated.replica_engines
+        async with replicated.session(read_only=True) as session:
+            assert session.bind is replica_engine
+            read_only = await session.scalar(text("SHOW transaction_read_only"))
+            assert read_only == "on"
+
+        async with replicated.session() as session:
+            assert session.bind is replicated.engine
+
+    async def test_primary_scope(self, replicated: AsyncSessionmaker) -> None:
+        with replicated.primary():
+            async with replicated.session(read_only=True) as session:
+                assert session.bind is replicated.engine
+
+        async with replicated.session(read_only=True) as session:
+            assert session.bind is not replicated.engine
+
+    async def test_writer_reads_from_primary(
+        self,
+        replicated: AsyncSessionmaker,
+        user: Callable[[int, str], RawUser],
+    ) -> None:
+        bot_dal = BotDAL(replicated, replica_lag=timedelta(milliseconds=50))
+        assert bot_dal._on_replica(1)
+
+        await bot_dal.add_user(user(1, "user1"))
+        assert not bot_dal._on_replica(1)
+        assert bot_dal._on_replica(2)
+
+        await asyncio.sleep(0.1)
+        assert bot_dal._on_replica(1)
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from band_tracker.updater.updater import ClientFactory
+
+
+def get_factory(delay: float = 0.0) -> ClientFactory:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"page": {"totalPages": 1}}, request=request)
+
+    factory = ClientFactory(
+        base_url="https://test/",
+        tokens=["token"],
+        requests_per_second=100,
+        transport=httpx.MockTransport(handler),
+    )
+    return factory
+
+
+class TestApiClient:
+    async def test_clients_share_transport(self) -> None:
+        factory = get_factory()
+        events_client = factory.get_events_client()
+        artists_client = factory.get_artists_client()
+
+        assert events_client.http_client is factory.http_client
+        assert artists_client.http_client is factory.http_client
+        await factory.close()
+
+    async def test_requests_are_concurrent(self) -> None:
+        factory = get_factory(delay=0.2)
+        client = factory.get_events_client()
+        start = datetime.now()
+
+        tasks = [
+            client.make_request(start, start + timedelta(days=1), page_number=page)
+            for page in range(4)
+        ]
+        pages = await asyncio.gather(*tasks)
+        exec_time = datetime.now() - start
+
+        assert len(pages) == 4
+        assert exec_time < timedelta(seconds=0.6)
+        await factory.close()
+
+    async def test_factory_closes_transport(self) -> None:
+        factory = get_factory()
+        await factory.close()
+
+        assert factory.http_client.is_closed
+        with pytest.raises(RuntimeError):
+            await factory.get_artists_client().make_request(tm_id="id")
@@ -0,0 +1,38 @@
+from band_tracker.updater.country_history import CountryHistory
+
+COUNTRY_CODES = ["AA", "BB", "CC", "DD", "EE", "FF"]
+
+
+class TestCountryHistory:
+    def test_cold_start_probes_everything(self) -> None:
+        history = CountryHistory(COUNTRY_CODES, cold_batch=2)
+        assert history.countries_to_probe() == COUNTRY_CODES
+
+    def test_hot_countries_always_probed(self) -> None:
+        history = CountryHistory(COUNTRY_CODES, cold_batch=2)
+        history.register({"BB": 10, "EE": 5, "AA": 0})
+
+        first = history.countries_to_probe()
+        second = history.countries_to_probe()
+
+        assert first == ["AA", "BB", "CC", "EE"]
+        assert second == ["BB", "DD", "EE", "FF"]
+
+    def test_cold_countries_rotate(self) -> None:
+        history = CountryHistory(COUNTRY_CODES, cold_batch=2)
+        history.register({"AA": 1})
+
+        probed: set[str] = set()
+        for _ in range(3):
+            probed.update(history.countries_to_probe())
+
+        assert probed == set(COUNTRY_CODES)
+
+    def test_countries_cool_down(self) -> None:
+        history = CountryHistory(COUNTRY_CODES, ttl=2, cold_batch=1)
+        history.register({"AA": 1})
+        history.register({"BB": 1})
+        assert history.hot == ["AA", "BB"]
+
+        history.register({"BB": 1})
+        assert history.hot == ["BB"]
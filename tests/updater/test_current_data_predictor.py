@@ -14,8 +14,10 @@ class PredictorDALMock:
     def set_data(self, data: list[tuple[datetime, int]]) -> None:
         self.data = data
 
-    async def get_event_amounts(self) -> list[tuple[datetime, int]]:
-        return self.data
+    async def get_event_amounts(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, int]]:
+        return [item for item in self.data if start <= item[0] < end]
 
 
 predictor_start = datetime(year=2020, month=1, day=1)
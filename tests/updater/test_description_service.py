@@ -0,0 +1,153 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable
+
+import httpx
+
+from band_tracker.core.enums import EventSource
+from band_tracker.db.artist_update import ArtistUpdate
+from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.updater.description_service import DescriptionService
+from band_tracker.updater.updater import ClientFactory, Updater
+
+DESCRIPTION_URL = "https://en.wikipedia.org/wiki/Death_Grips"
+
+
+def get_service(requested_urls: list[str], ttl: timedelta) -> DescriptionService:
+    with open("tests/test_data/description_mock/normal.html", "r") as f:
+        html = f.read()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested_urls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text=html, request=request)
+
+    return DescriptionService(ttl=ttl, transport=httpx.MockTransport(handler))
+
+
+class TestDescriptionService:
+    async def test_pages_cached(self) -> None:
+        requested_urls: list[str] = []
+        service = get_service(requested_urls, ttl=timedelta(hours=1))
+
+        descriptions = await asyncio.gather(
+            *[
+                service.get_description(DESCRIPTION_URL, {"death grips"})
+                for _ in range(3)
+            ]
+        )
+        other_artist = await service.get_description(DESCRIPTION_URL, {"anton"})
+        await service.close()
+
+        assert len(requested_urls) == 1
+        assert descriptions[0] and descriptions.count(descriptions[0]) == 3
+        assert other_artist is None
+
+    async def test_expired_pages_fetched(self) -> None:
+        requested_urls: list[str] = []
+        service = get_service(requested_urls, ttl=timedelta(0))
+
+        for _ in range(2):
+            await service.get_description(DESCRIPTION_URL, {"death grips"})
+        await service.close()
+
+        assert len(requested_urls) == 2
+
+    async def test_fresh_descriptions_not_fetched(
+        self,
+        update_dal: UpdateDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        requested_urls: list[str] = []
+        service = get_service(requested_urls, ttl=timedelta(hours=1))
+        updater = Updater(
+            client_factory=ClientFactory(base_url="https://test/", tokens=["token"]),
+            dal=update_dal,
+            description_service=service,
+        )
+
+        stored_artist = get_artist_update("anton")
+        stored_artist.description = "stored description"
+        stored_artist.description_updated = datetime.now()
+        await update_dal._add_artist(stored_artist)
+        outdated_artist = get_artist_update("clara")
+        outdated_artist.description_updated = datetime.now() - timedelta(days=60)
+        await update_dal._add_artist(outdated_artist)
+
+        updates = [get_artist_update("anton"), get_artist_update("clara")]
+        for update in updates:
+            update.socials.wiki = DESCRIPTION_URL
+        await updater._set_descriptions(updates)
+        await updater.close()
+
+        assert updates[0].description == "stored description"
+        assert updates[0].description_updated is None
+        assert updates[1].description_updated is not None
+        assert len(requested_urls) == 1
+
+        tm_id = updates[1].source_specific_data[EventSource.ticketmaster_api]["id"]
+        await update_dal.update_artist(updates[1])
+        stored = await update_dal.get_descriptions([tm_id])
+        assert stored[tm_id][1] == updates[1].description_updated
+
+    async def test_failed_fetch_retried(
+        self,
+        update_dal: UpdateDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        with open("tests/test_data/description_mock/normal.html", "r") as f:
+            html = f.read()
+        requested_urls: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requested_urls.append(str(request.url))
+            # wikipedia is unavailable during the first run only
+            status = 503 if len(requested_urls) == 1 else 200
+            return httpx.Response(status, text=html, request=request)
+
+        service = DescriptionService(transport=httpx.MockTransport(handler))
+        updater = Updater(
+            client_factory=ClientFactory(base_url="https://test/", tokens=["token"]),
+            dal=update_dal,
+            description_service=service,
+        )
+
+        for _ in range(2):
+            update = get_artist_update("anton")
+            update.aliases.append("death grips")
+            update.socials.wiki = DESCRIPTION_URL
+            await updater._set_descriptions([update])
+            if len(requested_urls) == 1:
+                assert update.description is None
+                assert update.description_updated is None
+            await update_dal.update_artist(update)
+        await updater.close()
+
+        assert len(requested_urls) == 2
+        tm_id = update.source_specific_data[EventSource.ticketmaster_api]["id"]
+        stored = await update_dal.get_descriptions([tm_id])
+        assert stored[tm_id][0] and stored[tm_id][1] is not None
+
+    async def test_invalid_url_skipped(
+        self,
+        update_dal: UpdateDAL,
+        get_artist_update: Callable[[str], ArtistUpdate],
+    ) -> None:
+        requested_urls: list[str] = []
+        service = get_service(requested_urls, ttl=timedelta(hours=1))
+        updater = Updater(
+            client_factory=ClientFactory(base_url="https://test/", tokens=["token"]),
+            dal=update_dal,
+            description_service=service,
+        )
+
+        broken, valid = get_artist_update("anton"), get_artist_update("clara")
+        broken.socials.wiki = "https://en.wikipedia.org/wiki/A\x01b"
+        valid.aliases.append("death grips")
+        valid.socials.wiki = DESCRIPTION_URL
+        await updater._set_descriptions([broken, valid])
+        await updater.close()
+
+        # a broken page only affects its own artist
+        assert broken.description_updated is None
+        assert valid.description and valid.description_updated is not None
@@ -1,19 +1,51 @@
 import asyncio
+import json
 from datetime import datetime, timedelta
 from typing import Callable
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.db.errors import DALError
 from band_tracker.updater.api_client import ApiClientEvents
+from band_tracker.updater.chunk_plan import ChunkPlan, PlannedChunk
+from band_tracker.updater.country_history import CountryHistory
 from band_tracker.updater.errors import (
     InvalidResponseStructureError,
     InvalidTokenError,
     RateLimitViolation,
     UnexpectedFaultResponseError,
 )
-from band_tracker.updater.page_iterator import EventIterator
+from band_tracker.updater.page_iterator import EventIterator, EventsChunk
 from band_tracker.updater.timestamp_predictor import LinearPredictor, TimestampPredictor
+from band_tracker.updater.updater import ClientFactory, Updater
+
+
+class ChunkPlanDALMock:
+    def __init__(self) -> None:
+        self.chunks: list[PlannedChunk] = []
+
+    async def get_chunk_plan(self, updated_after: datetime) -> list[PlannedChunk]:
+        return self.chunks
+
+    async def save_chunk_plan(self, chunks: list[PlannedChunk]) -> None:
+        self.chunks = chunks
+
+
+class DaysPredictor(TimestampPredictor):
+    """Predicts a day for every 4 target entities"""
+
+    async def get_next_timestamp(
+        self, start: datetime, target_entities: int
+    ) -> datetime:
+        return start + timedelta(days=target_entities / 4)
+
+    def start(self) -> datetime:
+        return datetime.now()
+
+    async def update_params(self) -> None:
+        pass
 
 
 @patch("band_tracker.updater.api_client.ApiClientEvents.make_request")
@@ -43,7 +75,7 @@ class TestEventIterator:
         initial_max_date = iterator.max_end_time
 
         async for i in iterator:
-            pass
+            iterator.page_done(i)
 
         chunks = iterator.chunks
 
@@ -82,6 +114,302 @@ class TestEventIterator:
 
         assert len(iterator.chunks) == 2
 
+    @pytest.mark.slow
+    async def test_large_chunk_probes_learned_countries(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+        get_timestamp_predictor: Callable[[timedelta], TimestampPredictor],
+    ) -> None:
+        probed_countries: list[str] = []
+
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            await asyncio.sleep(0.1)
+            probed_countries.append(country_code)
+
+            if country_code == "US" or country_code == "BR" or country_code == "":
+                return mock_response("large_page")
+            else:
+                return mock_response("processed_page")
+
+        mock_get.side_effect = mock_make_request
+
+        predictor = get_timestamp_predictor(timedelta(days=0))
+        history = CountryHistory(cold_batch=10)
+        history.register({"US": 1, "BR": 1})
+        iterator = EventIterator(
+            self.custom_request, predictor=predictor, country_history=history
+        )
+        iterator.max_end_time += timedelta(days=731)
+
+        start_time = datetime.now()
+        async for i in iterator:
+            pass
+        exec_time = datetime.now() - start_time
+
+        assert len(iterator.chunks) == 2
+        assert "US" in probed_countries and "BR" in probed_countries
+        # hot countries and a batch of cold ones, probed concurrently
+        probed_country_codes = {code for code in probed_countries if code}
+        assert len(probed_country_codes) == 2 + 10
+        assert exec_time < timedelta(seconds=1)
+
+    async def test_cold_country_outside_batch(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+    ) -> None:
+        probed_countries: list[str] = []
+
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            probed_countries.append(country_code)
+            if country_code == "AA":
+                return mock_response("page1")
+            if country_code == "FF":
+                return mock_response("large_page")
+            return mock_response("processed_page")
+
+        mock_get.side_effect = mock_make_request
+
+        history = CountryHistory(["AA", "BB", "CC", "DD", "EE", "FF"], cold_batch=1)
+        history.register({"AA": 1})
+        iterator = EventIterator(
+            self.custom_request, predictor=DaysPredictor(), country_history=history
+        )
+        large_chunk = EventsChunk(
+            pages_number=1,
+            start_datetime=datetime.now(),
+            end_datetime=datetime.now() + timedelta(days=1),
+            entities_number=1001,
+        )
+
+        await iterator._process_large_chunk(large_chunk)
+
+        # events missing from the hot countries and the cold batch are looked up
+        # in the rest of the countries
+        assert sorted(probed_countries) == ["AA", "BB", "CC", "DD", "EE", "FF"]
+        assert {chunk.country_code for chunk in iterator.chunks} == {"AA", "FF"}
+        assert "FF" in history.hot
+
+    async def test_unlocated_events_probed_once(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+    ) -> None:
+        probed_countries: list[str] = []
+
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            probed_countries.append(country_code)
+            if country_code == "AA":
+                return mock_response("page1")
+            return mock_response("processed_page")
+
+        mock_get.side_effect = mock_make_request
+
+        history = CountryHistory(["AA", "BB", "CC", "DD", "EE", "FF"], cold_batch=1)
+        history.register({"AA": 1})
+        iterator = EventIterator(
+            self.custom_request, predictor=DaysPredictor(), country_history=history
+        )
+
+        def large_chunk() -> EventsChunk:
+            return EventsChunk(
+                pages_number=1,
+                start_datetime=datetime.now(),
+                end_datetime=datetime.now() + timedelta(days=1),
+                entities_number=1001,
+            )
+
+        await iterator._process_large_chunk(large_chunk())
+        # no country holds the rest of the events
+        assert len(probed_countries) == 6
+        assert history.unlocated == 1001 - 5
+
+        probed_countries.clear()
+        await iterator._process_large_chunk(large_chunk())
+        # the same gap does not trigger probing of all countries again
+        assert len(probed_countries) == 2
+
+    async def test_chunk_plan_reused(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+    ) -> None:
+        requests: list[tuple[datetime, datetime]] = []
+
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            requests.append((start_date, end_date))
+            # windows longer than 100 days are over the api limit
+            if end_date - start_date > timedelta(days=100):
+                return mock_response("large_page")
+            return mock_response("page1")
+
+        mock_get.side_effect = mock_make_request
+        chunk_plan = ChunkPlan(ChunkPlanDALMock())
+
+        async def sweep() -> EventIterator:
+            requests.clear()
+            await chunk_plan.load()
+            iterator = EventIterator(
+                self.custom_request, predictor=DaysPredictor(), chunk_plan=chunk_plan
+            )
+            async for _ in iterator:
+                pass
+            await iterator.save_plan()
+            return iterator
+
+        first_iterator = await sweep()
+        first_requests = len(requests)
+        second_iterator = await sweep()
+        second_requests = len(requests)
+
+        first_ends = [chunk.end_datetime for chunk in first_iterator.chunks]
+        second_ends = [chunk.end_datetime for chunk in second_iterator.chunks]
+        assert len(first_iterator.chunks) == len(second_iterator.chunks) == 8
+        assert first_ends == second_ends
+        # 4 pages and a single verification probe per planned chunk
+        assert second_requests < first_requests
+        assert second_requests <= 8 * (4 + 1) + 4
+
+    async def test_drifted_chunk_plan_rediscovered(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+    ) -> None:
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            if end_date - start_date > timedelta(days=100):
+                return mock_response("large_page")
+            return mock_response("page1")
+
+        mock_get.side_effect = mock_make_request
+        now = datetime.now()
+        dal = ChunkPlanDALMock()
+        dal.chunks = [(now - timedelta(days=1), now + timedelta(days=300), "", 1, 5)]
+        chunk_plan = ChunkPlan(dal)
+        await chunk_plan.load()
+
+        iterator = EventIterator(
+            self.custom_request, predictor=DaysPredictor(), chunk_plan=chunk_plan
+        )
+        async for _ in iterator:
+            pass
+
+        assert all(
+            chunk.end_datetime - chunk.start_datetime <= timedelta(days=100)
+            for chunk in iterator.chunks
+        )
+
+    async def test_iteration_restored_from_snapshot(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+    ) -> None:
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            if end_date - start_date > timedelta(days=100):
+                return mock_response("large_page")
+            return mock_response("page1")
+
+        mock_get.side_effect = mock_make_request
+
+        iterator = EventIterator(self.custom_request, predictor=DaysPredictor())
+        for _ in range(10):
+            iterator.page_done(await anext(iterator))
+        # fetched but not stored pages are fetched again after restore
+        await anext(iterator)
+        state = json.loads(json.dumps(iterator.snapshot()))
+
+        restored_iterator = EventIterator(
+            self.custom_request, predictor=DaysPredictor()
+        )
+        restored_iterator.restore(state)
+        remaining_pages = []
+        async for page in restored_iterator:
+            restored_iterator.page_done(page)
+            remaining_pages.append(page)
+
+        # 8 chunks of 4 pages each
+        assert len(remaining_pages) == 8 * 4 - 10
+        assert restored_iterator.iterator_start == iterator.iterator_start
+        assert restored_iterator.all_chunks_done() is True
+
+    async def test_resumed_after_aborted_write(
+        self,
+        mock_get: AsyncMock,
+        mock_response: Callable[[str], dict],
+        update_dal: UpdateDAL,
+    ) -> None:
+        async def mock_make_request(
+            start_date: datetime,
+            end_date: datetime,
+            page_number: int = 0,
+            country_code: str = "",
+        ) -> dict:
+            if end_date - start_date > timedelta(days=100):
+                return mock_response("large_page")
+            page = mock_response("page1")
+            event_id = f"{start_date.isoformat()}-{page_number}"
+            return page | {"_embedded": {"events": [{"id": event_id}]}}
+
+        mock_get.side_effect = mock_make_request
+        written: list[dict] = []
+
+        async def update_events(updates: list[dict]) -> list:
+            if len(written) == 2:
+                raise DALError("Connection lost")
+            written.extend(updates)
+            return []
+
+        factory = ClientFactory(base_url="https://test/", tokens=["token"])
+        updater = Updater(client_factory=factory, dal=update_dal, chunk_size=4)
+        iterator = EventIterator(self.custom_request, predictor=DaysPredictor())
+        # the write of the 3rd page of a chunk of 4 fetched pages fails
+        with pytest.raises(DALError):
+            await updater._iterate_events(iterator, lambda page: [page], update_events)
+        await factory.close()
+        state = json.loads(json.dumps(iterator.snapshot()))
+
+        restored_iterator = EventIterator(
+            self.custom_request, predictor=DaysPredictor()
+        )
+        restored_iterator.restore(state)
+        remaining_pages = []
+        async for page in restored_iterator:
+            restored_iterator.page_done(page)
+            remaining_pages.append(page)
+
+        # 8 chunks of 4 pages each, only the written pages are skipped
+        assert len(remaining_pages) == 8 * 4 - 2
+
     @pytest.mark.slow
     async def test_structure_error(
         self,
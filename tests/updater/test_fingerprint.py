@@ -0,0 +1,41 @@
+import copy
+
+from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.updater.deserializator import get_all_events
+from band_tracker.updater.fingerprint import fingerprint
+from band_tracker.updater.updater import ClientFactory, Updater
+from tests.test_data.client_mock.temp_const import EVENTS_SMALL
+
+
+class TestFingerprint:
+    def test_keys_order_ignored(self) -> None:
+        assert fingerprint({"id": "1", "name": "a"}) == fingerprint(
+            {"name": "a", "id": "1"}
+        )
+        assert fingerprint({"id": "1", "name": "a"}) != fingerprint(
+            {"id": "1", "name": "b"}
+        )
+
+    async def test_unchanged_events_skipped(self, update_dal: UpdateDAL) -> None:
+        factory = ClientFactory(base_url="https://test/", tokens=["token"])
+        updater = Updater(client_factory=factory, dal=update_dal)
+
+        page, hashes = await updater._filter_unchanged_events(EVENTS_SMALL)
+        assert len(page["_embedded"]["events"]) == len(hashes) == 2
+
+        for event in get_all_events(page):
+            await update_dal.update_event(event)
+        await update_dal.set_event_hashes(hashes)
+
+        page, hashes = await updater._filter_unchanged_events(EVENTS_SMALL)
+        assert page["_embedded"]["events"] == []
+        assert hashes == {}
+
+        changed_page = copy.deepcopy(EVENTS_SMALL)
+        changed_event = changed_page["_embedded"]["events"][1]
+        changed_event["name"] = "New title"
+        page, hashes = await updater._filter_unchanged_events(changed_page)
+        assert page["_embedded"]["events"] == [changed_event]
+        assert list(hashes) == [changed_event["id"]]
+
+        await factory.close()
@@ -0,0 +1,74 @@
+from uuid import uuid4
+
+from band_tracker.mq_publisher import MessageType
+from band_tracker.updater.invalidation import CacheInvalidation
+
+
+class PublisherMock:
+    def __init__(self) -> None:
+        self.messages: list[tuple[dict, MessageType]] = []
+        self.closed = False
+
+    async def send_message(
+        self,
+        data: dict,
+        type_: MessageType,
+        headers: dict = {},
+        persistent: bool = True,
+    ) -> None:
+        self.messages.append((data, type_))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def test_invalidation_batched() -> None:
+    publisher = PublisherMock()
+    invalidation = CacheInvalidation(publisher, batch_size=3)
+    artist_id, event_ids = uuid4(), [uuid4(), uuid4()]
+
+    await invalidation.add(artists=[artist_id])
+    await invalidation.add(artists=[artist_id])
+    assert publisher.messages == []
+
+    await invalidation.add(events=event_ids)
+    [(data, type_)] = publisher.messages
+    assert type_ == MessageType.invalidation
+    assert data["artists"] == [str(artist_id)]
+    assert sorted(data["events"]) == sorted(str(uuid) for uuid in event_ids)
+
+    await invalidation.close()
+    assert len(publisher.messages) == 1
+    assert publisher.closed
+
+
+async def test_remaining_uuids_flushed_on_close() -> None:
+    publisher = PublisherMock()
+    invalidation = CacheInvalidation(publisher)
+    event_id = uuid4()
+
+    await invalidation.add(events=[event_id])
+    await invalidation.close()
+
+    [(data, _)] = publisher.messages
+    assert data == {"artists": [], "events": [str(event_id)]}
+
+
+async def test_publish_errors_dropped() -> None:
+    class FailingPublisher(PublisherMock):
+        async def send_message(
+            self,
+            data: dict,
+            type_: MessageType,
+            headers: dict = {},
+            persistent: bool = True,
+        ) -> None:
+            raise ConnectionError("broker is unavailable")
+
+        async def close(self) -> None:
+            raise ConnectionError("broker is unavailable")
+
+    invalidation = CacheInvalidation(FailingPublisher(), batch_size=1)
+
+    await invalidation.add(events=[uuid4()])
+    await invalidation.close()
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from band_tracker.updater.rate_limiter import AdaptiveLimiter, TokenBucket
+from band_tracker.updater.updater import ClientFactory
+
+SPIKE_ARREST_FAULT = {
+    "fault": {
+        "faultstring": "Spike arrest violation",
+        "detail": {"errorcode": "policies.ratelimit.SpikeArrestViolation"},
+    }
+}
+PAGE = {"page": {"totalPages": 1, "totalElements": 1}}
+
+
+class TestRateLimiter:
+    async def test_bucket_paces_requests(self) -> None:
+        bucket = TokenBucket(rate=20)
+        start = datetime.now()
+        for _ in range(5):
+            await asyncio.sleep(bucket.reserve())
+        exec_time = datetime.now() - start
+
+        assert timedelta(seconds=0.15) <= exec_time <= timedelta(seconds=0.35)
+
+    def test_ramps_up_on_success(self) -> None:
+        limiter = AdaptiveLimiter(rate=4, rate_step=0.5, concurrency=2)
+        for _ in range(4):
+            limiter.on_success()
+
+        metrics = limiter.metrics
+        assert metrics.rate == 6
+        assert metrics.concurrency == 3
+        assert metrics.successes == 4
+
+    def test_limits_are_capped(self) -> None:
+        limiter = AdaptiveLimiter(
+            rate=4, max_rate=5, rate_step=1, concurrency=2, max_concurrency=3
+        )
+        for _ in range(20):
+            limiter.on_success()
+
+        assert limiter.rate == 5
+        assert limiter.concurrency == 3
+
+    def test_backs_off_on_throttle(self) -> None:
+        limiter = AdaptiveLimiter(rate=8, min_rate=3, concurrency=8)
+        limiter.on_throttle()
+
+        assert limiter.rate == 4
+        assert limiter.concurrency == 4
+        assert limiter.delay() > 0
+
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.rate == 3
+        assert limiter.concurrency == 1
+        assert limiter.metrics.throttles == 3
+
+    async def test_client_retries_spike_arrest(self) -> None:
+        responses = [SPIKE_ARREST_FAULT, PAGE]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=responses.pop(0), request=request)
+
+        factory = ClientFactory(
+            base_url="https://test/",
+            tokens=["key1"],
+            requests_per_second=50,
+            transport=httpx.MockTransport(handler),
+        )
+        client = factory.get_artists_client()
+        assert await client.make_request(tm_id="id") == PAGE
+        await factory.close()
+
+        metrics = factory.token_pool.metrics()["key#0"]
+        assert metrics.throttles == 1
+        assert metrics.successes == 1
+        assert metrics.rate < 50
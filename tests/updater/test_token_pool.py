@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+
+import httpx
+import pytest
+
+from band_tracker.updater.errors import AllTokensViolation
+from band_tracker.updater.rate_limiter import AdaptiveLimiter
+from band_tracker.updater.token_pool import TokenPool
+from band_tracker.updater.updater import ClientFactory
+
+QUOTA_FAULT = {
+    "fault": {
+        "faultstring": "Rate limit quota violation",
+        "detail": {"errorcode": "policies.ratelimit.QuotaViolation"},
+    }
+}
+PAGE = {"page": {"totalPages": 1, "totalElements": 1}}
+
+
+class TestTokenPool:
+    async def test_requests_spread_across_keys(self) -> None:
+        pool = TokenPool(["key1", "key2", "key3"])
+
+        async def request() -> None:
+            async with pool.token():
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*[request() for _ in range(6)])
+
+        assert [token.requests for token in pool.tokens] == [2, 2, 2]
+
+    async def test_keys_have_separate_budgets(self) -> None:
+        limiter_factory = partial(AdaptiveLimiter, rate=10)
+        single_pool = TokenPool(["key1"], limiter_factory=limiter_factory)
+        multi_pool = TokenPool(
+            ["key1", "key2", "key3"], limiter_factory=limiter_factory
+        )
+
+        async def run(pool: TokenPool) -> timedelta:
+            async def request() -> None:
+                async with pool.token():
+                    pass
+
+            start = datetime.now()
+            await asyncio.gather(*[request() for _ in range(9)])
+            return datetime.now() - start
+
+        single_time = await run(single_pool)
+        multi_time = await run(multi_pool)
+
+        assert single_time >= timedelta(seconds=0.8)
+        assert multi_time <= timedelta(seconds=0.4)
+
+    async def test_exhausted_keys_skipped(self) -> None:
+        pool = TokenPool(["key1", "key2"])
+        pool.exhaust(pool.tokens[0])
+
+        for _ in range(3):
+            async with pool.token() as token:
+                assert token.key == "key2"
+
+        pool.exhaust(pool.tokens[1])
+        with pytest.raises(AllTokensViolation):
+            async with pool.token():
+                pass
+
+    async def test_client_moves_to_next_key(self) -> None:
+        used_keys: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            key = request.url.params["apikey"]
+            used_keys.append(key)
+            data = QUOTA_FAULT if key == "key1" else PAGE
+            return httpx.Response(200, json=data, request=request)
+
+        factory = ClientFactory(
+            base_url="https://test/",
+            tokens=["key1", " key2"],
+            transport=httpx.MockTransport(handler),
+        )
+        client = factory.get_artists_client()
+        for _ in range(3):
+            assert await client.make_request(tm_id="id") == PAGE
+        await factory.close()
+
+        # exhausted key is requested only once, no probing requests are made
+        assert used_keys.count("key1") == 1
+        assert used_keys.count("key2") == 3
+        assert factory.token_pool.tokens[0].quota_violations == 1
+
+    async def test_client_raises_when_all_keys_exhausted(self) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=QUOTA_FAULT, request=request)
+
+        factory = ClientFactory(
+            base_url="https://test/",
+            tokens=["key1", "key2"],
+            transport=httpx.MockTransport(handler),
+        )
+        client = factory.get_artists_client()
+        with pytest.raises(AllTokensViolation):
+            await client.make_request(tm_id="id")
+        await factory.close()
@@ -0,0 +1,60 @@
+import httpx
+
+from band_tracker.db.dal_update import UpdateDAL
+from band_tracker.updater.updater import ClientFactory, Updater
+
+
+def get_updater(update_dal: UpdateDAL, requests: list[list[str]]) -> Updater:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        tm_ids = request.url.params["id"].split(",")
+        requests.append(tm_ids)
+        attractions = [
+            {"id": tm_id, "name": f"artist {tm_id}", "aliases": [f"alias {tm_id}"]}
+            for tm_id in tm_ids
+            if not tm_id.startswith("missing")
+        ]
+        data = {
+            "_embedded": {"attractions": attractions},
+            "page": {"totalPages": 1, "totalElements": len(attractions)},
+        }
+        return httpx.Response(200, json=data, request=request)
+
+    factory = ClientFactory(
+        base_url="https://test/",
+        tokens=["token"],
+        requests_per_second=100,
+        transport=httpx.MockTransport(handler),
+    )
+    return Updater(client_factory=factory, dal=update_dal)
+
+
+class TestUpdateArtists:
+    async def test_artists_requested_in_batches(self, update_dal: UpdateDAL) -> None:
+        requests: list[list[str]] = []
+        updater = get_updater(update_dal, requests)
+        tm_ids = [f"tm_id_{index}" for index in range(25)] + ["missing_tm_id"]
+
+        await updater.update_artists_by_ids(tm_ids, batch_size=10)
+        await updater.close()
+
+        assert sorted(len(batch) for batch in requests) == [6, 10, 10]
+        artist_ids = await update_dal.get_artist_ids(tm_ids)
+        assert len(artist_ids) == 25
+        artist = await update_dal.get_artist_by_tm_id("tm_id_3")
+        assert artist and artist.name == "artist tm_id_3"
+
+    async def test_only_absent_artists_added(self, update_dal: UpdateDAL) -> None:
+        requests: list[list[str]] = []
+        updater = get_updater(update_dal, requests)
+
+        await updater.update_artists_by_ids(["tm_id_1", "tm_id_2"])
+        first_ids = await update_dal.get_artist_ids(["tm_id_1", "tm_id_2"])
+        await updater.add_absent_artists(["tm_id_1", "tm_id_2", "tm_id_3"])
+        await updater.update_current_artists()
+        await updater.close()
+
+        assert requests[1] == ["tm_id_3"]
+        assert sorted(requests[2]) == ["tm_id_1", "tm_id_2", "tm_id_3"]
+        ids = await update_dal.get_artist_ids(["tm_id_1", "tm_id_2", "tm_id_3"])
+        assert len(ids) == 3
+        assert {tm_id: ids[tm_id] for tm_id in first_ids} == first_ids
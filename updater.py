@@ -1,24 +1,74 @@
+import argparse
 import asyncio
 import logging
 
 from dotenv import load_dotenv
 
-from band_tracker.config.env_loader import db_env_vars, events_api_env_vars
+from band_tracker.config.constants import INVALIDATION_ROUTING_KEY
+from band_tracker.config.env_loader import (
+    MQEnvVars,
+    db_env_vars,
+    events_api_env_vars,
+    mq_env_vars,
+)
 from band_tracker.config.log import load_log_config
+from band_tracker.db.dal_iterator import IteratorDAL
 from band_tracker.db.dal_predictor import PredictorDAL
 from band_tracker.db.dal_update import UpdateDAL
-from band_tracker.db.session import AsyncSessionmaker
+from band_tracker.db.session import POOL_PRESETS, AsyncSessionmaker
+from band_tracker.mq_publisher import MQPublisher
+from band_tracker.updater.checkpoint import Checkpointer
+from band_tracker.updater.chunk_plan import ChunkPlan
+from band_tracker.updater.invalidation import CacheInvalidation
 from band_tracker.updater.timestamp_predictor import CurrentDataPredictor
 from band_tracker.updater.updater import ClientFactory, Updater
 
 
+async def run(
+    updater: Updater, resume: bool = False, mq_env: MQEnvVars | None = None
+) -> None:
+    if mq_env is not None:
+        publisher = await MQPublisher.create(
+            routing_key=INVALIDATION_ROUTING_KEY,
+            url=mq_env.MQ_URI,
+            exchange=mq_env.MQ_EXCHANGE,
+        )
+        updater.invalidation = CacheInvalidation(publisher)
+    try:
+        await updater.update_events(resume=resume)
+    finally:
+        await updater.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Updates upcoming events")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the last unfinished run from its checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=50,
+        help="amount of processed pages between checkpoints",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     load_dotenv()
     events_env = events_api_env_vars()
     db_env = db_env_vars()
     tokens = events_env.CONCERTS_API_TOKENS
     load_log_config()
     log = logging.getLogger(__name__)
+    try:
+        mq_env: MQEnvVars | None = mq_env_vars()
+    except EnvironmentError as e:
+        log.warning(f"Bot caches won't be invalidated: {e}")
+        mq_env = None
     api_client_factory = ClientFactory(
         base_url=events_env.CONCERTS_API_URL, tokens=tokens
     )
@@ -28,19 +78,30 @@ def main() -> None:
         ip=db_env.DB_IP,
         port=db_env.DB_PORT,
         database=db_env.DB_NAME,
+        pool=POOL_PRESETS["updater"].with_env(db_env),
     )
     dal = UpdateDAL(db_sessionmaker)
     predictor_dal = PredictorDAL(db_sessionmaker)
     data_predictor = CurrentDataPredictor(predictor_dal)
     # data_predictor = LinearPredictor(-0.1, 100, None)
+    iterator_dal = IteratorDAL(db_sessionmaker)
+    chunk_plan = ChunkPlan(iterator_dal)
+    checkpointer = Checkpointer(iterator_dal, interval=args.checkpoint_interval)
     updater = Updater(
-        client_factory=api_client_factory, dal=dal, predictor=data_predictor
+        client_factory=api_client_factory,
+        dal=dal,
+        predictor=data_predictor,
+        chunk_plan=chunk_plan,
+        checkpointer=checkpointer,
     )
     log.debug(
         "---------------------------------------------Updater"
         " start---------------------------------------------"
     )
-    asyncio.run(updater.update_events())
+    try:
+        asyncio.run(run(updater, resume=args.resume, mq_env=mq_env))
+    finally:
+        log.info(f"Db pool: {db_sessionmaker.metrics}")
 
 
 if __name__ == "__main__":